@@ -2,8 +2,6 @@ from datetime import datetime, timedelta
 
 import csv
 
-import pandas as pd
-
 from resticus import generics, http
 from resticus.iterators import iterdict
 from resticus.views import Endpoint
@@ -18,7 +16,9 @@ from django.views.decorators.csrf import csrf_exempt
 
 from camp.apps.entries.models import BaseEntry
 from camp.apps.entries.tasks import data_export
+from camp.apps.entries.timelines import ExpandedEntryTimeline, ResolvedEntryTimeline
 from camp.apps.entries.utils import get_entry_model_by_name
+from camp.apps.monitors import snapshots
 from camp.apps.monitors.models import Monitor
 from camp.apps.regions.models import Region
 from camp.utils.forms import LatLonForm
@@ -84,6 +84,7 @@ class MonitorList(CachedEndpointMixin, MonitorMixin, generics.ListEndpoint):
 
     cache_refresh = True
     cache_refresh_name = 'api:v2:monitors:monitor-list'
+    cache_serialized = True
     cache_timeout = 90
 
     filter_class = MonitorFilter
@@ -185,20 +186,21 @@ class EntryExportMixin:
         )
 
         scope = form.cleaned_data.get('scope') or form.Scope.RESOLVED
-        df = self.get_dataframe(
+        timeline = self.get_timeline(
             start_time=start_time,
             end_time=end_time,
             scope=scope,
         )
-        return self.render(df=df, form=form, scope=scope)
+        return self.render(timeline=timeline, form=form, scope=scope)
 
-    def get_dataframe(self, start_time, end_time, scope):
-        scope_handler = {
-            EntryExportForm.Scope.RESOLVED: self.request.monitor.get_resolved_entries,
-            EntryExportForm.Scope.EXPANDED: self.request.monitor.get_expanded_entries
+    def get_timeline(self, start_time, end_time, scope):
+        timeline_class = {
+            EntryExportForm.Scope.RESOLVED: ResolvedEntryTimeline,
+            EntryExportForm.Scope.EXPANDED: ExpandedEntryTimeline,
         }[scope]
 
-        return scope_handler(
+        return timeline_class(
+            monitor=self.request.monitor,
             start_time=start_time,
             end_time=end_time,
             entry_types=None, # Maybe add this to EntryExportForm later?
@@ -215,19 +217,19 @@ class EntryExportJSON(EntryExportMixin, FormEndpoint):
 
     streaming = True
 
-    def dataframe_to_records(self, df):
-        if df is None or df.empty:
-            return
+    def timeline_to_records(self, timeline):
+        columns = None
+        for ts, row in timeline.iter_rows():
+            if columns is None:
+                columns = timeline.get_columns()
 
-        columns = df.columns.to_list()
-        for ts, values in zip(df.index, df.itertuples(index=False, name=None)):
             record = {'timestamp': ts.isoformat()}
-            for key, value in zip(columns, values):
-                record[key] = None if pd.isna(value) else value
+            for key in columns:
+                record[key] = row.get(key)
             yield record
 
-    def render(self, df, form, scope):
-        return {'data': self.dataframe_to_records(df) or []}
+    def render(self, timeline, form, scope):
+        return {'data': self.timeline_to_records(timeline)}
 
 
 class EntryExportCSV(EntryExportMixin, FormEndpoint):
@@ -252,25 +254,26 @@ class EntryExportCSV(EntryExportMixin, FormEndpoint):
 
         return f'{"_".join(bits)}.csv'
 
-    def dataframe_to_csv_rows(self, df):
-        if df is None or df.empty:
-            yield '' # Return an empty string
-            return
-
+    def timeline_to_csv_rows(self, timeline):
         writer = csv.writer(self.Echo())
-        columns = df.columns.to_list()
-        yield writer.writerow(['timestamp', *columns])
+        columns = None
 
-        for ts, values in zip(df.index, df.itertuples(index=False, name=None)):
-            row = [ts.isoformat(), *(
-                '' if pd.isna(value) else value
-                for value in values
-            )]
-            yield writer.writerow(row)
+        for ts, row in timeline.iter_rows():
+            if columns is None:
+                columns = timeline.get_columns()
+                yield writer.writerow(['timestamp', *columns])
 
-    def render(self, df, form, scope):
+            yield writer.writerow([ts.isoformat(), *(
+                '' if row.get(key) is None else row[key]
+                for key in columns
+            )])
+
+        if columns is None:
+            yield '' # Return an empty string
+
+    def render(self, timeline, form, scope):
         filename = self.get_filename(**form.cleaned_data)
-        rows = self.dataframe_to_csv_rows(df)
+        rows = self.timeline_to_csv_rows(timeline)
         headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
         return StreamingHttpResponse(rows, content_type='text/csv', headers=headers)
 
@@ -342,29 +345,25 @@ class CurrentData(CachedEndpointMixin, MonitorMixin, EntryTypeMixin, generics.Li
     cache_refresh = True
     cache_refresh_kwargs = [{'entry_type': E.entry_type} for E in BaseEntry.get_subclasses()]
     cache_refresh_name = 'api:v2:monitors:current-data'
+    cache_serialized = True
     cache_timeout = 90
 
     paginate = False
     serializer_class = MonitorSerializer
     streaming = True
 
-    def get_queryset(self, *args, **kwargs):
-        queryset = (super()
-            .get_queryset(*args, **kwargs)
-            .get_public()
-            .filter(position__isnull=False)
-        )
+    @cached_property
+    def snapshot(self):
+        # The prebuilt document only covers the unfiltered map.
+        if set(self.request.GET) - {'_cc', '_warm'}:
+            return None
+        return snapshots.get(self.entry_model)
 
-        # Only monitors that are recently active...
-        queryset = queryset.get_active(timedelta(
-            days=settings.MONITOR_ACTIVE_WINDOW_DAYS
-        ).total_seconds())
+    def get_queryset(self, *args, **kwargs):
+        if self.snapshot is not None:
+            return self.snapshot
 
-        # ...and recently healthy.
-        queryset = queryset.filter_healthy(
-            hours=settings.MONITOR_HEALTHY_WINDOW_HOURS,
-            threshold=settings.MONITOR_HEALTHY_THRESHOLD,
-        )
+        queryset = snapshots.filter_current(super().get_queryset(*args, **kwargs))
 
         # Filter (e.g. ?device=) before with_latest_entry(), not via
         # filter_class - with_latest_entry() sets `latest_entry` by
@@ -378,6 +377,9 @@ class CurrentData(CachedEndpointMixin, MonitorMixin, EntryTypeMixin, generics.Li
         return queryset
 
     def serialize(self, source, fields=None, include=None, exclude=None, fixup=None):
+        if self.snapshot is not None:
+            # Already serialized.
+            return source
         include = [('latest', lambda monitor: EntrySerializer(monitor.latest_entry).serialize())]
         return super().serialize(source, fields, include, exclude, fixup)
 
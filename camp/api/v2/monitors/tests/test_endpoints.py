@@ -15,6 +15,7 @@ from django.utils import timezone
 from camp.api.v2.monitors import endpoints
 from camp.apps.entries import models as entry_models
 from camp.apps.entries.utils import get_all_entry_models
+from camp.apps.monitors import snapshots
 from camp.apps.monitors.bam.models import BAM1022
 from camp.apps.monitors.cimis.models import CIMIS
 from camp.apps.monitors.purpleair.models import PurpleAir
@@ -629,6 +630,29 @@ class MonitorFilterDeviceTests(TestCase):
         assert str(cimis.pk) in ids
         assert str(purpleair.pk) not in ids
 
+    @override_settings(MONITOR_HEALTHY_THRESHOLD=0)
+    def test_current_data_serves_map_snapshot(self):
+        '''
+            Unfiltered requests come from the prebuilt snapshot, so a
+            change that hasn't been refreshed into it yet isn't visible;
+            filtered requests still run the live query.
+        '''
+        purpleair = PurpleAir.objects.get(sensor_id=8892)
+        purpleair.create_entry(entry_models.Temperature, timestamp=timezone.now(), value=Decimal('70.0'))
+        snapshots.build(entry_models.Temperature)
+        PurpleAir.objects.filter(pk=purpleair.pk).update(is_hidden=True)
+
+        kwargs = {'entry_type': 'temperature'}
+        url = reverse('api:v2:monitors:current-data', kwargs=kwargs)
+
+        request = self.factory.get(url, {'_cc': '1'})
+        content = get_response_data(current_data(request, **kwargs))
+        assert [monitor['id'] for monitor in content['data']] == [str(purpleair.pk)]
+
+        request = self.factory.get(url, {'_cc': '1', 'device': 'PurpleAir'})
+        content = get_response_data(current_data(request, **kwargs))
+        assert content['data'] == []
+
     @override_settings(MONITOR_ENABLED_TYPES=[])
     def test_closest_monitor_filters_by_device(self):
         '''ClosestMonitor didn't have filter_class wired in - ?device= was silently ignored.'''
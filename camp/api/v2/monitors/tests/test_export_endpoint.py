@@ -2,9 +2,7 @@ import csv
 
 from datetime import datetime, timedelta
 from itertools import islice
-from unittest.mock import Mock
-
-import pandas as pd
+from unittest.mock import patch
 
 from django.contrib.auth.models import AnonymousUser
 from django.core import mail
@@ -16,6 +14,7 @@ from django.utils import timezone
 from camp.apps.accounts.models import User
 from camp.apps.monitors.purpleair.models import PurpleAir
 from camp.apps.entries.models import PM25, Humidity, Temperature
+from camp.apps.entries.timelines import ExpandedEntryTimeline, ResolvedEntryTimeline
 from camp.api.v2.monitors import endpoints
 from camp.api.v2.monitors.forms import EntryExportForm
 from camp.utils.datetime import make_aware
@@ -211,12 +210,9 @@ class JSONExportTests(ExportTestsMixin, TestCase):
         assert response.status_code == 200
         assert content == {'data': []}
 
-    def test_scope_routes_to_full_dataframe_method(self):
-        # This test should not depend on real dataframe building.
-        df = pd.DataFrame({'pm25': [1.0]}, index=[make_aware(datetime(2025, 1, 1))])
-
-        self.monitor.get_resolved_entries = Mock(return_value=df)
-        self.monitor.get_expanded_entries = Mock(return_value=df)
+    def test_scope_routes_to_expanded_timeline(self):
+        # This test should not depend on real timeline building.
+        row = (make_aware(datetime(2025, 1, 1)), {'pm25': 1.0})
 
         url = reverse('api:v2:monitors:entry-export-json', kwargs={'monitor_id': self.monitor.pk})
         params = {
@@ -229,15 +225,18 @@ class JSONExportTests(ExportTestsMixin, TestCase):
         request.monitor = self.monitor
         request.user = self.user
 
-        response = entry_export_json(request, monitor_id=self.monitor.pk)
-        assert response.status_code == 200
-
-        assert self.monitor.get_resolved_entries.call_count == 0
-        assert self.monitor.get_expanded_entries.call_count == 1
+        with (
+            patch.object(ResolvedEntryTimeline, 'iter_rows', return_value=iter([row])) as resolved,
+            patch.object(ExpandedEntryTimeline, 'iter_rows', return_value=iter([row])) as expanded,
+            patch.object(ExpandedEntryTimeline, 'get_columns', return_value=['pm25']),
+        ):
+            response = entry_export_json(request, monitor_id=self.monitor.pk)
+            content = get_response_data(response)
 
-        _, kwargs = self.monitor.get_expanded_entries.call_args
-        assert kwargs['entry_types'] is None
-        assert kwargs['start_time'] < kwargs['end_time']
+        assert response.status_code == 200
+        assert content['data'] == [{'timestamp': row[0].isoformat(), 'pm25': 1.0}]
+        assert resolved.call_count == 0
+        assert expanded.call_count == 1
 
     def test_time_range_start_inclusive_end_exclusive(self):
         # Your get_time_range uses end_date + 1 day at midnight (exclusive).
@@ -358,3 +357,40 @@ class CSVExportTests(ExportTestsMixin, TestCase):
         prefix = get_streaming_prefix(response, chunks=2)
         # For non-empty df, the first chunk should usually contain the header row.
         assert 'timestamp' in prefix
+
+
+class ExportRowsTests(ExportTestsMixin, TestCase):
+    def _export_csv(self, **params):
+        url = reverse('api:v2:monitors:entry-export-csv', kwargs={'monitor_id': self.monitor.pk})
+        params.setdefault('start_date', self.start.strftime('%Y-%m-%d'))
+        params.setdefault('end_date', self.end.strftime('%Y-%m-%d'))
+
+        request = self.factory.get(url, params)
+        request.monitor = self.monitor
+        request.user = self.user
+
+        response = entry_export_csv(request, monitor_id=self.monitor.pk)
+        return list(csv.DictReader(get_response_data(response).splitlines()))
+
+    def test_resolved_rows_align_entry_types_on_timestamp(self):
+        rows = self._export_csv()
+
+        assert len(rows) == 7
+        assert [float(row['humidity']) for row in rows] == [40.0 + i for i in range(7)]
+        assert [float(row['temperature']) for row in rows] == [80.0 + i for i in range(7)]
+
+    def test_expanded_rows_fill_missing_columns(self):
+        timestamp = make_aware(datetime.combine(self.start, datetime.min.time())) + timedelta(hours=1)
+        PM25.objects.create(
+            monitor=self.monitor, timestamp=timestamp,
+            sensor='b', stage=PM25.Stage.RAW, value=99.0,
+        )
+
+        rows = self._export_csv(scope=EntryExportForm.Scope.EXPANDED)
+
+        assert len(rows) == 8
+        assert float(rows[0]['pm25_raw_a']) == 10.0
+        assert rows[0]['pm25_raw_b'] == ''
+        assert float(rows[1]['pm25_raw_b']) == 99.0
+        assert rows[1]['pm25_raw_a'] == ''
+        assert rows[1]['humidity_raw'] == ''
@@ -6,7 +6,7 @@ from resticus.http import Http400
 
 from camp.apps.regions.models import Region
 from camp.apps.tempo.models import Granule
-from camp.apps.tempo.queries import point_series, region_series
+from camp.apps.tempo.queries import point_series, stored_region_series
 from camp.apps.tempo.rendering import PRODUCT_COLOR_RANGES, _level_set_for
 
 from .filters import GranuleFilter, default_to_today
@@ -115,9 +115,8 @@ class TempoRegion(TempoProductMixin, generics.Endpoint):
 
     def get(self, request, region_id, *args, **kwargs):
         try:
-            region = Region.objects.select_related('boundary').get(sqid=region_id)
-            geometry = region.boundary.geometry
-        except (Region.DoesNotExist, AttributeError):
+            region = Region.objects.get(sqid=region_id, boundary__isnull=False)
+        except Region.DoesNotExist:
             raise Http404(f'"{region_id}" is not a valid region id')
 
         form = TempoSeriesForm(request.GET)
@@ -132,4 +131,4 @@ class TempoRegion(TempoProductMixin, generics.Endpoint):
                 return []
             start, end = min(timestamps), max(timestamps)
 
-        return region_series(self.product, geometry, start, end)
+        return stored_region_series(self.product, region, start, end)
@@ -0,0 +1,119 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from random import choice
+
+from django.conf import settings
+
+import twilio.rest
+from twilio.base.exceptions import TwilioRestException
+
+from camp.utils.collectors import Collector
+
+
+logger = logging.getLogger(__name__)
+
+# Twilio statuses worth retrying: rate limiting and transient server errors.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Twilio rejects message bodies longer than this.
+MAX_LENGTH = 1600
+
+
+def get_client():
+    return twilio.rest.Client(
+        settings.TWILIO_ACCOUNT_SID,
+        settings.TWILIO_AUTH_TOKEN
+    )
+
+
+def send(client, phone_number, message):
+    """
+    Send one SMS, retrying rate-limited and transient failures with
+    exponential backoff (settings.SMS_RETRIES / SMS_RETRY_BACKOFF).
+    """
+    for attempt in range(settings.SMS_RETRIES + 1):
+        try:
+            return client.messages.create(
+                to=str(phone_number),
+                from_=choice(settings.TWILIO_PHONE_NUMBERS),
+                body=message,
+            )
+        except TwilioRestException as err:
+            if err.status not in RETRY_STATUSES or attempt == settings.SMS_RETRIES:
+                raise
+        time.sleep(settings.SMS_RETRY_BACKOFF * 2 ** attempt)
+
+
+def send_batch(messages, client=None):
+    """
+    Send (phone_number, message) pairs with at most settings.SMS_CONCURRENCY
+    requests in flight to Twilio. Failures are logged rather than raised so
+    one bad number doesn't sink the batch. Returns counts and throughput.
+    """
+    client = client or get_client()
+    started = time.monotonic()
+    sent = failed = 0
+
+    with ThreadPoolExecutor(max_workers=settings.SMS_CONCURRENCY) as executor:
+        futures = [executor.submit(send, client, phone, message) for phone, message in messages]
+        for future in futures:
+            try:
+                future.result()
+                sent += 1
+            except Exception:
+                logger.exception('Failed to send SMS')
+                failed += 1
+
+    elapsed = time.monotonic() - started
+    rate = sent / elapsed if elapsed else float(sent)
+    logger.info(f'Sent {sent} SMS ({failed} failed) in {elapsed:.2f}s ({rate:.1f}/s)')
+    return {'sent': sent, 'failed': failed, 'elapsed': elapsed, 'rate': rate}
+
+
+def combine(messages):
+    """Join one recipient's messages into as few SMS bodies as fit MAX_LENGTH."""
+    bodies = []
+    for message in messages:
+        if bodies and len(bodies[-1]) + len(message) + 2 <= MAX_LENGTH:
+            bodies[-1] = f'{bodies[-1]}\n\n{message}'
+        else:
+            bodies.append(message)
+    return bodies
+
+
+def flush(pending):
+    """Hand {phone_number: [messages]} to the notifications queue in batches."""
+    from camp.apps.accounts.tasks import send_sms_batch
+
+    messages = [
+        (phone, body)
+        for phone, phone_messages in pending.items()
+        for body in combine(phone_messages)
+    ]
+    for offset in range(0, len(messages), settings.SMS_BATCH_SIZE):
+        send_sms_batch(messages[offset:offset + settings.SMS_BATCH_SIZE])
+
+
+_pending = Collector('sms_pending', flush=flush)
+
+
+def enqueue(phone_number, message):
+    """
+    Queue an SMS. Inside a batch() block it is held until the block exits,
+    so each recipient gets every message from that cycle once, combined;
+    otherwise it goes to the notifications queue straight away.
+    """
+    pending = _pending.get()
+    if pending is None:
+        flush({str(phone_number): [message]})
+        return
+
+    messages = pending.setdefault(str(phone_number), [])
+    if message not in messages:
+        messages.append(message)
+
+
+def batch():
+    """Collect every enqueue() inside the block and flush them together on a clean exit."""
+    return _pending.batch()
@@ -1,21 +1,14 @@
-from random import choice
-
-from django.conf import settings
-
-import twilio.rest
-from twilio.base.exceptions import TwilioRestException
-
 from django_huey import db_task
 
+from camp.apps.accounts import sms
+
 
 @db_task(priority=100)
 def send_sms_message(phone_number, message):
-    twilio_client = twilio.rest.Client(
-        settings.TWILIO_ACCOUNT_SID,
-        settings.TWILIO_AUTH_TOKEN
-    )
-    return twilio_client.messages.create(
-        to=str(phone_number),
-        from_=choice(settings.TWILIO_PHONE_NUMBERS),
-        body=message,
-    )
+    return sms.send(sms.get_client(), phone_number, message)
+
+
+@db_task(priority=100, queue='notifications')
+def send_sms_batch(messages):
+    """Send a batch of (phone_number, message) pairs queued by sms.flush()."""
+    return sms.send_batch(messages)
@@ -1,9 +1,15 @@
+from datetime import timedelta
+
+import numpy as np
 import pandas as pd
 
 from django.db.models import Avg, Count
 from django.utils import timezone
 
+from camp.apps.accounts import sms
+from camp.apps.alerts import windows
 from camp.apps.alerts.models import Alert
+from camp.apps.entries.fields import EntryTypeField
 from camp.apps.entries.levels import AQLevel
 
 
@@ -129,3 +135,155 @@ class AlertEvaluator:
             alert.save(update_fields=['end_time'])
             alert.create_update(level)
             return
+
+
+class AlertEngine:
+    """
+    Evaluates alert creation and update thresholds for every monitor in one
+    pass, from the rolling windows fed at ingest (see alerts.windows) rather
+    than per-monitor entry queries. Decisions mirror AlertEvaluator.
+    """
+    CREATION_WINDOW = AlertEvaluator.CREATION_WINDOW
+    UPDATE_WINDOW = AlertEvaluator.UPDATE_WINDOW
+    MINIMUM_DURATION = AlertEvaluator.MINIMUM_DURATION
+
+    KEYS = ['monitor_id', 'entry_type']
+
+    def __init__(self, now=None):
+        self.now = now or timezone.now()
+        self.entry_models = EntryTypeField.get_model_map()
+
+    def get_recent_pairs(self):
+        """(monitor_id, entry_type) pairs that have reported recently enough to have a window."""
+        from camp.apps.monitors.models import LatestEntry, Monitor
+
+        subclasses = Monitor.get_subclasses()
+        max_age = max(
+            [windows.RETENTION] + [
+                timedelta(seconds=subclass.LAST_ACTIVE_LIMIT)
+                for subclass in subclasses
+            ]
+        )
+        alertable = {
+            EntryModel.entry_type
+            for subclass in subclasses
+            for EntryModel in subclass.alertable_entry_types
+        }
+        return set(LatestEntry.objects
+            .filter(timestamp__gte=self.now - max_age, entry_type__in=alertable)
+            .values_list('monitor_id', 'entry_type')
+            .distinct()
+        )
+
+    def get_frame(self, pairs) -> pd.DataFrame:
+        """
+        One row per (monitor_id, entry_type) with a window: the newest
+        value and its timestamp, the mean over each averaging window, and
+        the monitor's expected interval and activity limit. Windows missing
+        from the cache are rebuilt from the database by get_windows().
+        """
+        found = windows.get_windows(pairs, now=self.now)
+        if not found:
+            return pd.DataFrame()
+
+        points = pd.DataFrame.from_records(
+            [
+                (monitor_id, entry_type, timestamp, value)
+                for (monitor_id, entry_type), window in found.items()
+                for timestamp, value in window['points']
+            ],
+            columns=self.KEYS + ['timestamp', 'value'],
+        ).sort_values('timestamp')
+
+        frame = pd.DataFrame.from_records(
+            [
+                (monitor_id, entry_type, window['interval'], window['active_limit'])
+                for (monitor_id, entry_type), window in found.items()
+            ],
+            columns=self.KEYS + ['interval', 'active_limit'],
+        ).set_index(self.KEYS)
+
+        latest = points.groupby(self.KEYS).last()
+        frame['latest_timestamp'] = latest['timestamp']
+        frame['latest_value'] = latest['value']
+
+        now = self.now.timestamp()
+        for name, window in (('creation', self.CREATION_WINDOW), ('update', self.UPDATE_WINDOW)):
+            seconds = window.total_seconds()
+            mean = points[points['timestamp'] >= now - seconds].groupby(self.KEYS)['value'].mean()
+            # Like AlertEvaluator.get_level(): monitors that report less often
+            # than the window are judged on their latest value instead.
+            frame[f'{name}_value'] = frame['latest_value'].where(frame['interval'] >= seconds, mean)
+
+        return frame
+
+    def get_levels(self, values: pd.Series) -> pd.DataFrame:
+        """
+        Map each value to its entry type's Level, with the Level's rank
+        alongside (-1 where there's no value).
+        """
+        result = pd.DataFrame({'level': None, 'rank': -1}, index=values.index)
+        entry_types = values.index.get_level_values('entry_type')
+
+        for entry_type in entry_types.unique():
+            scale = list(self.entry_models[entry_type].Levels)
+            thresholds = np.array([float(level.value) for level in scale])
+            ranks = np.array([level.rank for level in scale])
+
+            subset = values[entry_types == entry_type].dropna()
+            positions = np.clip(np.searchsorted(thresholds, subset.to_numpy(), side='right') - 1, 0, None)
+            result.loc[subset.index, 'level'] = pd.Series([scale[p] for p in positions], index=subset.index, dtype=object)
+            result.loc[subset.index, 'rank'] = ranks[positions]
+
+        return result
+
+    def evaluate(self):
+        alerts = {
+            (alert.monitor_id, alert.entry_type): alert
+            for alert in Alert.objects.filter(end_time__isnull=True).select_related('latest')
+        }
+        frame = self.get_frame(set(alerts) | self.get_recent_pairs())
+        if frame.empty:
+            return
+
+        creation = self.get_levels(frame['creation_value'])
+        update = self.get_levels(frame['update_value'])
+
+        has_alert = frame.index.isin(list(alerts))
+        is_active = frame['latest_timestamp'] >= self.now.timestamp() - frame['active_limit']
+        alert_rank = pd.Series(
+            [self.get_alert_level(alerts[key]).rank if key in alerts else -1 for key in frame.index],
+            index=frame.index,
+        )
+        alert_age = pd.Series(
+            [self.now - alerts[key].start_time if key in alerts else pd.NaT for key in frame.index],
+            index=frame.index,
+        )
+
+        good = AQLevel.scale.GOOD.rank
+        to_create = ~has_alert & is_active & (creation['rank'] >= AQLevel.scale.MODERATE.rank)
+        to_update = has_alert & (update['rank'] >= 0) & (update['rank'] != alert_rank) & (update['rank'] != good)
+        to_end = has_alert & (update['rank'] == good) & (alert_age >= self.MINIMUM_DURATION)
+
+        # Notifications raised below are sent once per recipient, after the pass.
+        with sms.batch():
+            for monitor_id, entry_type in frame.index[to_create.to_numpy()]:
+                alert = Alert.objects.create(
+                    monitor_id=monitor_id,
+                    entry_type=entry_type,
+                    start_time=self.now,
+                )
+                alert.create_update(creation.at[(monitor_id, entry_type), 'level'], timestamp=alert.start_time)
+
+            for key in frame.index[to_update.to_numpy()]:
+                alerts[key].create_update(update.at[key, 'level'])
+
+            for key in frame.index[to_end.to_numpy()]:
+                alert = alerts[key]
+                alert.end_time = self.now
+                alert.save(update_fields=['end_time'])
+                alert.create_update(update.at[key, 'level'])
+
+    def get_alert_level(self, alert):
+        latest = alert.latest or alert.updates.latest()
+        return self.entry_models[alert.entry_type].Levels[latest.level]
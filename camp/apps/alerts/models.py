@@ -12,6 +12,7 @@ from django_smalluuid.models import SmallUUIDField, uuid_default
 from model_utils import Choices
 from model_utils.models import TimeStampedModel
 
+from camp.apps.accounts import sms
 from camp.apps.entries.fields import EntryTypeField
 from camp.apps.entries.levels import AQLevel
 
@@ -130,14 +131,18 @@ class Alert(TimeStampedModel):
         ])
 
         queryset = (Subscription.objects
-            .filter(monitor_id=self.monitor.pk)
+            .filter(
+                monitor_id=self.monitor.pk,
+                user__phone_verified=True,
+            )
             .select_related('user')
         )
 
+        # Only enqueue here; the notifications queue does the sending.
         for sub in queryset:
             sub_level = AQLevel.scale[sub.level.upper()]
-            if level >= sub_level:
-                sub.user.send_sms(message)
+            if level >= sub_level and sub.user.phone:
+                sms.enqueue(sub.user.phone, message)
 
 
 class AlertUpdate(TimeStampedModel):
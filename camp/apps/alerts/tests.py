@@ -1,10 +1,19 @@
 from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
-from camp.apps.alerts.models import Alert, AlertUpdate
-from camp.apps.alerts.evaluator import AlertEvaluator
+from twilio.base.exceptions import TwilioRestException
+
+from camp.apps.accounts import sms
+from camp.apps.accounts.models import User
+
+from camp.apps.alerts.models import Alert, AlertUpdate, Subscription
+from camp.apps.alerts import windows
+from camp.apps.alerts.evaluator import AlertEngine, AlertEvaluator
 from camp.apps.entries.models import PM25
 from camp.apps.entries.levels import AQLevel, LevelSet
 from camp.apps.monitors.purpleair.models import PurpleAir
@@ -112,3 +121,185 @@ class AlertEvaluatorTests(TestCase):
         evaluator.evaluate()
 
         assert Alert.objects.count() == 0
+
+
+class AlertEngineTests(TestCase):
+    fixtures = ['users.yaml', 'purple-air.yaml']
+
+    def setUp(self):
+        cache.clear()
+        self.monitor = PurpleAir.objects.get(sensor_id=8892)
+        self.lookup = self.monitor.alertable_entry_types[PM25]
+
+    def ingest(self, value, minutes_ago=0):
+        # Mirrors an ingest cycle: the raw entry advances LatestEntry and the
+        # alertable (calibrated) entry feeds the rolling window.
+        timestamp = timezone.now() - timedelta(minutes=minutes_ago)
+        entries = [
+            PM25.objects.create(monitor=self.monitor, value=value, timestamp=timestamp, **self.lookup),
+            PM25.objects.create(monitor=self.monitor, value=value, timestamp=timestamp, stage=PM25.Stage.RAW),
+        ]
+        self.monitor.update_latest_entries(entries)
+
+    def test_creates_alert_above_threshold(self):
+        self.ingest(40, minutes_ago=5)
+        AlertEngine().evaluate()
+
+        alert = Alert.objects.get(monitor=self.monitor)
+        assert alert.entry_type == PM25.entry_type
+        assert alert.latest.get_level() == AQLevel.scale.UNHEALTHY_SENSITIVE
+
+    def test_skips_below_threshold(self):
+        self.ingest(5, minutes_ago=5)
+        AlertEngine().evaluate()
+
+        assert Alert.objects.count() == 0
+
+    def test_updates_alert_when_level_changes(self):
+        self.ingest(60, minutes_ago=5)
+        AlertEngine().evaluate()
+
+        for minutes_ago in (3, 2, 1):
+            self.ingest(220, minutes_ago=minutes_ago)
+        AlertEngine().evaluate()
+        AlertEngine().evaluate()
+
+        alert = Alert.objects.get(monitor=self.monitor)
+        assert alert.updates.count() == 2
+        assert alert.updates.latest().get_level() > alert.updates.earliest().get_level()
+
+    def test_ends_alert_when_level_drops_to_good(self):
+        self.ingest(80, minutes_ago=70)
+        AlertEngine(now=timezone.now() - timedelta(minutes=65)).evaluate()
+        alert = Alert.objects.get(monitor=self.monitor)
+
+        # The 80 reading is now outside the 60 minute update window
+        for i in range(12):
+            self.ingest(4, minutes_ago=12 - i)
+        AlertEngine().evaluate()
+
+        alert.refresh_from_db()
+        assert alert.end_time is not None
+        assert alert.latest.get_level() == AQLevel.scale.GOOD
+
+    def get_window(self):
+        return windows.get_windows([(self.monitor.pk, PM25.entry_type)])[(self.monitor.pk, PM25.entry_type)]
+
+    def test_window_drops_points_older_than_retention(self):
+        self.ingest(80, minutes_ago=120)
+        self.ingest(4, minutes_ago=1)
+
+        window = self.get_window()
+        assert [value for _, value in window['points']] == [4.0]
+
+    def test_window_folds_new_slots_into_base(self):
+        self.ingest(10, minutes_ago=3)
+        assert [value for _, value in self.get_window()['points']] == [10.0]
+
+        self.ingest(20, minutes_ago=2)
+        self.ingest(30, minutes_ago=1)
+        window = self.get_window()
+        assert [value for _, value in window['points']] == [10.0, 20.0, 30.0]
+        assert window['through'] == 3
+
+    def test_record_entries_does_not_read_the_window(self):
+        # Writers only append slots, so concurrent ingests for the same
+        # monitor can't overwrite each other's points.
+        self.ingest(10, minutes_ago=2)
+        self.get_window()
+
+        with patch.object(cache, 'get_many', side_effect=AssertionError):
+            self.ingest(20, minutes_ago=1)
+        assert [value for _, value in self.get_window()['points']] == [10.0, 20.0]
+
+    def test_evicted_window_falls_back_to_database(self):
+        self.ingest(40, minutes_ago=5)
+        cache.clear()
+        AlertEngine().evaluate()
+
+        alert = Alert.objects.get(monitor=self.monitor)
+        assert alert.latest.get_level() == AQLevel.scale.UNHEALTHY_SENSITIVE
+
+    def test_missing_slot_falls_back_to_database(self):
+        self.ingest(10, minutes_ago=2)
+        self.get_window()
+        self.ingest(20, minutes_ago=1)
+        cache.delete(f'{windows.window_key(self.monitor.pk, PM25.entry_type)}:2')
+
+        assert [value for _, value in self.get_window()['points']] == [10.0, 20.0]
+
+
+class StubSMSClient:
+    """Records sent messages; the first `failures` calls per number raise `status`."""
+    def __init__(self, failures=0, status=429):
+        self.sent = []
+        self.failures = failures
+        self.status = status
+        self.attempts = {}
+        self.messages = SimpleNamespace(create=self.create)
+
+    def create(self, to, from_, body):
+        self.attempts[to] = self.attempts.get(to, 0) + 1
+        if self.attempts[to] <= self.failures:
+            raise TwilioRestException(status=self.status, uri='/Messages')
+        self.sent.append((to, body))
+        return SimpleNamespace(sid=f'SM{len(self.sent)}')
+
+
+@override_settings(SEND_SMS_ALERTS=True, SMS_RETRY_BACKOFF=0, TWILIO_PHONE_NUMBERS=['+15595550000'])
+class AlertNotificationTests(TestCase):
+    fixtures = ['users.yaml', 'purple-air.yaml']
+
+    def setUp(self):
+        self.client = StubSMSClient()
+        patcher = patch.object(sms, 'get_client', return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.monitor = PurpleAir.objects.get(sensor_id=8892)
+        self.user = User.objects.get(email='user@sjvair.com')
+        Subscription.objects.create(user=self.user, monitor=self.monitor, level='unhealthy_sensitive')
+
+    def create_alert(self):
+        return Alert.objects.create(monitor=self.monitor, entry_type=PM25.entry_type, start_time=timezone.now())
+
+    def test_send_notifications_outside_batch_sends_immediately(self):
+        self.create_alert().create_update(AQLevel.scale.UNHEALTHY)
+        assert len(self.client.sent) == 1
+        assert self.client.sent[0][0] == str(self.user.phone)
+
+    def test_batch_sends_once_per_user_per_cycle(self):
+        with sms.batch():
+            first, second = self.create_alert(), self.create_alert()
+            first.create_update(AQLevel.scale.UNHEALTHY)
+            second.create_update(AQLevel.scale.UNHEALTHY)
+            first.create_update(AQLevel.scale.VERY_UNHEALTHY)
+            assert self.client.sent == []
+
+        # The two identical messages collapse, and the rest are combined.
+        assert len(self.client.sent) == 1
+        assert self.client.sent[0][1].count('Air Quality Alert') == 2
+
+    def test_below_subscription_level_is_skipped(self):
+        self.create_alert().create_update(AQLevel.scale.MODERATE)
+        assert self.client.sent == []
+
+    def test_retries_rate_limited_sends(self):
+        self.client.failures = 2
+        result = sms.send_batch([('+15595551234', 'hello')], client=self.client)
+
+        assert result['sent'] == 1
+        assert self.client.attempts['+15595551234'] == 3
+
+    def test_gives_up_on_permanent_errors(self):
+        self.client.failures, self.client.status = 5, 400
+        result = sms.send_batch([('+15595551234', 'hello'), ('+15595554321', 'hi')], client=self.client)
+
+        assert result['sent'] == 0
+        assert result['failed'] == 2
+        assert self.client.attempts['+15595551234'] == 1
+
+    def test_combine_respects_max_length(self):
+        message = 'x' * 1000
+        assert sms.combine([message, message]) == [message, message]
+        assert sms.combine(['a', 'b']) == ['a\n\nb']
@@ -0,0 +1,209 @@
+from collections import defaultdict
+from datetime import timedelta
+
+import pandas as pd
+
+from django.core.cache import cache
+from django.utils import timezone
+
+
+# How far back each window reaches. Must cover the longest averaging window
+# used by the alert engine (AlertEvaluator.UPDATE_WINDOW).
+RETENTION = timedelta(minutes=90)
+
+# Windows are refreshed on every ingest, so this only bounds how long a
+# silent monitor's last value lingers in the cache.
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# Most unfolded slots read for one window before giving up on the cache
+# and rebuilding it from the database instead.
+MAX_SLOTS = 100
+
+# Layout, per (monitor_id, entry_type):
+#   {key}:count  - number of slots written, advanced with cache.incr()
+#   {key}:{n}    - the points from one ingest, written once and never updated
+#   {key}:base   - interval, active_limit and points folded from slots up to
+#                  `through`; only written by get_windows()
+# Ingest never reads then writes a shared key, so concurrent writers for the
+# same monitor can't overwrite each other's points.
+
+
+def window_key(monitor_id, entry_type):
+    return f'alerts:window:{monitor_id}:{entry_type}'
+
+
+def matches_lookup(entry, lookup):
+    """True if `entry` is the stage/processor a monitor alerts on."""
+    return all(str(getattr(entry, key)) == str(value) for key, value in lookup.items())
+
+
+def next_slot(key):
+    """Claim the next slot number for a window."""
+    count_key = f'{key}:count'
+    try:
+        slot = cache.incr(count_key)
+    except ValueError:
+        # First write, or the counter was evicted. Whoever adds it gets slot
+        # 1; anyone who loses the race increments the new counter instead.
+        slot = 1 if cache.add(count_key, 1, timeout=CACHE_TIMEOUT) else cache.incr(count_key)
+    cache.touch(count_key, CACHE_TIMEOUT)
+    return slot
+
+
+def record_entries(monitor, entries):
+    """
+    Feed newly written entries into the rolling alert windows for this
+    monitor, one per alertable entry type. Each call appends a new slot to
+    the window rather than rewriting it; get_windows() folds slots back in.
+    """
+    alertable = monitor.alertable_entry_types
+    if not alertable:
+        return
+
+    points = defaultdict(dict)
+    for entry in entries:
+        lookup = alertable.get(entry.__class__)
+        if lookup is None or entry.value is None or not matches_lookup(entry, lookup):
+            continue
+        points[entry.entry_type][entry.timestamp.timestamp()] = float(entry.value)
+
+    if not points:
+        return
+
+    slots = {}
+    for entry_type, new_points in points.items():
+        key = window_key(monitor.pk, entry_type)
+        slots[f'{key}:{next_slot(key)}'] = sorted(new_points.items())
+
+    cache.set_many(slots, timeout=CACHE_TIMEOUT)
+
+
+def trim(points, cutoff):
+    """
+    Sorted (timestamp, value) points from `cutoff` on, plus the newest point
+    regardless of age, so monitors reporting less often than the averaging
+    window can still be evaluated on their latest value.
+    """
+    ordered = sorted(dict(points).items())
+    return [point for point in ordered if point[0] >= cutoff] or ordered[-1:]
+
+
+def load_windows(pairs, now):
+    """
+    Build windows for (monitor_id, entry_type) pairs straight from the
+    entries tables. Pairs whose monitor doesn't alert on that entry type,
+    or that have no entries, are left out.
+    """
+    from camp.apps.monitors.models import Monitor
+
+    subclasses = {cls.monitor_type: cls for cls in Monitor.get_subclasses()}
+    monitor_classes = {
+        pk: subclasses.get(subtype)
+        for pk, subtype in (Monitor.objects
+            .filter(pk__in={monitor_id for monitor_id, entry_type in pairs})
+            .values_list('pk', 'subtype')
+        )
+    }
+
+    # Monitors that share an entry model and stage/processor lookup are
+    # fetched together.
+    groups = defaultdict(list)
+    for monitor_id, entry_type in pairs:
+        monitor_class = monitor_classes.get(monitor_id)
+        if monitor_class is None:
+            continue
+        for EntryModel, lookup in monitor_class.alertable_entry_types.items():
+            if EntryModel.entry_type == entry_type:
+                groups[(EntryModel, tuple(sorted(lookup.items())))].append(monitor_id)
+
+    cutoff = now - RETENTION
+    points = defaultdict(list)
+    for (EntryModel, lookup), monitor_ids in groups.items():
+        queryset = EntryModel.objects.filter(monitor_id__in=monitor_ids, **dict(lookup))
+        recent = queryset.filter(timestamp__gte=cutoff, timestamp__lte=now)
+        for monitor_id, timestamp, value in recent.values_list('monitor_id', 'timestamp', 'value'):
+            points[(monitor_id, EntryModel.entry_type)].append((timestamp.timestamp(), float(value)))
+
+        # The newest entry for monitors with nothing inside the window.
+        quiet = [monitor_id for monitor_id in monitor_ids if (monitor_id, EntryModel.entry_type) not in points]
+        if quiet:
+            newest = (queryset
+                .filter(monitor_id__in=quiet, timestamp__lte=now)
+                .order_by('monitor_id', '-timestamp')
+                .distinct('monitor_id')
+                .values_list('monitor_id', 'timestamp', 'value')
+            )
+            for monitor_id, timestamp, value in newest:
+                points[(monitor_id, EntryModel.entry_type)].append((timestamp.timestamp(), float(value)))
+
+    return {
+        (monitor_id, entry_type): {
+            'interval': pd.to_timedelta(monitor_classes[monitor_id].EXPECTED_INTERVAL).total_seconds(),
+            'active_limit': monitor_classes[monitor_id].LAST_ACTIVE_LIMIT,
+            'points': trim(pair_points, cutoff.timestamp()),
+        }
+        for (monitor_id, entry_type), pair_points in points.items()
+    }
+
+
+def get_windows(pairs, now=None):
+    """
+    Fetch the windows for many (monitor_id, entry_type) pairs, folding any
+    slots written since the last call into each window's base. Pairs whose
+    window is missing or incomplete in the cache (evicted base or slots, or
+    too many slots behind) are rebuilt from the database. Returns
+    {(monitor_id, entry_type): window} for the pairs that have one.
+    """
+    now = now or timezone.now()
+    cutoff = (now - RETENTION).timestamp()
+    keys = {pair: window_key(*pair) for pair in pairs}
+
+    cached = cache.get_many(
+        [f'{key}:count' for key in keys.values()] + [f'{key}:base' for key in keys.values()]
+    )
+
+    slot_keys = []
+    missing = set()
+    for pair, key in keys.items():
+        count = cached.get(f'{key}:count', 0)
+        base = cached.get(f'{key}:base')
+        if base is None or not 0 <= count - base['through'] <= MAX_SLOTS:
+            missing.add(pair)
+            continue
+        slot_keys.extend(f'{key}:{slot}' for slot in range(base['through'] + 1, count + 1))
+    slots = cache.get_many(slot_keys)
+
+    found = {}
+    updated = {}
+    for pair, key in keys.items():
+        if pair in missing:
+            continue
+
+        count = cached.get(f'{key}:count', 0)
+        base = cached[f'{key}:base']
+        new_slots = [f'{key}:{slot}' for slot in range(base['through'] + 1, count + 1)]
+        if any(slot_key not in slots for slot_key in new_slots):
+            missing.add(pair)
+            continue
+
+        window = dict(base, points=trim(
+            base['points'] + [point for slot_key in new_slots for point in slots[slot_key]],
+            cutoff,
+        ))
+        window['through'] = count
+        found[pair] = window
+        if new_slots:
+            updated[f'{key}:base'] = window
+
+    if missing:
+        loaded = load_windows(missing, now)
+        for pair, window in loaded.items():
+            key = keys[pair]
+            # Every slot counted so far was written after its entries were
+            # saved, so the database already covers them.
+            window['through'] = cached.get(f'{key}:count', 0)
+            found[pair] = window
+            updated[f'{key}:base'] = window
+
+    cache.set_many(updated, timeout=CACHE_TIMEOUT)
+    return found
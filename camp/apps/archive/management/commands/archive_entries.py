@@ -30,15 +30,15 @@ class Command(BaseCommand):
             return [int(x) for x in match.groups()]
         raise CommandError('')
 
-    def get_monitor_list(self, monitor_id=None):
-        monitors = Monitor.objects.all()
+    def get_monitor_list(self, year, month, monitor_id=None):
+        monitors = Monitor.objects.filter(pk__in=EntryArchive.objects.monitors_with_data(year, month))
         if monitor_id is not None:
             monitors = monitors.filter(pk=monitor_id)
         return monitors
 
     def handle(self, *args, **options):
         year, month = self.get_year_month(options.get('month'))
-        monitor_list = self.get_monitor_list(options.get('monitor'))
+        monitor_list = self.get_monitor_list(year, month, options.get('monitor'))
 
         for monitor in monitor_list:
             print(monitor.name)
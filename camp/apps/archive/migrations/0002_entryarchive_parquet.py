@@ -0,0 +1,19 @@
+# Generated by Django 5.2.15 on 2026-10-17 16:30
+
+import camp.apps.archive.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archive', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entryarchive',
+            name='parquet',
+            field=models.FileField(blank=True, upload_to=camp.apps.archive.models.archive_data_path),
+        ),
+    ]
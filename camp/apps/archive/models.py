@@ -1,20 +1,22 @@
 import calendar
+import tempfile
 
-from datetime import date, timedelta
+from contextlib import nullcontext
+from datetime import date, datetime, time, timedelta
 
-from django.core.files.base import ContentFile
+from django.conf import settings
+from django.core.files import File
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.test import RequestFactory
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.dates import MONTHS
 
 from django_smalluuid.models import SmallUUIDField, uuid_default
 
+from camp.apps.archive import writers
 from camp.apps.archive.querysets import EntryArchiveQueryset
-from camp.apps.monitors.models import Monitor
-from camp.utils.test import get_response_data
+from camp.apps.monitors.models import Entry, Monitor
 
 
 def archive_data_path(instance, filename):
@@ -50,6 +52,7 @@ class EntryArchive(models.Model):
     year = models.IntegerField(validators=[year_validator])
     month = models.IntegerField(choices=MONTHS.items())
     data = models.FileField(upload_to=archive_data_path)
+    parquet = models.FileField(upload_to=archive_data_path, blank=True)
 
     objects = EntryArchiveQueryset.as_manager()
 
@@ -76,50 +79,51 @@ class EntryArchive(models.Model):
         last_day = calendar.monthrange(self.year, self.month)[1]
         return date(self.year, self.month, last_day) + timedelta(days=1)
 
-    def get_filename(self):
+    def get_filename(self, extension='csv'):
         filename = '_'.join([
             self.monitor.__class__.__name__,
             self.monitor.slug,
             f'{self.monitor.pk}',
             f'{self.year}-{self.month}'
         ])
-        return f'{filename}.csv'
+        return f'{filename}.{extension}'
 
-    def generate(self):
-        ''' Generate the actual archive file and save it to the .data field. This
-            works by using Django's RequestFactory to manually call the CSV export
-            endpoint for the monitor, filtered to the specified month.
+    def get_columns(self):
+        from camp.api.v1.monitors.serializers import EntrySerializer
+        return EntrySerializer.base_fields + EntrySerializer.value_fields
 
-            CONSIDER: This is kinda hacky, but, y'know, it works. Should look
-            into refactoring the CSV generation later, e.g., using pandas.
-        '''
-        from camp.api.v1.monitors.endpoints import EntryCSV
-
-        params = {
-            'timestamp__gte': self.get_start_date(),
-            'timestamp__lt': self.get_end_date(),
-        }
-
-        if not self.monitor.entries.filter(**params).exists():
-            return
+    def get_entries(self):
+        return Entry.objects.filter(
+            monitor_id=self.monitor_id,
+            timestamp__gte=timezone.make_aware(datetime.combine(self.get_start_date(), time())),
+            timestamp__lt=timezone.make_aware(datetime.combine(self.get_end_date(), time())),
+        )
 
-        entry_csv = EntryCSV.as_view()
-        factory = RequestFactory()
-        url = reverse('api:v1:monitors:entry-csv', kwargs={'monitor_id': self.monitor.pk})
+    def generate(self, parquet=None):
+        ''' Generate the archive file and save it to the .data field, and a
+            Parquet copy to .parquet if `parquet` (default:
+            settings.ARCHIVE_PARQUET). The month's entries are streamed from a
+            server-side cursor into temporary files in the same format as
+            the v1 entry CSV export, so memory use doesn't depend on the size
+            of the month. Nothing is saved if the month has no entries.
+        '''
+        if parquet is None:
+            parquet = settings.ARCHIVE_PARQUET
 
-        request = factory.get(url, params)
-        request.monitor = self.monitor
-        response = entry_csv(request)
+        columns = self.get_columns()
+        rows = (self.get_entries()
+            .values_list(*columns)
+            .iterator(chunk_size=writers.CHUNK_SIZE)
+        )
 
-        assert response.status_code == 200
-        assert 'Content-Disposition' in response.headers
-        assert response.headers['Content-Disposition'].startswith('attachment')
+        with tempfile.TemporaryFile() as csv_file, \
+                (tempfile.TemporaryFile() if parquet else nullcontext()) as parquet_file:
+            if not writers.write_archive(rows, columns, csv_file, parquet_file):
+                return
 
-        content = get_response_data(response)
-        content = ContentFile(content.encode('utf8'))
+            csv_file.seek(0)
+            self.data.save(name=self.get_filename(), content=File(csv_file), save=False)
 
-        self.data.save(
-            name=self.get_filename(),
-            content=content,
-            save=False,
-        )
+            if parquet_file is not None:
+                parquet_file.seek(0)
+                self.parquet.save(name=self.get_filename('parquet'), content=File(parquet_file), save=False)
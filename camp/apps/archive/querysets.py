@@ -1,10 +1,12 @@
 import calendar
 
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 
 from django.db import models
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
 
-from camp.apps.monitors.models import Monitor
+from camp.apps.monitors.models import Entry, Monitor
 
 
 class EntryArchiveQueryset(models.QuerySet):
@@ -18,3 +20,20 @@ class EntryArchiveQueryset(models.QuerySet):
         if archive.data:
             archive.save()
         return archive
+
+    def monitors_with_data(self, year, month):
+        """
+        IDs of monitors with at least one entry in the given month, from a
+        single EXISTS query rather than one check per monitor.
+        """
+        start = date(year, month, 1)
+        end = start + timedelta(days=calendar.monthrange(year, month)[1])
+        entries = Entry.objects.filter(
+            monitor_id=OuterRef('pk'),
+            timestamp__gte=timezone.make_aware(datetime.combine(start, time())),
+            timestamp__lt=timezone.make_aware(datetime.combine(end, time())),
+        )
+        return list(Monitor.objects
+            .filter(Exists(entries))
+            .values_list('pk', flat=True)
+        )
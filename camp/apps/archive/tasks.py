@@ -9,7 +9,7 @@ from camp.apps.archive.models import EntryArchive
 from camp.apps.monitors.models import Monitor
 
 
-@db_task()
+@db_task(queue='secondary')
 def create_entry_archive(monitor_id, year, month):
     monitor = Monitor.objects.get(pk=monitor_id)
     print(f'Archiving entries: {monitor.name} ({year}-{month})')
@@ -17,9 +17,11 @@ def create_entry_archive(monitor_id, year, month):
 
 
 # In the first day of the month at 12pm UTC, archive the last month of data.
+# Only monitors that reported that month are queued, and on the secondary
+# queue, so the primary queue keeps up with ingest.
 @db_periodic_task(crontab(day='1', hour='12', minute='0'), priority=50)
 def archive_last_month_entries():
     last_month = timezone.now().date().replace(day=1) - timedelta(hours=24)
-    monitor_list = Monitor.objects.all()
-    for monitor in monitor_list:
-        create_entry_archive(monitor.pk, last_month.year, last_month.month, priority=1)
+    monitor_ids = EntryArchive.objects.monitors_with_data(last_month.year, last_month.month)
+    for monitor_id in monitor_ids:
+        create_entry_archive(monitor_id, last_month.year, last_month.month, priority=1)
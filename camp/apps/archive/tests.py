@@ -1,3 +1,62 @@
-from django.test import TestCase
+import csv
+import io
+import tempfile
 
-# Create your tests here.
+from datetime import datetime
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from camp.apps.archive.models import EntryArchive
+from camp.apps.monitors.models import Entry
+from camp.apps.monitors.purpleair.models import PurpleAir
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), ARCHIVE_PARQUET=False)
+class EntryArchiveTests(TestCase):
+    fixtures = ['purple-air.yaml']
+
+    def setUp(self):
+        self.monitor = PurpleAir.objects.get(sensor_id=8892)
+
+    def create_entry(self, day, pm25):
+        return Entry.objects.create(
+            monitor=self.monitor,
+            timestamp=timezone.make_aware(datetime(2024, 3, day, 12)),
+            sensor='a',
+            location=self.monitor.location,
+            pm25=pm25,
+        )
+
+    def test_generate_streams_month_to_csv(self):
+        self.create_entry(1, Decimal('12.50'))
+        self.create_entry(31, Decimal('8.25'))
+        self.create_entry(29, None)
+        Entry.objects.create(
+            monitor=self.monitor,
+            timestamp=timezone.make_aware(datetime(2024, 4, 1, 12)),
+            location=self.monitor.location,
+            pm25=Decimal('99.00'),
+        )
+
+        archive = EntryArchive.objects.generate(monitor=self.monitor, year=2024, month=3)
+        archive.data.open('rb')
+        rows = list(csv.reader(io.StringIO(archive.data.read().decode('utf8'))))
+        archive.data.close()
+
+        assert rows[0] == archive.get_columns()
+        assert len(rows) == 4
+        pm25 = rows[0].index('pm25')
+        assert [row[pm25] for row in rows[1:]] == ['8.25', '', '12.50']
+
+    def test_generate_skips_empty_month(self):
+        archive = EntryArchive.objects.generate(monitor=self.monitor, year=2024, month=3)
+        assert not archive.data
+        assert not EntryArchive.objects.exists()
+
+    def test_monitors_with_data(self):
+        assert EntryArchive.objects.monitors_with_data(2024, 3) == []
+        self.create_entry(15, Decimal('10.00'))
+        assert EntryArchive.objects.monitors_with_data(2024, 3) == [self.monitor.pk]
+        assert EntryArchive.objects.monitors_with_data(2024, 4) == []
@@ -0,0 +1,68 @@
+import csv
+import io
+
+from itertools import islice
+
+
+CHUNK_SIZE = 5000
+
+
+def chunked(rows, size=CHUNK_SIZE):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def parquet_schema(columns):
+    import pyarrow as pa
+
+    types = {'timestamp': pa.timestamp('us', tz='UTC'), 'sensor': pa.string()}
+    return pa.schema([(name, types.get(name, pa.float64())) for name in columns])
+
+
+def parquet_table(chunk, schema):
+    import pyarrow as pa
+
+    arrays = []
+    for index, field in enumerate(schema):
+        values = [row[index] for row in chunk]
+        if pa.types.is_floating(field.type):
+            values = [None if value is None else float(value) for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_archive(rows, columns, csv_file, parquet_file=None):
+    """
+    Write row tuples to `csv_file` in the same format as the v1 entry CSV
+    export and, when given, to `parquet_file` as well. Both are binary file
+    objects. Rows are consumed a chunk at a time, so memory use doesn't
+    grow with the number of rows. Returns the number of rows written.
+
+    Parquet output requires pyarrow.
+    """
+    text = io.TextIOWrapper(csv_file, encoding='utf8', newline='')
+    writer = csv.writer(text, quoting=csv.QUOTE_NONNUMERIC)
+    writer.writerow(columns)
+
+    parquet_writer = None
+    if parquet_file is not None:
+        import pyarrow.parquet as pq
+        schema = parquet_schema(columns)
+        parquet_writer = pq.ParquetWriter(parquet_file, schema)
+
+    count = 0
+    try:
+        for chunk in chunked(rows):
+            writer.writerows(chunk)
+            if parquet_writer is not None:
+                parquet_writer.write_table(parquet_table(chunk, schema))
+            count += len(chunk)
+    finally:
+        text.flush()
+        # Hand csv_file back to the caller open.
+        text.detach()
+        if parquet_writer is not None:
+            parquet_writer.close()
+
+    return count
@@ -9,3 +9,6 @@ class CalibrationsConfig(AppConfig):
         from . import trainers, processors
         trainers._load_all()
         processors._load_all()
+
+        # Keeps the calibration resolver in sync with training.
+        from . import signals  # noqa: F401
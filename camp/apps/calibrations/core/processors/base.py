@@ -34,7 +34,7 @@ class BaseProcessor(ABC, metaclass=ProcessorMeta):
     required_stage = None
     next_stage = None
 
-    def __init__(self, entry):
+    def __init__(self, entry, batch=None):
         if self.entry_model is not None:
             assert isinstance(entry, self.entry_model), (
                 f"{self.__class__.__name__} expected {self.entry_model.__name__}, "
@@ -42,6 +42,7 @@ class BaseProcessor(ABC, metaclass=ProcessorMeta):
             )
 
         self.entry = entry
+        self.batch = batch
 
     def __str__(self):
         return self.name
@@ -52,8 +53,36 @@ class BaseProcessor(ABC, metaclass=ProcessorMeta):
 
     @cached_property
     def context(self):
+        if self.batch is not None:
+            return self.batch.get_context(self.entry)
         return self.entry.entry_context()
 
+    def get_sibling_entry(self, entry=None):
+        entry = entry or self.entry
+        if self.batch is not None:
+            return self.batch.get_sibling_entry(entry)
+        return entry.get_sibling_entry()
+
+    def get_previous_entries(self, entry=None, limit=5):
+        entry = entry or self.entry
+        if self.batch is not None:
+            return self.batch.get_previous_entries(entry, limit)
+        return list(entry.get_previous_entries()[:limit])
+
+    def get_next_entries(self, entry=None, limit=5):
+        entry = entry or self.entry
+        if self.batch is not None:
+            return self.batch.get_next_entries(entry, limit)
+        return list(entry.get_next_entries()[:limit])
+
+    def get_previous_entry(self, entry=None):
+        entries = self.get_previous_entries(entry, limit=1)
+        return entries[0] if entries else None
+
+    def get_next_entry(self, entry=None):
+        entries = self.get_next_entries(entry, limit=1)
+        return entries[0] if entries else None
+
     @abstractmethod
     def process(self):
         '''
@@ -102,15 +131,18 @@ class BaseProcessor(ABC, metaclass=ProcessorMeta):
         defaults.update(**kwargs)
         return self.entry.clone(**defaults)
 
-    def run(self, commit=True):
+    def run(self, commit=True, validate=True):
         '''
         Runs the processor and returns the new entry, or None if no value is produced.
+
+        Pass validate=False to skip the duplicate check when the caller writes
+        the results itself with EntryQuerySet.bulk_upsert().
         '''
         if not self.is_valid():
             return
 
         processed = self.process()
-        if processed is not None and processed.validation_check():
+        if processed is not None and (not validate or processed.validation_check()):
             if commit:
                 processed.save()
             return processed
@@ -2,8 +2,8 @@ from decimal import Decimal
 
 from django.utils.functional import cached_property
 
-from camp.apps.calibrations.models import Calibration
 from camp.apps.calibrations.core.processors.base import BaseProcessor
+from camp.apps.calibrations.resolver import resolver
 from camp.utils.eval import evaluate_formula
 
 
@@ -14,8 +14,9 @@ class LinearExpressionProcessor(BaseProcessor):
 
     @cached_property
     def calibration(self):
-        if self.entry.position:
-            return Calibration.objects.get_for_entry(self.entry, self.name)
+        # Cached per process and invalidated on training, rather than a
+        # spatial query for every entry.
+        return resolver.resolve(self.entry, self.name)
 
     def process(self):
         value = self.get_correction()
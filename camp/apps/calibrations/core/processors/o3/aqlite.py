@@ -145,5 +145,5 @@ class AQLiteHourlyAggregator:
         if entry:
             entry.save()
             entry.refresh_from_db()
-            monitor.update_latest_entry(entry)
+            monitor.update_latest_entries([entry])
             return entry
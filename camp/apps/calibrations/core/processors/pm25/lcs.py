@@ -25,7 +25,7 @@ class PM25_LCS_Correction(BaseProcessor):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.sibling = self.entry.get_sibling_entry()
+        self.sibling = self.get_sibling_entry()
 
     def is_valid(self):
         # Standard validation first
@@ -66,14 +66,8 @@ class PM25_LCS_Correction(BaseProcessor):
         '''
         value = entry.value
 
-        prev_values = list(entry
-            .get_previous_entries()
-            .values_list('value', flat=True)[:max_repeat]
-        )
-        next_values = list(entry
-            .get_next_entries()
-            .values_list('value', flat=True)[:max_repeat]
-        )
+        prev_values = [e.value for e in self.get_previous_entries(entry, max_repeat)]
+        next_values = [e.value for e in self.get_next_entries(entry, max_repeat)]
 
         repeat_count = 1
         repeat_count += sum(1 for v in prev_values if v == value)
@@ -168,11 +162,11 @@ class PM25_LCS_Cleaning(BaseProcessor):
             A new CLEANED entry with the smoothed or unchanged value, or None if
             spike detection must be deferred due to missing next entry.
         '''
-        next_entry = self.entry.get_next_entry()
+        next_entry = self.get_next_entry()
         if next_entry is None:
             return
 
-        prev_entry = self.entry.get_previous_entry()
+        prev_entry = self.get_previous_entry()
         cleaned_value = self.entry.value
 
         if prev_entry and next_entry:
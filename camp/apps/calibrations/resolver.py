@@ -0,0 +1,91 @@
+from collections import defaultdict
+
+from django.contrib.gis.db.models.functions import Distance
+
+from camp.apps.calibrations.utils import VersionedCache
+
+
+class CalibrationResolver(VersionedCache):
+    """
+    Process-local equivalent of Calibration.objects.get_for_entry().
+
+    For each (entry_type, trainer), the calibrations of enabled pairs are
+    loaded once and grouped by pair, newest first. For each entry position,
+    the pairs are ordered by distance to their reference monitor once. After
+    that, resolving an entry needs no queries: walk the pairs nearest first
+    and take the newest calibration that ended by the entry's timestamp.
+    """
+
+    def __init__(self):
+        # Bumped whenever calibrations or pairs change.
+        super().__init__('calibrations:resolver:version')
+
+    def clear(self):
+        # {(entry_type, trainer): {pair_id: [calibration, ...]}}
+        self.calibrations = {}
+        # {(entry_type, trainer, position): [(distance, pair_id), ...]}
+        self.pairs = {}
+
+    def get_calibrations(self, entry_type, trainer):
+        from camp.apps.calibrations.models import Calibration
+
+        key = (entry_type, trainer)
+        if key not in self.calibrations:
+            grouped = defaultdict(list)
+            queryset = (Calibration.objects
+                .filter(
+                    pair__is_enabled=True,
+                    entry_type=entry_type,
+                    trainer=trainer,
+                    end_time__isnull=False,
+                )
+                .order_by('-created')
+            )
+            for calibration in queryset:
+                grouped[calibration.pair_id].append(calibration)
+            self.calibrations[key] = dict(grouped)
+        return self.calibrations[key]
+
+    def get_pairs(self, entry_type, trainer, position):
+        from camp.apps.calibrations.models import CalibrationPair
+
+        key = (entry_type, trainer, position.srid, position.coords)
+        if key not in self.pairs:
+            pair_ids = list(self.get_calibrations(entry_type, trainer))
+            self.pairs[key] = [
+                (distance.m, pair_id)
+                for pair_id, distance in (CalibrationPair.objects
+                    .filter(pk__in=pair_ids)
+                    .annotate(distance=Distance('reference__position', position, spheroid=True))
+                    .order_by('distance')
+                    .values_list('pk', 'distance')
+                )
+            ]
+        return self.pairs[key]
+
+    def resolve(self, entry, trainer):
+        if not entry.position:
+            return None
+
+        self.refresh()
+        trainer = str(trainer)
+        calibrations = self.get_calibrations(entry.entry_type, trainer)
+
+        # Ordered by (distance, -created), like get_for_entry(): among
+        # equally distant pairs the newest calibration wins.
+        best = best_distance = None
+        for distance, pair_id in self.get_pairs(entry.entry_type, trainer, entry.position):
+            if best is not None and distance > best_distance:
+                break
+
+            candidate = next(
+                (c for c in calibrations[pair_id] if c.end_time <= entry.timestamp),
+                None,
+            )
+            if candidate is not None and (best is None or candidate.created > best.created):
+                best, best_distance = candidate, distance
+
+        return best
+
+
+resolver = CalibrationResolver()
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from camp.apps.calibrations.models import Calibration, CalibrationPair, DefaultCalibration
+from camp.apps.calibrations.resolver import resolver
+from camp.apps.calibrations.utils import default_calibrations
+
+
+# Training writes new Calibrations, and enabling, disabling or moving a
+# pair changes which calibration is nearest, so any of these invalidates
+# the resolver used by the linear expression processors.
+
+@receiver(post_save, sender=Calibration)
+@receiver(post_delete, sender=Calibration)
+@receiver(post_save, sender=CalibrationPair)
+@receiver(post_delete, sender=CalibrationPair)
+def invalidate_resolver(sender, **kwargs):
+    resolver.invalidate()
+
+
+@receiver(post_save, sender=DefaultCalibration)
+@receiver(post_delete, sender=DefaultCalibration)
+def invalidate_default_calibrations(sender, **kwargs):
+    default_calibrations.invalidate()
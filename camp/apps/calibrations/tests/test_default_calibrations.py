@@ -0,0 +1,33 @@
+from django.test import TestCase
+
+from camp.apps.calibrations.models import DefaultCalibration
+from camp.apps.calibrations.utils import default_calibrations, get_default_calibration
+from camp.apps.entries.models import O3, PM25
+from camp.apps.monitors.purpleair.models import PurpleAir
+from camp.apps.monitors.vozbox.models import VOZBox
+
+
+class DefaultCalibrationCacheTests(TestCase):
+    def setUp(self):
+        default_calibrations.clear()
+
+    def test_lookups_are_served_from_memory(self):
+        assert get_default_calibration(VOZBox, O3) == 'VOZBox_QuinnCal'
+
+        with self.assertNumQueries(0):
+            for i in range(10):
+                assert get_default_calibration(VOZBox, O3) == 'VOZBox_QuinnCal'
+                get_default_calibration(PurpleAir, PM25)
+
+    def test_saving_a_default_invalidates(self):
+        get_default_calibration(PurpleAir, PM25)
+
+        DefaultCalibration.objects.update_or_create(
+            monitor_type=PurpleAir.monitor_type,
+            entry_type=PM25.entry_type,
+            defaults={'calibration': 'TestCalibration'},
+        )
+        assert get_default_calibration(PurpleAir, PM25) == 'TestCalibration'
+
+        DefaultCalibration.objects.get(monitor_type=PurpleAir.monitor_type, entry_type=PM25.entry_type).delete()
+        assert get_default_calibration(PurpleAir, PM25) != 'TestCalibration'
@@ -6,6 +6,7 @@ from django.utils import timezone
 
 from camp.apps.calibrations import processors
 from camp.apps.calibrations.models import CalibrationPair, Calibration
+from camp.apps.calibrations.resolver import resolver
 from camp.apps.entries.models import PM25
 from camp.apps.monitors.bam.models import BAM1022
 from camp.apps.monitors.purpleair.models import PurpleAir
@@ -128,3 +129,46 @@ class TestPM25MultivariateLinearExpressionProcessor(BaseLinearProcessorTest):
 
         assert result is not None
         assert result.value == entry.value
+
+
+class TestCalibrationResolver(BaseLinearProcessorTest):
+    def setUp(self):
+        super().setUp()
+        resolver.clear()
+
+    def test_matches_get_for_entry(self):
+        trainer = processors.PM25_UnivariateLinearRegression.name
+        older = self.create_calibration(trainer=trainer, end_time=self.timestamp - timedelta(days=2))
+        newer = self.create_calibration(trainer=trainer)
+        self.create_calibration(trainer=trainer, end_time=self.timestamp + timedelta(hours=1))
+
+        entry = self.create_pm25_entry(value=D('10.0'))
+        assert resolver.resolve(entry, trainer) == newer
+        assert resolver.resolve(entry, trainer) == Calibration.objects.get_for_entry(entry, trainer)
+
+        earlier = self.create_pm25_entry(value=D('10.0'), timestamp=self.timestamp - timedelta(days=1))
+        assert resolver.resolve(earlier, trainer) == older
+
+    def test_reuses_cached_candidates(self):
+        trainer = processors.PM25_UnivariateLinearRegression.name
+        self.create_calibration(trainer=trainer, formula='pm25 * 2')
+        entries = [
+            self.create_pm25_entry(value=D('10.0'), timestamp=self.timestamp + timedelta(minutes=i))
+            for i in range(3)
+        ]
+
+        calibration = resolver.resolve(entries[0], trainer)
+        with self.assertNumQueries(0):
+            for entry in entries:
+                assert resolver.resolve(entry, trainer) == calibration
+
+        processor = processors.PM25_UnivariateLinearRegression(entry=entries[-1])
+        assert processor.get_correction() == D('20.0')
+
+    def test_training_invalidates(self):
+        trainer = processors.PM25_UnivariateLinearRegression.name
+        entry = self.create_pm25_entry(value=D('10.0'))
+        assert resolver.resolve(entry, trainer) is None
+
+        calibration = self.create_calibration(trainer=trainer)
+        assert resolver.resolve(entry, trainer) == calibration
@@ -1,20 +1,74 @@
 import os.path
+import time
 
+from django.core.cache import cache
 from django.utils import timezone
 
 
-def get_default_calibration(monitor_model, entry_model):
+class VersionedCache:
+    '''
+    Process-local cache shared across workers by a version number in the
+    Django cache. invalidate() clears this process straight away and bumps
+    the version, and other processes notice the bump at most
+    `check_interval` seconds later.
+    '''
+
+    def __init__(self, version_key, check_interval=60):
+        self.version_key = version_key
+        self.check_interval = check_interval
+        self.version = None
+        self.checked = None
+        self.clear()
+
+    def clear(self):
+        self.data = {}
+
+    def refresh(self):
+        now = time.monotonic()
+        if self.checked is not None and now - self.checked < self.check_interval:
+            return
+
+        self.checked = now
+        version = cache.get(self.version_key)
+        if version != self.version:
+            self.version = version
+            self.clear()
+
+    def invalidate(self):
+        self.clear()
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, 1, timeout=None)
+
+
+default_calibrations = VersionedCache('calibrations:defaults:version')
+
+
+def get_default_calibrations():
+    '''
+    The whole DefaultCalibration table as {(monitor_type, entry_type):
+    calibration}, loaded once per process and reloaded after a
+    DefaultCalibration is saved or deleted.
+    '''
     from camp.apps.calibrations.models import DefaultCalibration
-    default = '' # Default to an empty string.
 
+    default_calibrations.refresh()
+    if 'table' not in default_calibrations.data:
+        default_calibrations.data['table'] = {
+            (monitor_type, entry_type): calibration
+            for monitor_type, entry_type, calibration in
+            DefaultCalibration.objects.values_list('monitor_type', 'entry_type', 'calibration')
+        }
+    return default_calibrations.data['table']
+
+
+def get_default_calibration(monitor_model, entry_model):
     # First, look it up.
-    try:
-        default = DefaultCalibration.objects.get(
-            monitor_type=monitor_model.monitor_type,
-            entry_type=entry_model.entry_type
-        ).calibration
-    except DefaultCalibration.DoesNotExist:
-        pass
+    default = get_default_calibrations().get(
+        (monitor_model.monitor_type, entry_model.entry_type),
+        '', # Default to an empty string.
+    )
 
     # Nothing configured? Default to the first calibrated processor.
     if not default:
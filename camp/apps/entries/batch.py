@@ -0,0 +1,142 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+
+from camp.apps.entries.stages import Stage
+
+
+class EntryBatch:
+    '''
+    Preloaded entry data for running processors over many entries of a
+    single monitor at once (see Monitor.process_entries_batch).
+
+    Everything a processor would normally look up per entry -- siblings,
+    neighbouring values on the same channel, and the cross-entry-type
+    context -- is fetched once for the batch's time window and then served
+    from memory. Entries written while the batch is being processed are
+    added back with add(), so later stages see earlier stages' output.
+    '''
+
+    # How many entries before/after the window to preload for each channel.
+    # Matches the deepest lookback any processor does (PM25_LCS_Correction).
+    neighbours = 5
+
+    def __init__(self, monitor, entries):
+        self.monitor = monitor
+
+        timestamps = [entry.timestamp for entry in entries]
+        self.start_time = min(timestamps) if timestamps else None
+        self.end_time = max(timestamps) if timestamps else None
+
+        # (EntryModel, stage) pairs whose window has been loaded.
+        self._loaded = set()
+        # (EntryModel, stage, processor, sensor) channels whose margins have been loaded.
+        self._margins = set()
+        # (EntryModel, stage, processor, sensor) -> entries ordered by timestamp.
+        self._series = defaultdict(list)
+        # (EntryModel, stage) -> {timestamp: [entries]}
+        self._instants = defaultdict(lambda: defaultdict(list))
+
+    def _get_queryset(self, EntryModel, stage):
+        return EntryModel.objects.filter(monitor_id=self.monitor.pk, stage=stage)
+
+    def _load(self, EntryModel, stage):
+        key = (EntryModel, stage)
+        if key in self._loaded or self.start_time is None:
+            return
+
+        self._loaded.add(key)
+        self.add(self._get_queryset(EntryModel, stage)
+            .filter(timestamp__range=(self.start_time, self.end_time))
+        )
+
+    def _load_margins(self, EntryModel, stage, processor, sensor):
+        key = (EntryModel, stage, processor, sensor)
+        if key in self._margins or self.start_time is None:
+            return
+
+        self._load(EntryModel, stage)
+        self._margins.add(key)
+
+        queryset = self._get_queryset(EntryModel, stage).filter(processor=processor, sensor=sensor)
+        self.add(queryset.filter(timestamp__lt=self.start_time).order_by('-timestamp')[:self.neighbours])
+        self.add(queryset.filter(timestamp__gt=self.end_time).order_by('timestamp')[:self.neighbours])
+
+    def _get_series(self, entry):
+        self._load_margins(entry.__class__, entry.stage, entry.processor, entry.sensor)
+        return self._series[(entry.__class__, entry.stage, entry.processor, entry.sensor)]
+
+    def add(self, entries):
+        '''
+        Add entries to the batch, replacing any already held for the same
+        (entry type, stage, processor, sensor, timestamp). Entries for an
+        (entry type, stage) that hasn't been loaded yet are skipped; they'll
+        be read from the database if they're ever needed.
+        '''
+        for entry in entries:
+            if (entry.__class__, entry.stage) not in self._loaded:
+                continue
+
+            entry.monitor = self.monitor
+
+            series = self._series[(entry.__class__, entry.stage, entry.processor, entry.sensor)]
+            index = bisect_left(series, entry.timestamp, key=lambda e: e.timestamp)
+            if index < len(series) and series[index].timestamp == entry.timestamp:
+                series[index] = entry
+            else:
+                insort(series, entry, key=lambda e: e.timestamp)
+
+            instant = self._instants[(entry.__class__, entry.stage)][entry.timestamp]
+            instant[:] = [e for e in instant if (e.sensor, e.processor) != (entry.sensor, entry.processor)]
+            instant.append(entry)
+            instant.sort(key=lambda e: (e.sensor, e.processor))
+
+    def get_previous_entries(self, entry, limit=None):
+        limit = limit or self.neighbours
+        series = self._get_series(entry)
+        index = bisect_left(series, entry.timestamp, key=lambda e: e.timestamp)
+        return series[max(index - limit, 0):index][::-1]
+
+    def get_next_entries(self, entry, limit=None):
+        limit = limit or self.neighbours
+        series = self._get_series(entry)
+        index = bisect_right(series, entry.timestamp, key=lambda e: e.timestamp)
+        return series[index:index + limit]
+
+    def get_sibling_entry(self, entry):
+        '''
+        In-memory equivalent of BaseEntry.get_sibling_entry().
+        '''
+        if not entry.sensor:
+            return None
+
+        sensors = self.monitor.ENTRY_CONFIG.get(entry.__class__, {}).get('sensors')
+        if not sensors or len(sensors) < 2:
+            return None
+
+        self._load(entry.__class__, entry.stage)
+        for sibling in self._instants[(entry.__class__, entry.stage)].get(entry.timestamp, []):
+            if (
+                sibling.sensor != entry.sensor
+                and sibling.sensor in sensors
+                and sibling.processor == entry.processor
+            ):
+                return sibling
+
+    def get_context(self, entry):
+        '''
+        In-memory equivalent of BaseEntry.entry_context().
+        '''
+        context = {}
+
+        for EntryModel, config in self.monitor.ENTRY_CONFIG.items():
+            stage = config.get('default_stage', Stage.RAW)
+            self._load(EntryModel, stage)
+
+            matches = self._instants[(EntryModel, stage)].get(entry.timestamp)
+            if matches:
+                data = matches[0].declared_data()
+                if len(data) == 1 and 'value' in data:
+                    data[EntryModel._meta.model_name] = data.pop('value')
+                context.update(data)
+
+        return context
@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from camp.apps.entries import partitions
+from camp.apps.entries.models import BaseEntry
+
+
+class Command(BaseCommand):
+    help = 'Convert entry tables to monthly partitions, create upcoming partitions, and drop expired ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            help='Only these entry models, by name (e.g. PM25). May be repeated.',
+        )
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help='Convert unpartitioned tables. Existing rows become a single partition covering through the end of this month.',
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=settings.ENTRY_PARTITION_MONTHS_AHEAD,
+            help=f'Monthly partitions to create ahead (default: {settings.ENTRY_PARTITION_MONTHS_AHEAD})',
+        )
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            default=settings.ENTRY_RETENTION_MONTHS,
+            help='Remove partitions older than this many months (default: ENTRY_RETENTION_MONTHS, 0 keeps all)',
+        )
+        parser.add_argument(
+            '--detach',
+            action='store_true',
+            default=settings.ENTRY_RETENTION_DETACH,
+            help='Detach expired partitions instead of dropping them',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Print what would change without changing anything',
+        )
+
+    def handle(self, *args, **options):
+        models = sorted(BaseEntry.get_subclasses(), key=lambda m: m.__name__)
+        if options['models']:
+            names = {name.lower() for name in options['models']}
+            models = [Model for Model in models if Model.__name__.lower() in names]
+            if not models:
+                raise CommandError(f'No entry models match {", ".join(options["models"])}')
+
+        dry_run = options['dry_run']
+        now = timezone.now()
+        current = partitions.month_start(now)
+        prefix = '[DRY RUN] ' if dry_run else ''
+
+        for Model in models:
+            if not partitions.is_partitioned(Model):
+                if not options['convert']:
+                    self.stdout.write(f'  {Model.__name__}: not partitioned (use --convert)')
+                    continue
+                # Live tables already have rows from this month, so the
+                # legacy partition runs through the end of it.
+                cutover = partitions.add_months(current, 1)
+                self.stdout.write(f'  {prefix}{Model.__name__}: converting, legacy partition ends {cutover:%Y-%m}')
+                if dry_run:
+                    continue
+                partitions.convert_to_partitioned(Model, cutover)
+
+            if dry_run:
+                self.stdout.write(f'  {prefix}{Model.__name__}: would ensure {options["months_ahead"]} months ahead')
+            else:
+                names = partitions.ensure_partitions(Model, now, months_ahead=options['months_ahead'])
+                if names:
+                    self.stdout.write(f'  {Model.__name__}: partitions through {names[-1]}')
+
+            if options['retention_months']:
+                cutoff = partitions.add_months(current, -options['retention_months'])
+                removed = partitions.drop_partitions(Model, cutoff, detach=options['detach'], dry_run=dry_run)
+                action = 'detached' if options['detach'] else 'dropped'
+                for name in removed:
+                    self.stdout.write(f'  {prefix}{Model.__name__}: {action} {name}')
+
+        self.stdout.write(self.style.SUCCESS(f'{prefix}Done.'))
@@ -6,6 +6,7 @@ import tqdm
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
+from camp.apps.entries import partitions
 from camp.apps.entries.models import BaseEntry
 
 
@@ -51,6 +52,12 @@ class Command(BaseCommand):
         grand_total = 0
 
         for Model in sorted(BaseEntry.get_subclasses(), key=lambda m: m.__name__):
+            # Whole expired partitions go in one statement each; only the
+            # remainder in the boundary partition is deleted row by row.
+            if partitions.is_partitioned(Model):
+                for name in partitions.drop_partitions(Model, cutoff, dry_run=dry_run):
+                    self.stdout.write(f'  {Model.__name__}: {"would drop" if dry_run else "dropped"} partition {name}')
+
             count = Model.objects.filter(timestamp__lt=cutoff).count()
             if count == 0:
                 self.stdout.write(f'  {Model.__name__}: nothing to delete')
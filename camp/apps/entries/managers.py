@@ -1,9 +1,15 @@
+from decimal import Decimal, ROUND_HALF_UP
+
 from django.db import models
 
 import pandas as pd
 
+from camp.utils.datetime import make_aware
+
 
 class EntryQuerySet(models.QuerySet):
+    unique_fields = ['monitor', 'timestamp', 'sensor', 'stage', 'processor']
+
     def projections(self, fields=None):
         """
         Returns the queryset projected to the model's projection_fields.
@@ -34,3 +40,67 @@ class EntryQuerySet(models.QuerySet):
             df['value'] = df['value'].astype(float)
 
         return df
+
+    def bulk_upsert(self, entries, batch_size=1000):
+        """
+        Insert a batch of unsaved entries, updating the value fields of any
+        row that already exists for (monitor, timestamp, sensor, stage, processor).
+
+        Mirrors Monitor.create_entry() for many entries at once: existing rows
+        are fetched in one query, unchanged rows are skipped, and everything
+        else is written with a single INSERT ... ON CONFLICT DO UPDATE per batch.
+
+        Returns the list of entries that were created or changed, with primary
+        keys and value fields matching what was stored.
+        """
+        value_fields = self.model.declared_fields
+        timestamp_field = self.model._meta.get_field('timestamp')
+
+        # Normalize values to their stored form so they compare (and process)
+        # the same as an entry that was refreshed from the database.
+        pending = {}
+        for entry in entries:
+            entry.timestamp = make_aware(timestamp_field.to_python(entry.timestamp))
+            for field in value_fields:
+                value = field.to_python(getattr(entry, field.attname))
+                if isinstance(value, Decimal) and getattr(field, 'decimal_places', None) is not None:
+                    value = value.quantize(Decimal(1).scaleb(-field.decimal_places), rounding=ROUND_HALF_UP)
+                setattr(entry, field.attname, value)
+
+            key = (entry.monitor_id, entry.timestamp, entry.sensor, entry.stage, entry.processor)
+            pending[key] = entry
+
+        if not pending:
+            return []
+
+        existing = (self.model.objects
+            .filter(
+                monitor_id__in={key[0] for key in pending},
+                timestamp__in={key[1] for key in pending},
+            )
+            .values_list(
+                'monitor_id', 'timestamp', 'sensor', 'stage', 'processor',
+                *[field.attname for field in value_fields],
+            )
+        )
+
+        for row in existing:
+            key, values = tuple(row[:5]), row[5:]
+            entry = pending.get(key)
+            if entry is None:
+                continue
+
+            if all(getattr(entry, field.attname) == value for field, value in zip(value_fields, values)):
+                del pending[key]
+
+        changed = list(pending.values())
+        if changed:
+            self.model.objects.bulk_create(
+                changed,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=self.unique_fields,
+                update_fields=[field.name for field in value_fields] + ['modified'],
+            )
+
+        return changed
@@ -0,0 +1,124 @@
+# Generated by Django 5.2.15 on 2026-10-17 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0005_dewpoint_eto_etr_netradiation_precipitation_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='co',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.co'),
+        ),
+        migrations.AlterField(
+            model_name='co2',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.co2'),
+        ),
+        migrations.AlterField(
+            model_name='dewpoint',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.dewpoint'),
+        ),
+        migrations.AlterField(
+            model_name='eto',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.eto'),
+        ),
+        migrations.AlterField(
+            model_name='etr',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.etr'),
+        ),
+        migrations.AlterField(
+            model_name='humidity',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.humidity'),
+        ),
+        migrations.AlterField(
+            model_name='netradiation',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.netradiation'),
+        ),
+        migrations.AlterField(
+            model_name='no2',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.no2'),
+        ),
+        migrations.AlterField(
+            model_name='o3',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.o3'),
+        ),
+        migrations.AlterField(
+            model_name='particulates',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.particulates'),
+        ),
+        migrations.AlterField(
+            model_name='pm10',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.pm10'),
+        ),
+        migrations.AlterField(
+            model_name='pm100',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.pm100'),
+        ),
+        migrations.AlterField(
+            model_name='pm25',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.pm25'),
+        ),
+        migrations.AlterField(
+            model_name='precipitation',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.precipitation'),
+        ),
+        migrations.AlterField(
+            model_name='pressure',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.pressure'),
+        ),
+        migrations.AlterField(
+            model_name='so2',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.so2'),
+        ),
+        migrations.AlterField(
+            model_name='soiltemperature',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.soiltemperature'),
+        ),
+        migrations.AlterField(
+            model_name='solarradiation',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.solarradiation'),
+        ),
+        migrations.AlterField(
+            model_name='temperature',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.temperature'),
+        ),
+        migrations.AlterField(
+            model_name='vaporpressure',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.vaporpressure'),
+        ),
+        migrations.AlterField(
+            model_name='winddirection',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.winddirection'),
+        ),
+        migrations.AlterField(
+            model_name='windspeed',
+            name='origin',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived_entries', to='entries.windspeed'),
+        ),
+    ]
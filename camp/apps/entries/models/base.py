@@ -39,7 +39,10 @@ class BaseEntry(models.Model):
     sensor = models.CharField(max_length=50, blank=True, default='', db_index=True)
 
     stage = models.CharField(max_length=16, choices=Stage.choices, default=Stage.RAW, help_text=_('The processing stage for this entry.'))
-    origin = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL, related_name='derived_entries')
+    # No database constraint: a foreign key into a partitioned table would have
+    # to reference (id, timestamp). Derived entries share their origin's
+    # timestamp, so both always live in the same partition.
+    origin = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL, related_name='derived_entries', db_constraint=False)
 
     processor = models.CharField(
         max_length=100,
@@ -0,0 +1,273 @@
+"""
+Monthly range partitioning of entry tables on `timestamp`.
+
+A table is converted once with convert_to_partitioned(): the existing
+table is attached, as is, as the partition holding everything before the
+cutover month. Monthly partitions from then on are created ahead of time
+by ensure_partitions(), with a DEFAULT partition catching anything that
+arrives outside them (e.g. sensors with bad clocks); those rows are moved
+into their month's partition when it is created. Retention works on whole partitions with
+drop_partitions() rather than row-level DELETEs.
+
+Queries constrained on timestamp (timelines, summaries, health checks)
+are pruned to the matching partitions by PostgreSQL automatically.
+"""
+import logging
+import re
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+logger = logging.getLogger(__name__)
+
+UPPER_BOUND_RE = re.compile(r"TO \('([^']+)'\)")
+
+
+def month_start(value):
+    """The UTC month containing `value`, as an aware datetime."""
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value, months):
+    total = value.month - 1 + months
+    return value.replace(year=value.year + total // 12, month=total % 12 + 1)
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y_%m}'
+
+
+def quote(name):
+    return connection.ops.quote_name(name)
+
+
+def is_partitioned(model):
+    with connection.cursor() as cursor:
+        cursor.execute('''
+            SELECT 1
+            FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = %s
+        ''', [model._meta.db_table])
+        return cursor.fetchone() is not None
+
+
+def get_partitions(model):
+    """
+    Return [(name, upper_bound)] for each partition of the model's table,
+    where upper_bound is an aware datetime, or None for the DEFAULT
+    partition.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('''
+            SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE parent.relname = %s
+            ORDER BY child.relname
+        ''', [model._meta.db_table])
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        match = UPPER_BOUND_RE.search(bound)
+        upper = parse_datetime(match.group(1)) if match else None
+        partitions.append((name, upper))
+    return partitions
+
+
+def table_exists(name):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [quote(name)])
+        return cursor.fetchone()[0]
+
+
+@transaction.atomic
+def create_partition(model, month):
+    """
+    Create the partition for the UTC month starting at `month`, if missing.
+
+    PostgreSQL refuses to create a partition while the DEFAULT partition
+    holds rows in its range, so any such rows are moved across: the DEFAULT
+    partition is detached, the new partition created, the rows moved, and
+    the DEFAULT partition attached again.
+    """
+    table = model._meta.db_table
+    name = partition_name(table, month)
+    default = f'{table}_default'
+    bounds = [month, add_months(month, 1)]
+
+    if table_exists(name):
+        return name
+
+    with connection.cursor() as cursor:
+        stray = False
+        if table_exists(default):
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM {quote(default)} WHERE timestamp >= %s AND timestamp < %s)',
+                bounds,
+            )
+            stray = cursor.fetchone()[0]
+
+        if stray:
+            cursor.execute(f'ALTER TABLE {quote(table)} DETACH PARTITION {quote(default)}')
+
+        cursor.execute(
+            f'CREATE TABLE {quote(name)} PARTITION OF {quote(table)} '
+            f'FOR VALUES FROM (%s) TO (%s)',
+            bounds,
+        )
+
+        if stray:
+            cursor.execute(
+                f'INSERT INTO {quote(name)} SELECT * FROM {quote(default)} '
+                f'WHERE timestamp >= %s AND timestamp < %s',
+                bounds,
+            )
+            cursor.execute(
+                f'DELETE FROM {quote(default)} WHERE timestamp >= %s AND timestamp < %s',
+                bounds,
+            )
+            cursor.execute(f'ALTER TABLE {quote(table)} ATTACH PARTITION {quote(default)} DEFAULT')
+    return name
+
+
+def ensure_partitions(model, now, months_ahead=3):
+    """
+    Make sure the model's table has a partition for every month from the
+    current one through `months_ahead` months out, plus a DEFAULT partition.
+    Months still covered by the legacy partition (see
+    convert_to_partitioned()) are skipped. Returns the names of the
+    partitions that were checked.
+    """
+    table = model._meta.db_table
+    current = month_start(now)
+    legacy_end = dict(get_partitions(model)).get(f'{table}_legacy')
+
+    names = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if legacy_end is not None and month < legacy_end:
+            continue
+        names.append(create_partition(model, month))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {quote(f"{table}_default")} '
+            f'PARTITION OF {quote(table)} DEFAULT'
+        )
+    return names
+
+
+def drop_partitions(model, before, detach=False, dry_run=False):
+    """
+    Remove every partition whose rows all fall before `before`. With
+    `detach`, partitions are only detached from the table, leaving the data
+    in a standalone table to archive or drop later. Returns the names of the
+    affected partitions.
+    """
+    table = model._meta.db_table
+    expired = [
+        name for name, upper in get_partitions(model)
+        if upper is not None and upper <= before
+    ]
+
+    if not dry_run:
+        with connection.cursor() as cursor:
+            for name in expired:
+                cursor.execute(f'ALTER TABLE {quote(table)} DETACH PARTITION {quote(name)}')
+                if not detach:
+                    cursor.execute(f'DROP TABLE {quote(name)}')
+    return expired
+
+
+def maintain_partitions(now=None):
+    """
+    Create upcoming partitions for every partitioned entry table and apply
+    settings.ENTRY_RETENTION_MONTHS. Tables that haven't been converted are
+    skipped. Returns {model name: (created/checked, removed)}.
+    """
+    from camp.apps.entries.models import BaseEntry
+
+    now = now or timezone.now()
+    results = {}
+    for model in BaseEntry.get_subclasses():
+        if not is_partitioned(model):
+            continue
+
+        # One table failing shouldn't hold up the rest.
+        try:
+            with transaction.atomic():
+                checked = ensure_partitions(model, now, months_ahead=settings.ENTRY_PARTITION_MONTHS_AHEAD)
+                removed = []
+                if settings.ENTRY_RETENTION_MONTHS:
+                    cutoff = add_months(month_start(now), -settings.ENTRY_RETENTION_MONTHS)
+                    removed = drop_partitions(model, cutoff, detach=settings.ENTRY_RETENTION_DETACH)
+        except Exception:
+            logger.exception('Partition maintenance failed for %s', model.__name__)
+            continue
+        results[model.__name__] = (checked, removed)
+    return results
+
+
+@transaction.atomic
+def convert_to_partitioned(model, cutover):
+    """
+    Turn the model's table into a table partitioned by month on
+    `timestamp`. The existing table is renamed to `<table>_legacy` and
+    attached unchanged as the partition for everything before `cutover`
+    (a UTC month start), so no rows are copied. `cutover` must be later
+    than every existing row, so for a live table use the start of next
+    month; ensure_partitions() leaves the months before it to the legacy
+    partition.
+
+    PostgreSQL requires the partition key in every unique index, so the
+    primary key becomes (id, timestamp). The unique entry constraint
+    already includes timestamp.
+    """
+    table = model._meta.db_table
+    legacy = f'{table}_legacy'
+
+    with connection.cursor() as cursor:
+        cursor.execute('''
+            SELECT conname, contype, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype IN ('p', 'f')
+        ''', [table])
+        constraints = cursor.fetchall()
+
+        cursor.execute(f'ALTER TABLE {quote(table)} RENAME TO {quote(legacy)}')
+
+        for name, kind, definition in constraints:
+            if kind == 'p':
+                cursor.execute(f'ALTER TABLE {quote(legacy)} DROP CONSTRAINT {quote(name)}')
+        cursor.execute(f'ALTER TABLE {quote(legacy)} ADD PRIMARY KEY (id, timestamp)')
+
+        # A matching CHECK lets ATTACH skip scanning the legacy rows.
+        cursor.execute(
+            f'ALTER TABLE {quote(legacy)} ADD CONSTRAINT {quote(f"{legacy}_bounds")} '
+            f'CHECK (timestamp IS NOT NULL AND timestamp < %s)',
+            [cutover],
+        )
+
+        cursor.execute(
+            f'CREATE TABLE {quote(table)} (LIKE {quote(legacy)} INCLUDING DEFAULTS INCLUDING INDEXES) '
+            f'PARTITION BY RANGE (timestamp)'
+        )
+        for name, kind, definition in constraints:
+            if kind == 'f':
+                cursor.execute(f'ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}')
+
+        cursor.execute(
+            f'ALTER TABLE {quote(table)} ATTACH PARTITION {quote(legacy)} '
+            f'FOR VALUES FROM (MINVALUE) TO (%s)',
+            [cutover],
+        )
+        cursor.execute(f'ALTER TABLE {quote(legacy)} DROP CONSTRAINT {quote(f"{legacy}_bounds")}')
@@ -5,9 +5,11 @@ from datetime import date, datetime, timedelta
 from django.core.files.storage import default_storage, FileSystemStorage
 from django.utils import timezone
 
-from django_huey import db_task
+from django_huey import db_periodic_task, db_task
+from huey import crontab
 
 from camp.apps.entries import models as entry_models
+from camp.apps.entries.partitions import maintain_partitions
 from camp.apps.entries.utils import generate_export_path
 from camp.apps.monitors.models import Monitor
 from camp.utils.datetime import chunk_date_range
@@ -168,3 +170,11 @@ def data_export(monitor_id, start_date, end_date, scope=None, email=None):
         'status': 'complete',
         'url': url
     }
+
+
+# Daily, keep the next few monthly entry partitions created and drop the
+# ones past retention. A no-op until the tables are converted with
+# `manage.py partition_entries --convert`.
+@db_periodic_task(crontab(hour='6', minute='30'), priority=50)
+def maintain_entry_partitions():
+    maintain_partitions()
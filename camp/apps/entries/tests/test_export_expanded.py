@@ -149,6 +149,25 @@ class ExpandedEntryTimelineTests(TestCase):
         assert df.iloc[0]['particulates_raw_a_particles_03um'] == Decimal('123.4')
         assert df.iloc[0]['particulates_raw_a_particles_05um'] == Decimal('45.6')
 
+    def test_iter_rows_matches_dataframe(self):
+        timeline = ExpandedEntryTimeline(
+            monitor=self.monitor,
+            start_time=self.timestamp - timedelta(hours=1),
+            end_time=self.timestamp + timedelta(hours=1),
+            entry_types=[PM25, Humidity, Temperature],
+        )
+        df = timeline.to_dataframe()
+        rows = list(timeline.iter_rows())
+
+        assert timeline.get_columns() == list(df.columns)
+        assert len(rows) == 1
+
+        ts, row = rows[0]
+        assert pd.Timestamp(ts) == df.index[0]
+        assert row['timestamp_local'] == df.iloc[0]['timestamp_local']
+        for column in df.columns[1:]:
+            assert float(row[column]) == float(df.iloc[0][column])
+
     def test_empty_dataset_returns_empty_df_with_datetime_index(self):
         df = ExpandedEntryTimeline(
             monitor=self.monitor,
@@ -105,3 +105,23 @@ class ResolvedEntryTimelineTests(TestCase):
         # timestamp_local should be derived from index and have same length
         assert 'timestamp_local' in df.columns
         assert len(df['timestamp_local']) == len(df.index)
+
+    def test_iter_rows_matches_dataframe(self):
+        self._create_entry(PM25, timestamp='2025-01-01T00:00:00Z', value=10)
+        self._create_entry(PM25, timestamp='2025-01-01T01:00:00Z', value=12)
+        self._create_entry(Temperature, timestamp='2025-01-01T00:00:00Z', value=65)
+        self._create_entry(Temperature, timestamp='2025-01-01T02:00:00Z', value=66)
+
+        timeline = ResolvedEntryTimeline(monitor=self.monitor, entry_types=[PM25, Temperature])
+        df = timeline.to_dataframe()
+        rows = list(timeline.iter_rows())
+
+        assert timeline.get_columns() == list(df.columns)
+        assert [pd.Timestamp(ts) for ts, row in rows] == list(df.index)
+        for (ts, row), (_, expected) in zip(rows, df.iterrows()):
+            assert row['timestamp_local'] == expected['timestamp_local']
+            for column in ('pm25', 'temperature'):
+                if pd.isna(expected[column]):
+                    assert column not in row
+                else:
+                    assert row[column] == expected[column]
@@ -0,0 +1,96 @@
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from camp.apps.entries import partitions
+from camp.apps.entries.models import PM25
+from camp.apps.monitors.purpleair.models import PurpleAir
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class PartitionTests(TestCase):
+    fixtures = ['purple-air.yaml']
+
+    def setUp(self):
+        self.monitor = PurpleAir.objects.get(sensor_id=8892)
+
+    def create_entry(self, timestamp, value):
+        return PM25.objects.create(
+            monitor=self.monitor,
+            timestamp=timestamp,
+            value=value,
+            sensor='a',
+            stage=PM25.Stage.RAW,
+        )
+
+    def test_month_helpers(self):
+        assert partitions.month_start(utc(2025, 3, 17, 8, 30)) == utc(2025, 3, 1)
+        assert partitions.add_months(utc(2025, 11, 1), 3) == utc(2026, 2, 1)
+        assert partitions.add_months(utc(2025, 1, 1), -1) == utc(2024, 12, 1)
+        assert partitions.partition_name('entries_pm25', utc(2025, 3, 1)) == 'entries_pm25_p2025_03'
+
+    def test_convert_ensure_and_drop(self):
+        legacy = self.create_entry(utc(2024, 12, 15), 10)
+
+        assert not partitions.is_partitioned(PM25)
+        partitions.convert_to_partitioned(PM25, utc(2025, 1, 1))
+        assert partitions.is_partitioned(PM25)
+
+        names = partitions.ensure_partitions(PM25, utc(2025, 1, 10), months_ahead=2)
+        assert names == ['entries_pm25_p2025_01', 'entries_pm25_p2025_02', 'entries_pm25_p2025_03']
+
+        current = self.create_entry(utc(2025, 1, 20), 12)
+        future = self.create_entry(utc(2026, 6, 1), 14)
+        assert PM25.objects.count() == 3
+
+        # Existing rows stay in place, new rows are routed by month.
+        bounds = dict(partitions.get_partitions(PM25))
+        assert bounds['entries_pm25_legacy'] == utc(2025, 1, 1)
+        assert bounds['entries_pm25_default'] is None
+
+        assert partitions.drop_partitions(PM25, utc(2025, 1, 1), dry_run=True) == ['entries_pm25_legacy']
+        assert PM25.objects.count() == 3
+
+        assert partitions.drop_partitions(PM25, utc(2025, 1, 1)) == ['entries_pm25_legacy']
+        assert set(PM25.objects.values_list('pk', flat=True)) == {current.pk, future.pk}
+        assert not PM25.objects.filter(pk=legacy.pk).exists()
+
+    def test_convert_live_table_with_rows_this_month(self):
+        now = timezone.now()
+        entry = self.create_entry(now, 10)
+
+        call_command('partition_entries', '--convert', '--model', 'PM25', '--months-ahead', '2', stdout=StringIO())
+
+        assert partitions.is_partitioned(PM25)
+        current = partitions.month_start(now)
+        bounds = dict(partitions.get_partitions(PM25))
+        assert bounds['entries_pm25_legacy'] == partitions.add_months(current, 1)
+        # This month stays with the legacy partition, rather than overlapping it.
+        assert partitions.partition_name('entries_pm25', current) not in bounds
+        assert partitions.partition_name('entries_pm25', partitions.add_months(current, 2)) in bounds
+        assert PM25.objects.filter(pk=entry.pk).exists()
+
+    def test_create_partition_moves_rows_out_of_default(self):
+        partitions.convert_to_partitioned(PM25, utc(2025, 1, 1))
+        partitions.ensure_partitions(PM25, utc(2025, 1, 10), months_ahead=0)
+
+        # A bad clock puts a row well past the partitions created so far.
+        future = self.create_entry(utc(2026, 6, 1), 14)
+
+        name = partitions.create_partition(PM25, utc(2026, 6, 1))
+        assert name == 'entries_pm25_p2026_06'
+        assert 'entries_pm25_default' in dict(partitions.get_partitions(PM25))
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {name}')
+            assert cursor.fetchone()[0] == 1
+            cursor.execute('SELECT COUNT(*) FROM entries_pm25_default')
+            assert cursor.fetchone()[0] == 0
+        assert PM25.objects.filter(pk=future.pk).exists()
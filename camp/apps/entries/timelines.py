@@ -1,10 +1,15 @@
-from typing import List, Optional, Type
+import heapq
+
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterator, List, Optional, Tuple, Type
 
 from django.conf import settings
 
 import pandas as pd
 
 from camp.apps.entries.models import BaseEntry
+from camp.utils.datetime import localtime
 
 
 class EntryTimeline:
@@ -13,8 +18,14 @@ class EntryTimeline:
     aligned by timestamp, using each entry's default stage and sensor.
 
     If entry_types is None, all known Entry types will be fetched.
+
+    Besides to_dataframe(), timelines can be streamed with iter_rows(), which
+    never holds more than one timestamp's worth of entries in memory.
     """
 
+    # Rows fetched per round trip by each entry type's server-side cursor
+    chunk_size = 2000
+
     def __init__(
         self,
         monitor,
@@ -65,6 +76,41 @@ class EntryTimeline:
     def to_dataframe(self) -> Optional[pd.DataFrame]:
         raise NotImplementedError
 
+    def get_columns(self) -> List[str]:
+        """
+        The data columns iter_rows() may emit, in the same order as the
+        columns of to_dataframe().
+        """
+        raise NotImplementedError
+
+    def iter_cells(self, entry_model) -> Iterator[Tuple]:
+        """
+        Yield (timestamp, column, value) for one entry type, ordered by timestamp.
+        """
+        raise NotImplementedError
+
+    def iter_rows(self) -> Iterator[Tuple]:
+        """
+        Stream (timestamp, row) pairs in timestamp order, where row maps
+        column -> value and always includes timestamp_local. Columns with no
+        entry at that timestamp are omitted from the row.
+
+        Each entry type is read through its own server-side cursor and the
+        cursors are k-way merged on timestamp, so memory use doesn't grow
+        with the length of the range.
+        """
+        cells = heapq.merge(
+            *(self.iter_cells(entry_model) for entry_model in self.entry_types),
+            key=itemgetter(0),
+        )
+
+        for timestamp, group in groupby(cells, key=itemgetter(0)):
+            row = {'timestamp_local': localtime(timestamp)}
+            for _, column, value in group:
+                # First value wins, same as the pivot's aggfunc='first'
+                row.setdefault(column, value)
+            yield timestamp, row
+
 
 class ResolvedEntryTimeline(EntryTimeline):
     def get_queryset(self, entry_model):
@@ -86,6 +132,26 @@ class ResolvedEntryTimeline(EntryTimeline):
 
         return field_map
 
+    def get_columns(self) -> List[str]:
+        columns = ['timestamp_local']
+        for entry_model in self.entry_types:
+            columns.extend(self.get_field_map(entry_model).values())
+        return columns
+
+    def iter_cells(self, entry_model):
+        field_map = self.get_field_map(entry_model)
+        fields = list(field_map)
+        rows = (self
+            .get_queryset(entry_model)
+            .order_by('timestamp', 'sensor', 'processor')
+            .values_list('timestamp', *fields)
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+        for timestamp, *values in rows:
+            for field, value in zip(fields, values):
+                yield timestamp, field_map[field], value
+
     def to_dataframe(self) -> Optional[pd.DataFrame]:
         frames: list[pd.DataFrame] = []
 
@@ -118,6 +184,50 @@ class ResolvedEntryTimeline(EntryTimeline):
 
 
 class ExpandedEntryTimeline(EntryTimeline):
+    def get_column_key(self, entry_model, stage, processor, sensor) -> str:
+        bits = [entry_model.entry_type]
+        bits.append(processor if stage == entry_model.Stage.CALIBRATED else stage)
+        if sensor:
+            bits.append(sensor)
+        return '_'.join(bits)
+
+    def get_columns(self) -> List[str]:
+        columns = set()
+        for entry_model in self.entry_types:
+            fields = entry_model.declared_field_names
+            channels = (self
+                .get_queryset(entry_model)
+                .order_by()
+                .values_list('stage', 'processor', 'sensor')
+                .distinct()
+            )
+            for stage, processor, sensor in channels:
+                key = self.get_column_key(entry_model, stage, processor, sensor)
+                if fields == ['value']:
+                    columns.add(key)
+                else:
+                    columns.update(f'{key}_{field}' for field in fields)
+
+        # Sorted, like the pivot_table columns in to_dataframe()
+        return ['timestamp_local', *sorted(columns)]
+
+    def iter_cells(self, entry_model):
+        fields = entry_model.declared_field_names
+        rows = (self
+            .get_queryset(entry_model)
+            .order_by('timestamp', 'sensor', 'stage', 'processor')
+            .values_list('timestamp', 'stage', 'processor', 'sensor', *fields)
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+        for timestamp, stage, processor, sensor, *values in rows:
+            key = self.get_column_key(entry_model, stage, processor, sensor)
+            if fields == ['value']:
+                yield timestamp, key, values[0]
+            else:
+                for field, value in zip(fields, values):
+                    yield timestamp, f'{key}_{field}', value
+
     def to_dataframe(self) -> Optional[pd.DataFrame]:
         frames: list[pd.DataFrame] = []
 
@@ -129,15 +239,10 @@ class ExpandedEntryTimeline(EntryTimeline):
                 continue
 
             df = df.reset_index()
-
-            def label_row(row) -> str:
-                bits = [entry_model.entry_type]
-                bits.append(row['processor'] if row['stage'] == entry_model.Stage.CALIBRATED else row['stage'])
-                if row['sensor']:
-                    bits.append(row['sensor'])
-                return '_'.join(bits)
-
-            df['column_key'] = df.apply(label_row, axis=1)
+            df['column_key'] = [
+                self.get_column_key(entry_model, stage, processor, sensor)
+                for stage, processor, sensor in zip(df['stage'], df['processor'], df['sensor'])
+            ]
             fields = entry_model.declared_field_names
 
             if fields == ['value']:
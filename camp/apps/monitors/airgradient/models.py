@@ -242,29 +242,24 @@ class AirGradient(LCSMixin, Monitor):
         for EntryModel, spec in self.ENTRY_CONFIG.items():
             fields = spec.get('fields', {})
 
+            # One row per channel; create_entry() drops any with missing data.
+            rows = []
             for channel, channel_payload in channels:
                 data = {
                     field_name: channel_payload.get(source_key)
                     for field_name, source_key in fields.items()
                 }
+                rows.append(dict(timestamp=timestamp, sensor=channel, **data))
 
-                entry = self.create_entry(
-                    EntryModel=EntryModel,
-                    timestamp=timestamp,
-                    sensor=channel,
-                    **data
-                )
-
-                if entry is not None:
-                    entries.append(entry)
+            entries.extend(self.create_entries_bulk(EntryModel, rows))
 
         return entries
 
-    def create_entry(self, EntryModel, **data):
+    def create_entry(self, EntryModel, save: bool = True, validate: bool = True, **data):
         if not data or any(v is None for v in data.values()):
             return
 
-        return super().create_entry(EntryModel, **data)
+        return super().create_entry(EntryModel, save=save, validate=validate, **data)
 
     def process_entry_pipeline(self, entry, cutoff_stage=None):
         '''
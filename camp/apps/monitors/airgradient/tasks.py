@@ -10,6 +10,7 @@ from django.utils import timezone
 from django_huey import db_task, db_periodic_task
 from huey import crontab
 
+from camp.apps.monitors import latest as latest_entries
 from camp.apps.monitors.airgradient.models import AirGradient, Place
 from camp.utils.datetime import parse_timestamp
 
@@ -86,6 +87,7 @@ def update_monitor_data():
 
 
 @db_task()
+@latest_entries.batch()
 def process_data(payload, place_id):
     try:
         monitor = AirGradient.objects.get(sensor_id=payload['locationId'])
@@ -1,129 +1,158 @@
+from collections import defaultdict
 from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.gis.geos import Point
+from django.db import transaction
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
 from django_huey import db_task, db_periodic_task
 from huey import crontab
 
-from camp.apps.monitors.models import Entry
+from camp.apps.monitors import latest as latest_entries
 from camp.apps.monitors.airnow.models import AirNow
 from camp.apps.monitors.airnow.api import airnow_api
 from camp.apps.regions.models import Region
 from camp.utils import gis
+from camp.utils.datetime import make_aware
+
+
+def get_extent(counties):
+    '''The bounding box covering every county, for a single AirNow query.'''
+    extents = [county.boundary.geometry.extent for county in counties]
+    return (
+        min(extent[0] for extent in extents),
+        min(extent[1] for extent in extents),
+        max(extent[2] for extent in extents),
+        max(extent[3] for extent in extents),
+    )
+
+
+def get_monitor(monitors, counties, item):
+    '''
+    Look up the monitor for an AirNow row in the {name: monitor} map,
+    creating it if the site is new and falls within one of our counties.
+    '''
+    if monitor := monitors.get(item['SiteName']):
+        return monitor
+
+    latlon = Point(item['Longitude'], item['Latitude'], srid=gis.EPSG_LATLON)
+    county = next((c for c in counties if c.boundary.geometry.contains(latlon)), None)
+    if county is None:
+        return None
+
+    monitor = AirNow.objects.create(
+        name=item['SiteName'],
+        position=latlon,
+        county=' '.join(county.name.split()[:-1]),
+        data_provider=item.get('AgencyName', ''),
+        location=AirNow.LOCATION.outside
+    )
+    monitors[monitor.name] = monitor
+    return monitor
 
 
 @db_periodic_task(crontab(minute='*/15'), priority=50)
+@latest_entries.batch()
 def import_airnow_data(start_date=None, end_date=None):
     if settings.AIRNOW_API_KEY is None:
         # Do nothing if we don't have a key.
         return
 
-    end_date = end_date or timezone.now()
-
-    for county in Region.objects.counties().select_related('boundary'):
-        if start_date is None:
-            oldest_last_entry = (AirNow.objects
-                .get_active()
-                .filter(position__within=county.boundary.geometry)
-                .with_last_entry_timestamp()
-                .order_by('last_entry_timestamp')
-                .values_list('last_entry_timestamp', flat=True)
-                .first()
-            )
-
-            # Default window: last 24 hours
-            start_date = end_date - timedelta(hours=24)
-
-            if oldest_last_entry:
-                # Don't fetch earlier than 24h ago
-                start_date = max(oldest_last_entry, start_date)
-
-            # Ensure at least 1h difference
-            if start_date > end_date - timedelta(hours=1):
-                start_date = end_date - timedelta(hours=1)
-
-        data = airnow_api.query(
-            bbox=county.boundary.geometry.extent,
-            start_date=start_date,
-            end_date=end_date,
-        )
-        for item in data:
-            try:
-                # Look up the monitor by name...
-                monitor = AirNow.objects.get(name=item['SiteName'])
-            except AirNow.DoesNotExist:
-                # ...but it doesn't exist, so create it...
-                latlon = Point(item['Longitude'], item['Latitude'], srid=gis.EPSG_LATLON)
-                if not county.boundary.geometry.contains(latlon):
-                    # ...unless it's outside the county!
-                    continue
-
-                monitor = AirNow.objects.create(
-                    name=item['SiteName'],
-                    position=latlon,
-                    county=' '.join(county.name.split()[:-1]),
-                    data_provider=item.get('AgencyName', ''),
-                    location=AirNow.LOCATION.outside
-                )
-
-            if entry := monitor.handle_payload(item):
-                cleaned = monitor.process_entry_ng(entry)
-
-    legacy_previous = 1
-    if start_date:
-        legacy_previous = int((end_date - start_date).total_seconds() / 3600)
-    import_airnow_data_legacy(timestamp=end_date, previous=legacy_previous)
-
-
-# @db_periodic_task(crontab(minute='*/15'), priority=50)
-def import_airnow_data_legacy(timestamp=None, previous=None):
-    if settings.AIRNOW_API_KEY is None:
-        # Do nothing if we don't have a key.
+    counties = list(Region.objects.counties().select_related('boundary'))
+    if not counties:
         return
 
-    timestamp = timestamp or timezone.now()
-    previous = previous or 1
+    end_date = end_date or timezone.now()
 
-    for county in Region.objects.counties().select_related('boundary'):
-        # {site_name: {timestamp: [{data}, ...]}}
-        county_name = ' '.join(county.name.split()[:-1])
-        data = airnow_api.query_legacy(
-            bbox=county.boundary.geometry.extent,
-            timestamp=timestamp,
-            previous=previous
+    if start_date is None:
+        oldest_last_entry = (AirNow.objects
+            .get_active()
+            .with_last_entry_timestamp()
+            .order_by('last_entry_timestamp')
+            .values_list('last_entry_timestamp', flat=True)
+            .first()
         )
-        for site_name, container in data.items():
-            # Get the first entry for updating the monitor info.
-            entry = list(list(container.values())[0].values())[0]
-
-            # Look up the monitor by name. If it doesn't exist, create it.
-            try:
-                monitor = AirNow.objects.get(name=site_name)
-            except AirNow.DoesNotExist:
-                latlon = Point(entry['Longitude'], entry['Latitude'], srid=4326)
-                if not county.boundary.geometry.contains(latlon):
-                    continue
-
-                monitor = AirNow.objects.create(
-                    name=site_name,
-                    position=latlon,
-                    county=county_name,
-                    data_provider=entry.get('AgencyName', ''),
-                    location=AirNow.LOCATION.outside
-                )
-
-            for timestamp, data in container.items():
-                timestamp = parse_datetime(timestamp)
-                try:
-                    entry = monitor.entries.get(timestamp=timestamp)
-                    entry = monitor.process_entry(entry, data)
-                    entry.save()
-                except Entry.DoesNotExist:
-                    entry = monitor.create_entry_legacy(data)
-
-                monitor.check_latest(entry)
-                if monitor.latest_id == entry.pk:
-                    monitor.save()
+
+        # Default window: last 24 hours
+        start_date = end_date - timedelta(hours=24)
+
+        if oldest_last_entry:
+            # Don't fetch earlier than 24h ago
+            start_date = max(oldest_last_entry, start_date)
+
+        # Ensure at least 1h difference
+        if start_date > end_date - timedelta(hours=1):
+            start_date = end_date - timedelta(hours=1)
+
+    # One request for the whole valley rather than one per county.
+    items = list(airnow_api.query(
+        bbox=get_extent(counties),
+        start_date=start_date,
+        end_date=end_date,
+    ))
+
+    monitors = {monitor.name: monitor for monitor in AirNow.objects.all()}
+
+    entries = defaultdict(list)
+    for item in items:
+        monitor = get_monitor(monitors, counties, item)
+        if monitor is None:
+            continue
+
+        if EntryModel := monitor.ENTRY_MAP.get(item['Parameter']):
+            entries[EntryModel].append(monitor.create_entry(EntryModel,
+                save=False,
+                validate=False,
+                timestamp=make_aware(parse_datetime(item['UTC'])),
+                value=item['Value'],
+            ))
+
+    # One upsert per parameter, then cleaning runs per monitor as a batch.
+    created = defaultdict(list)
+    with transaction.atomic():
+        for EntryModel, model_entries in entries.items():
+            for entry in EntryModel.objects.bulk_upsert(model_entries):
+                created[entry.monitor].append(entry)
+
+    for monitor, monitor_entries in created.items():
+        monitor.update_latest_entries(monitor_entries)
+        monitor.process_entries_batch(monitor_entries)
+
+    import_airnow_data_legacy(monitors, items)
+
+
+def import_airnow_data_legacy(monitors, items):
+    '''
+    Write the rows fetched by import_airnow_data() to the legacy Entry
+    table, one entry per site and timestamp.
+    '''
+    # {site_name: {timestamp: {parameter: data}}}
+    data = defaultdict(lambda: defaultdict(dict))
+    for item in items:
+        data[item['SiteName']][item['UTC']][item['Parameter']] = item
+
+    for site_name, container in data.items():
+        monitor = monitors.get(site_name)
+        if monitor is None:
+            continue
+
+        timestamps = {key: make_aware(parse_datetime(key)) for key in container}
+        existing = {
+            entry.timestamp: entry
+            for entry in monitor.entries.filter(timestamp__in=timestamps.values())
+        }
+
+        latest_id = monitor.latest_id
+        for key, payload in container.items():
+            if entry := existing.get(timestamps[key]):
+                entry = monitor.process_entry(entry, payload)
+                entry.save()
+            else:
+                entry = monitor.create_entry_legacy(payload)
+
+            monitor.check_latest(entry)
+
+        if monitor.latest_id != latest_id:
+            monitor.save()
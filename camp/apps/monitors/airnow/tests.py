@@ -1,10 +1,18 @@
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
-from django.test import TestCase
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.test import TestCase, override_settings
 
 import requests
 
+from camp.apps.entries import models as entry_models
 from camp.apps.monitors.airnow.api import AirNowAPI
+from camp.apps.monitors.airnow.models import AirNow
+from camp.apps.monitors.airnow.tasks import import_airnow_data
+from camp.apps.monitors.models import LatestEntry
+from camp.apps.regions.models import Boundary, Region
+from camp.utils.datetime import make_aware
 
 
 def make_response(status_code=200, json_result=None, json_error=None):
@@ -87,3 +95,58 @@ class FetchEntriesTests(TestCase):
             )
 
         assert mock_data.call_count == 2
+
+
+def make_item(site, parameter, value, utc='2025-01-01T10:00', lon=-119.77, lat=36.75):
+    return {
+        'SiteName': site,
+        'Parameter': parameter,
+        'Value': value,
+        'UTC': utc,
+        'Longitude': lon,
+        'Latitude': lat,
+        'AgencyName': 'San Joaquin Valley APCD',
+    }
+
+
+@override_settings(AIRNOW_API_KEY='test-key')
+class ImportAirNowDataTests(TestCase):
+    def setUp(self):
+        region = Region.objects.create(name='Fresno County', slug='fresno-county', type=Region.Type.COUNTY)
+        region.boundary = Boundary.objects.create(
+            region=region,
+            version='test',
+            geometry=MultiPolygon(Polygon.from_bbox((-120.5, 36.0, -118.5, 37.5))),
+        )
+        region.save()
+
+    @patch('camp.apps.monitors.airnow.tasks.import_airnow_data_legacy')
+    @patch('camp.apps.monitors.airnow.tasks.airnow_api')
+    def test_imports_all_sites_in_one_query(self, mock_api, mock_legacy):
+        mock_api.query.return_value = [
+            make_item('Fresno - Garland', 'PM2.5', 12.4),
+            make_item('Fresno - Garland', 'OZONE', 0.031),
+            make_item('Fresno - Garland', 'PM2.5', 14.0, utc='2025-01-01T11:00'),
+            make_item('Far Away', 'PM2.5', 30.0, lon=-100.0, lat=40.0),
+        ]
+        end = make_aware(datetime(2025, 1, 1, 12, 0))
+
+        import_airnow_data.call_local(start_date=end - timedelta(hours=3), end_date=end)
+
+        assert mock_api.query.call_count == 1
+        assert mock_api.query.call_args.kwargs['bbox'] == (-120.5, 36.0, -118.5, 37.5)
+
+        monitor = AirNow.objects.get(name='Fresno - Garland')
+        assert not AirNow.objects.filter(name='Far Away').exists()
+
+        raw = entry_models.PM25.objects.filter(monitor=monitor, stage=entry_models.PM25.Stage.RAW)
+        assert raw.count() == 2
+        assert entry_models.PM25.objects.filter(monitor=monitor, stage=entry_models.PM25.Stage.CLEANED).count() == 2
+        assert entry_models.O3.objects.filter(monitor=monitor).count() == 1
+
+        latest = LatestEntry.objects.get(monitor=monitor, entry_type='pm25')
+        assert latest.timestamp == make_aware(datetime(2025, 1, 1, 11, 0))
+
+        monitors, items = mock_legacy.call_args.args
+        assert monitors['Fresno - Garland'] == monitor
+        assert len(items) == 4
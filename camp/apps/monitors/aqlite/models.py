@@ -116,7 +116,7 @@ class AQLite(Monitor):
         if not self.location:
             self.location = Monitor.LOCATION.outside
 
-    def create_entries(self, payload):
+    def get_entry_rows(self, payload):
         timestamp = make_aware(parse_datetime(payload['timestamp']))
 
         try:
@@ -124,7 +124,6 @@ class AQLite(Monitor):
         except (KeyError, TypeError, ValueError):
             pass
 
-        entries = []
         for EntryModel, config in self.ENTRY_CONFIG.items():
             data = {
                 field: payload.get(source)
@@ -132,6 +131,7 @@ class AQLite(Monitor):
             }
             if any(v is None for v in data.values()):
                 continue
-            if entry := self.create_entry(EntryModel, timestamp=timestamp, **data):
-                entries.append(entry)
-        return entries
+            yield EntryModel, dict(timestamp=timestamp, **data)
+
+    def create_entries(self, payload):
+        return self.create_entries_from_rows(self.get_entry_rows(payload))
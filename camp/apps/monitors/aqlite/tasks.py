@@ -9,6 +9,7 @@ from django_huey import db_task, db_periodic_task
 from huey import crontab
 
 from camp.apps.entries.models import O3
+from camp.apps.monitors import latest as latest_entries
 from camp.apps.monitors.aqlite.models import AQLite
 from camp.utils.datetime import make_aware
 
@@ -28,6 +29,7 @@ def update_realtime():
 
 
 @db_task()
+@latest_entries.batch()
 def process_data(monitor_id):
     from camp.apps.calibrations import processors
 
@@ -54,17 +56,18 @@ def process_data(monitor_id):
         average=0,
     )
 
-    affected_hours = set()
+    fetched = []
     try:
-        for payload in payloads:
-            entries = monitor.create_entries(payload)
-            for entry in entries:
-                monitor.process_entry_pipeline(entry)
-            ts = make_aware(parse_datetime(payload['timestamp']))
-            affected_hours.add(ts.replace(minute=0, second=0, microsecond=0))
+        fetched.extend(payloads)
     except requests.exceptions.RequestException as e:
         print(f'[AQLite] API error for {monitor.device_id}: {e}')
 
+    # Whatever arrived before an error is still written, in one upsert per
+    # entry model, then run through the pipeline in timestamp order.
+    for entry in create_entries(monitor, fetched):
+        monitor.process_entry_pipeline(entry)
+    affected_hours = get_affected_hours(fetched)
+
     if affected_hours:
         # Aggregate any complete affected hours. Handles backfilled entries whose
         # historical hours won't be revisited by the scheduled aggregate_hourly task.
@@ -75,6 +78,19 @@ def process_data(monitor_id):
         monitor.save()
 
 
+def create_entries(monitor, payloads):
+    return monitor.create_entries_from_rows(
+        row for payload in payloads for row in monitor.get_entry_rows(payload)
+    )
+
+
+def get_affected_hours(payloads):
+    return {
+        make_aware(parse_datetime(payload['timestamp'])).replace(minute=0, second=0, microsecond=0)
+        for payload in payloads
+    }
+
+
 @db_periodic_task(crontab(minute='5'), priority=50)
 def aggregate_hourly():
     """Runs at :05 past each hour to aggregate the previous complete hour."""
@@ -100,6 +116,7 @@ def aggregate_monitor_hour(monitor_id, hour_start, hour_end):
 
 
 @db_task()
+@latest_entries.batch()
 def import_history(start=None, end=None, device_ids=None):
     """
     Import historical AQLite data and run the O3 pipeline (RAW → CLEANED → CALIBRATED).
@@ -134,22 +151,22 @@ def _import_monitor_history(monitor, start, end, now):
 
     print(f'\n{monitor.device_id}')
 
-    records = 0
-    created = 0
+    fetched = []
     for payload in monitor.organization.api.get_time_series(
         device_id=monitor.device_id,
         start=start,
         end=end,
         average=0,
     ):
-        records += 1
-        entries = monitor.create_entries(payload)
-        for entry in entries:
-            monitor.process_entry_pipeline(entry)
-            created += 1
+        fetched.append(payload)
+        if len(fetched) % 50 == 0:
+            print(f'  ...{len(fetched)} raw records so far')
 
-        if records % 50 == 0:
-            print(f'  ...{records} raw records so far')
+    records = len(fetched)
+    created = 0
+    for entry in create_entries(monitor, fetched):
+        monitor.process_entry_pipeline(entry)
+        created += 1
 
     if records:
         monitor.save()
@@ -185,6 +202,7 @@ def fill_gaps():
 
 
 @db_task()
+@latest_entries.batch()
 def fill_monitor_gaps(monitor_id):
     from camp.apps.calibrations import processors
 
@@ -215,23 +233,23 @@ def fill_monitor_gaps(monitor_id):
     if not gaps:
         return
 
-    affected_hours = set()
+    fetched = []
     for gap_start, gap_end in gaps:
         try:
-            for payload in monitor.organization.api.get_time_series(
+            fetched.extend(monitor.organization.api.get_time_series(
                 device_id=monitor.device_id,
                 start=gap_start,
                 end=gap_end,
                 average=0,
-            ):
-                entries = monitor.create_entries(payload)
-                for entry in entries:
-                    monitor.process_entry_pipeline(entry)
-                ts = make_aware(parse_datetime(payload['timestamp']))
-                affected_hours.add(ts.replace(minute=0, second=0, microsecond=0))
+            ))
         except requests.exceptions.RequestException as e:
             print(f'[AQLite] API error for {monitor.device_id} gap {gap_start}–{gap_end}: {e}')
 
+    # Every gap's rows go in together, one upsert per entry model.
+    for entry in create_entries(monitor, fetched):
+        monitor.process_entry_pipeline(entry)
+    affected_hours = get_affected_hours(fetched)
+
     if not affected_hours:
         return
 
@@ -44,15 +44,19 @@ class AQview(Monitor):
     class Meta:
         verbose_name = 'AQview'
 
-    def handle_payload(self, payload):
+    def get_entry_rows(self, payload):
         timestamp = make_aware(
             datetime.fromtimestamp(payload['maptime'] / 1000) - timedelta(hours=payload['hourindex']),
             pytz.timezone('America/Los_Angeles')
         )
-        return super().create_entry(entry_models.PM25,
-            timestamp=timestamp,
-            value=payload['aobs'],
-        )
+        yield entry_models.PM25, {
+            'timestamp': timestamp,
+            'value': payload['aobs'],
+        }
+
+    def handle_payload(self, payload):
+        created = self.create_entries_from_rows(self.get_entry_rows(payload))
+        return created[0] if created else None
 
 
     # Legacy
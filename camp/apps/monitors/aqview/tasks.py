@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 import esri2gpd
 
 from django.contrib.gis.geos import Point
@@ -6,6 +8,7 @@ from django.contrib.gis.geos import Point
 from django_huey import db_task, db_periodic_task
 from huey import crontab
 
+from camp.apps.monitors import latest as latest_entries
 from camp.apps.monitors.models import Entry
 from camp.apps.monitors.aqview.models import AQview
 from camp.utils.counties import County
@@ -23,12 +26,20 @@ def import_aqview_data():
         ),
     ])).to_dict('records')
 
+    # Each site reports several hours; they're written together.
+    sites = defaultdict(list)
     for row in records:
-        process_aqview_data.call_local(row)
+        sites[row['sitename']].append(row)
+
+    for payloads in sites.values():
+        process_aqview_data.call_local(payloads)
 
 
 @db_task(priority=50)
-def process_aqview_data(payload):
+@latest_entries.batch()
+def process_aqview_data(payloads):
+    """Import one site's records, with one upsert for all their entries."""
+    payload = payloads[0]
     if payload['countyname'] not in County.names:
         return False
 
@@ -46,8 +57,16 @@ def process_aqview_data(payload):
             data_provider_url=payload.get('dplink', ''),
         )
 
-    if entry := monitor.handle_payload(payload):
-        cleaned = monitor.process_entry_ng(entry)
+    rows = []
+    by_timestamp = {}
+    for payload in payloads:
+        for EntryModel, row in monitor.get_entry_rows(payload):
+            rows.append((EntryModel, row))
+            by_timestamp[row['timestamp']] = payload
+
+    for entry in monitor.create_entries_from_rows(rows):
+        payload = by_timestamp[entry.timestamp]
+        monitor.process_entry_ng(entry)
         print('\t[AQview] Entry created:', entry.timestamp)
 
         # Legacy
@@ -74,18 +74,17 @@ class BAM1022(Monitor):
     class Meta:
         verbose_name = 'BAM 1022'
 
-    def handle_payload(self, payload):
-        entries = []
+    def get_entry_rows(self, payload):
         timestamp = parse_datetime(payload['Time'])
         for EntryModel, config in self.ENTRY_CONFIG.items():
             data = {attr: payload[key] for attr, key in config['fields'].items() if key in payload}
-            if not data:
-                continue
-
-            if entry := self.create_entry(EntryModel, timestamp=timestamp, **data):
-                entries.append(entry)
+            if data:
+                yield EntryModel, dict(timestamp=timestamp, **data)
 
-        return entries
+    def handle_payload(self, payload):
+        # The BAM posts one reading per request, so this is already the
+        # whole batch: one row per entry model.
+        return self.create_entries_from_rows(self.get_entry_rows(payload))
 
     def create_entry_legacy(self, payload, sensor=None):
         timestamp = parse_datetime(payload['Time'])
@@ -109,8 +109,11 @@ class CIMIS(Monitor):
         return naive.replace(tzinfo=settings.DEFAULT_TIMEZONE)
 
     def handle_payload(self, record):
+        return self.create_entries_from_rows(self.get_entry_rows(record))
+
+    def get_entry_rows(self, record):
         timestamp = self.parse_timestamp(record)
-        entries = []
+        rows = []
 
         for field_name, EntryModel in self.ENTRY_MAP.items():
             item = record.get(field_name)
@@ -124,8 +127,6 @@ class CIMIS(Monitor):
             if value in (None, ''):
                 continue
 
-            entry = self.create_entry(EntryModel, timestamp=timestamp, value=value)
-            if entry:
-                entries.append(entry)
+            rows.append((EntryModel, {'timestamp': timestamp, 'value': value}))
 
-        return entries
+        return rows
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from datetime import timedelta
 
 import sentry_sdk
@@ -9,6 +10,7 @@ from django.utils import timezone
 from django_huey import db_task, db_periodic_task
 from huey import crontab
 
+from camp.apps.monitors import latest as latest_entries
 from camp.apps.monitors.cimis.api import CIMISAPI
 from camp.apps.monitors.cimis.models import CIMIS
 from camp.utils.counties import County
@@ -79,20 +81,34 @@ def _ingest_cimis_data(target_date):
         data_items=list(CIMIS.ENTRY_MAP.keys()),
     )
 
+    # Each station's records for the day go in together, one upsert per
+    # entry model.
+    rows = defaultdict(list)
     for provider in providers:
         for record in provider.get('Records', []):
             monitor = monitors_by_station.get(record.get('Station'))
-            if monitor is not None:
-                process_cimis_data.call_local(record, monitor=monitor)
+            if monitor is None:
+                continue
+            try:
+                rows[monitor].extend(monitor.get_entry_rows(record))
+            except (KeyError, ValueError, TypeError, AttributeError):
+                # A malformed record from the API shouldn't take down the
+                # whole ingestion run - report it and move on.
+                sentry_sdk.capture_exception()
+
+    for monitor, monitor_rows in rows.items():
+        monitor.create_entries_from_rows(monitor_rows)
 
 
 @db_periodic_task(crontab(minute='45'), priority=50)
+@latest_entries.batch()
 def import_cimis_data():
     today = timezone.localtime(timezone.now()).date()
     _ingest_cimis_data(today)
 
 
 @db_periodic_task(crontab(hour='4', minute='0'), priority=50)
+@latest_entries.batch()
 def finalize_cimis_data():
     """
     CIMIS applies QC to hourly data with some lag, so late hours from
@@ -110,6 +126,7 @@ def finalize_cimis_data():
 
 
 @db_task(priority=50)
+@latest_entries.batch()
 def process_cimis_data(record, monitor=None):
     if monitor is None:
         station_number = record.get('Station')
@@ -1,5 +1,7 @@
 from django import forms
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
 
 from functools import lru_cache
 
@@ -40,4 +42,22 @@ class MonitorTypeField(models.CharField):
         ]
         if include_blank:
             return [('', '---------')] + choices
-        return choices
\ No newline at end of file
+        return choices
+
+
+class LatestDateTimeField(models.DateTimeField):
+    description = 'A timestamp that a save() of an existing row never moves backwards.'
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        if add:
+            return value
+
+        # An instance loaded before another process advanced the column
+        # would otherwise write back the older value. GREATEST() ignores
+        # NULLs in Postgres, so an unset value leaves the column alone.
+        return Greatest(
+            F(self.attname),
+            Value(value, output_field=models.DateTimeField()),
+            output_field=models.DateTimeField(),
+        )
@@ -0,0 +1,97 @@
+from django.db import connection
+
+from camp.utils.collectors import Collector
+
+
+def upsert(entries):
+    """
+    Write {(monitor_id, entry_type, processor): entry} to LatestEntry in one
+    INSERT ... ON CONFLICT DO UPDATE, and advance Monitor.last_seen to match.
+    Neither is ever moved backwards, so out-of-order flushes from concurrent
+    workers are harmless.
+    """
+    from camp.apps.monitors.models import LatestEntry, Monitor
+
+    if not entries:
+        return
+
+    opts = LatestEntry._meta
+    pk = opts.pk
+    monitor_field = opts.get_field('monitor')
+    entry_id = opts.get_field('entry_id')
+    quote = connection.ops.quote_name
+
+    params = []
+    # Sorted so concurrent flushes lock rows in the same order.
+    for (monitor_id, entry_type, processor), entry in sorted(entries.items()):
+        params.extend([
+            pk.get_db_prep_save(pk.get_default(), connection),
+            monitor_field.get_db_prep_save(monitor_id, connection),
+            entry_type,
+            entry_id.get_db_prep_save(entry.pk, connection),
+            entry.stage,
+            processor,
+            entry.timestamp,
+        ])
+
+    table = quote(opts.db_table)
+    values = ', '.join(['(%s, %s, %s, %s, %s, %s, %s)'] * len(entries))
+    with connection.cursor() as cursor:
+        cursor.execute(f'''
+            INSERT INTO {table} (id, monitor_id, entry_type, entry_id, stage, processor, timestamp)
+            VALUES {values}
+            ON CONFLICT (monitor_id, entry_type, processor) DO UPDATE
+            SET entry_id = EXCLUDED.entry_id, stage = EXCLUDED.stage, timestamp = EXCLUDED.timestamp
+            WHERE {table}.timestamp < EXCLUDED.timestamp
+        ''', params)
+
+    last_seen = {}
+    for (monitor_id, entry_type, processor), entry in entries.items():
+        last_seen[monitor_id] = max(last_seen.get(monitor_id, entry.timestamp), entry.timestamp)
+
+    params = []
+    for monitor_id, timestamp in sorted(last_seen.items()):
+        params.extend([monitor_field.get_db_prep_save(monitor_id, connection), timestamp])
+
+    monitors = quote(Monitor._meta.db_table)
+    values = ', '.join(['(%s::uuid, %s::timestamptz)'] * len(last_seen))
+    with connection.cursor() as cursor:
+        cursor.execute(f'''
+            UPDATE {monitors} SET last_seen = v.last_seen
+            FROM (VALUES {values}) AS v (id, last_seen)
+            WHERE {monitors}.id = v.id
+              AND ({monitors}.last_seen IS NULL OR {monitors}.last_seen < v.last_seen)
+        ''', params)
+
+
+_pending = Collector('latest_entries_pending', flush=upsert)
+
+
+def record(monitor, entry):
+    """
+    Advance LatestEntry for `entry`. Inside a batch() block only the newest
+    entry per (monitor, entry_type, processor) is kept and written when the
+    block exits; otherwise it is written straight away.
+    """
+    # Keep the in-memory monitor current for is_active checks later in the
+    # same task; a monitor.save() can't move the database copy backwards.
+    if monitor.last_seen is None or entry.timestamp > monitor.last_seen:
+        monitor.last_seen = entry.timestamp
+
+    key = (monitor.pk, entry.entry_type, entry.processor)
+    pending = _pending.get()
+    if pending is None:
+        upsert({key: entry})
+        return
+
+    current = pending.get(key)
+    if current is None or entry.timestamp > current.timestamp:
+        pending[key] = entry
+
+
+def batch():
+    """
+    Coalesce every record() inside the block into a single upsert on exit.
+    Usable as a decorator around an ingest task.
+    """
+    return _pending.batch()
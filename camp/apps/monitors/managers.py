@@ -1,8 +1,10 @@
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Optional
 
 from django.db.models import (
-    BooleanField, DateTimeField, IntegerField,
+    DEFERRED,
+    BooleanField, IntegerField,
     ExpressionWrapper, F, Q,
     Case, Count, Exists, Value, When,
     OuterRef, Subquery,
@@ -15,14 +17,15 @@ from model_utils.managers import InheritanceManager, InheritanceQuerySet
 
 
 class InheritanceIterable(ModelIterable):
+    # Base rows resolved to subclasses per round of by-type queries.
+    chunk_size = 1000
+
     def __iter__(self):
         queryset = self.queryset
         base_iter = ModelIterable(queryset)
 
         if getattr(queryset, 'subclasses', False):
-            extras = tuple(queryset.query.extra.keys())
             subclasses = sorted(queryset.subclasses, key=len, reverse=True)
-            annotation_names = queryset.query.annotations.keys()
 
             for obj in base_iter:
                 sub_obj = None
@@ -33,34 +36,133 @@ class InheritanceIterable(ModelIterable):
                 if not sub_obj:
                     sub_obj = obj
 
-                for k in annotation_names:
-                    try:
-                        setattr(sub_obj, k, getattr(obj, k))
-                    except AttributeError:
-                        pass  # annotation wasn't actually selected in the SQL
-
-                for k in extras:
-                    setattr(sub_obj, k, getattr(obj, k))
-
+                self.copy_extras(obj, sub_obj)
                 yield sub_obj
+        elif getattr(queryset, 'load_by_subtype', False):
+            chunk = []
+            for obj in base_iter:
+                chunk.append(obj)
+                if len(chunk) >= self.chunk_size:
+                    yield from self.load_subtypes(chunk)
+                    chunk = []
+            yield from self.load_subtypes(chunk)
         else:
             yield from base_iter
 
+    def copy_extras(self, obj, sub_obj):
+        for k in self.queryset.query.annotations.keys():
+            try:
+                setattr(sub_obj, k, getattr(obj, k))
+            except AttributeError:
+                pass  # annotation wasn't actually selected in the SQL
+
+        for k in self.queryset.query.extra.keys():
+            setattr(sub_obj, k, getattr(obj, k))
+
+    def load_subtypes(self, objs):
+        """
+        Swap each base row for its subclass instance, fetching only the
+        subclass's own columns with one query per subtype present, rather
+        than LEFT JOINing every subclass table into the main query.
+        """
+        queryset = self.queryset
+        subclasses = {cls.monitor_type: cls for cls in queryset.model.get_subclasses()}
+        base_fields = {f.attname for f in queryset.model._meta.concrete_fields}
+
+        by_subtype = defaultdict(list)
+        for obj in objs:
+            # Deferred subtype (e.g. .only()) leaves the base instance.
+            if obj.__dict__.get('subtype') in subclasses:
+                by_subtype[obj.subtype].append(obj)
+
+        resolved = {}
+        for subtype, subtype_objs in by_subtype.items():
+            subclass = subclasses[subtype]
+            field_names = [subclass._meta.pk.attname] + [
+                f.attname for f in subclass._meta.concrete_fields
+                if f.attname not in base_fields and not f.primary_key
+            ]
+            rows = {
+                row[0]: dict(zip(field_names, row))
+                for row in (subclass._base_manager
+                    .using(queryset.db)
+                    .filter(pk__in=[obj.pk for obj in subtype_objs])
+                    .values_list(*field_names)
+                )
+            }
+
+            for obj in subtype_objs:
+                row = rows.get(obj.pk)
+                if row is None:
+                    continue
+
+                sub_obj = subclass.from_db(queryset.db,
+                    [f.attname for f in subclass._meta.concrete_fields],
+                    [row.get(f.attname, obj.__dict__.get(f.attname, DEFERRED))
+                        for f in subclass._meta.concrete_fields],
+                )
+                sub_obj._state.fields_cache.update(obj._state.fields_cache)
+                self.copy_extras(obj, sub_obj)
+                resolved[obj.pk] = sub_obj
+
+        for obj in objs:
+            yield resolved.get(obj.pk, obj)
+
 
 class MonitorQuerySet(InheritanceQuerySet):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._iterable_class = InheritanceIterable
+        self.load_by_subtype = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone.load_by_subtype = self.load_by_subtype
+        return clone
+
+    def select_subclasses(self, *subclasses):
+        """Resolve subclasses by LEFT JOINing their tables (django-model-utils)."""
+        clone = super().select_subclasses(*subclasses)
+        clone.load_by_subtype = False
+        return clone
+
+    def load_subclasses(self):
+        """
+        Resolve subclasses from the stored `subtype`: the base rows first,
+        then each subclass's own columns in one query per subtype present.
+        The default for Monitor.objects.
+        """
+        clone = self._clone()
+        clone.subclasses = ()
+        clone.load_by_subtype = True
+        return clone
+
+    def skip_subclasses(self):
+        """Plain Monitor instances, for queries that only need base fields."""
+        clone = self._clone()
+        clone.subclasses = ()
+        clone.load_by_subtype = False
+        return clone
 
     def get_active(self, seconds=None):
         seconds = seconds or self.model.LAST_ACTIVE_LIMIT
         cutoff = timezone.now() - timedelta(seconds=seconds)
-        return self.filter(latest_entries__timestamp__gte=cutoff).distinct()
+        return self.filter(last_seen__gte=cutoff)
 
     def get_inactive(self, seconds=None):
         seconds = seconds or self.model.LAST_ACTIVE_LIMIT
         cutoff = timezone.now() - timedelta(seconds=seconds)
-        return self.filter(Q(latest_entries__isnull=True) | Q(latest__timestamp__lt=cutoff))
+        return self.filter(Q(last_seen__isnull=True) | Q(last_seen__lt=cutoff))
+
+    def split_active(self):
+        """
+        Return (active, inactive) lists from a single query, judging each
+        monitor against its own class's LAST_ACTIVE_LIMIT.
+        """
+        active, inactive = [], []
+        for monitor in self:
+            (active if monitor.is_active else inactive).append(monitor)
+        return active, inactive
 
     def get_public(self):
         """Monitors visible to the public API: not hidden, and of an enabled type."""
@@ -115,14 +217,16 @@ class MonitorQuerySet(InheritanceQuerySet):
         return self.get_active().exclude(default_sensor='').exclude(location='inside')
 
     def in_regions(self, regions):
-        boundaries = [r.boundary.geometry for r in regions if r.boundary_id]
-        if not boundaries:
+        from camp.apps.regions.models import RegionMembership
+
+        region_ids = [r.pk for r in regions if r.boundary_id]
+        if not region_ids:
             return self.none()
 
-        query = Q()
-        for geometry in boundaries:
-            query |= Q(position__coveredby=geometry)
-        return self.filter(query)
+        return self.filter(Exists(RegionMembership.objects.filter(
+            monitor_id=OuterRef('pk'),
+            region_id__in=region_ids,
+        )))
 
     def in_bbox(self, west, south, east, north):
         from django.contrib.gis.geos import Polygon
@@ -146,15 +250,7 @@ class MonitorQuerySet(InheritanceQuerySet):
         )
 
     def with_last_entry_timestamp(self):
-        from camp.apps.monitors.models import LatestEntry
-
-        subquery = (LatestEntry.objects
-            .filter(monitor=OuterRef('pk'))
-            .order_by('-timestamp')  # just in case
-            .values('timestamp')[:1]
-        )
-
-        return self.annotate(last_entry_timestamp=Subquery(subquery, output_field=DateTimeField()))
+        return self.annotate(last_entry_timestamp=F('last_seen'))
 
     def with_latest_entry(self, entry_model, stage=None, processor=None):
         from camp.apps.monitors.models import LatestEntry
@@ -258,29 +354,52 @@ class MonitorQuerySet(InheritanceQuerySet):
         ).filter(is_healthy=True)
 
     def with_entry_as_of(self, entry_model, timestamp, seconds=None):
+        """
+        Return the monitors that had an entry of `entry_model` at `timestamp`,
+        each with `latest_<entry_type>` and `latest_entry` set to the newest
+        entry in its window (LAST_ACTIVE_LIMIT unless `seconds` is given),
+        in its default stage and calibration.
+
+        Monitors of the same class share a window, stage and calibration,
+        so the lookup is one DISTINCT ON (monitor_id) query with a clause
+        per class, however many monitors there are.
+        """
         entry_type = entry_model.entry_type
-        results = []
+        monitors = list(self)
 
-        for monitor in self:
-            window_seconds = seconds if seconds is not None else monitor.LAST_ACTIVE_LIMIT
-            cutoff = timestamp - timedelta(seconds=window_seconds)
-
-            stage = monitor.get_default_stage(entry_model)
-            lookup = {
-                'monitor_id': monitor.pk,
-                'timestamp__lte': timestamp,
-                'timestamp__gte': cutoff,
-                'stage': stage,
-            }
+        by_class = defaultdict(list)
+        for monitor in monitors:
+            by_class[type(monitor)].append(monitor.pk)
+
+        if not by_class:
+            return []
+
+        lookup = Q()
+        for monitor_class, monitor_ids in by_class.items():
+            window_seconds = seconds if seconds is not None else monitor_class.LAST_ACTIVE_LIMIT
+            stage = monitor_class.get_default_stage(entry_model)
+            clause = Q(
+                monitor_id__in=monitor_ids,
+                timestamp__lte=timestamp,
+                timestamp__gte=timestamp - timedelta(seconds=window_seconds),
+                stage=stage,
+            )
             if stage == entry_model.Stage.CALIBRATED:
-                lookup['processor'] = monitor.get_default_calibration(entry_model) or ''
-
-            entry = (entry_model.objects
-                .filter(**lookup)
-                .order_by('-timestamp')
-                .first()
+                clause &= Q(processor=monitor_class.get_default_calibration(entry_model) or '')
+            lookup |= clause
+
+        entries = {
+            entry.monitor_id: entry
+            for entry in (entry_model.objects
+                .filter(lookup)
+                .order_by('monitor_id', '-timestamp')
+                .distinct('monitor_id')
             )
+        }
 
+        results = []
+        for monitor in monitors:
+            entry = entries.get(monitor.pk)
             if entry is not None:
                 setattr(monitor, f'latest_{entry_type}', entry)
                 monitor.latest_entry = entry
@@ -293,7 +412,13 @@ class MonitorManager(InheritanceManager):
     _queryset_class = MonitorQuerySet
 
     def get_queryset(self):
-        return super().get_queryset().select_subclasses()
+        return super().get_queryset().load_subclasses()
+
+    def load_subclasses(self):
+        return self.get_queryset().load_subclasses()
+
+    def skip_subclasses(self):
+        return self.get_queryset().skip_subclasses()
 
     def get_active(self):
         return self.get_queryset().get_active()
@@ -301,6 +426,9 @@ class MonitorManager(InheritanceManager):
     def get_inactive(self):
         return self.get_queryset().get_inactive()
 
+    def split_active(self):
+        return self.get_queryset().split_active()
+
     def get_active_multisensor(self):
         return self.get_queryset().get_active_multisensor()
 
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitors', '0036_host_monitor_host'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monitor',
+            name='last_seen',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, help_text='Timestamp of the newest entry, kept current by ingest.', null=True),
+        ),
+        migrations.RunSQL(
+            sql='''
+                UPDATE monitors_monitor m
+                SET last_seen = l.last_seen
+                FROM (
+                    SELECT monitor_id, MAX(timestamp) AS last_seen
+                    FROM monitors_latestentry
+                    GROUP BY monitor_id
+                ) l
+                WHERE m.id = l.monitor_id
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,25 @@
+import camp.apps.entries.fields
+import camp.utils.encoders
+from django.db import migrations, models
+import django_smalluuid.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitors', '0037_monitor_last_seen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MapSnapshot',
+            fields=[
+                ('id', django_smalluuid.models.SmallUUIDField(db_index=True, default=django_smalluuid.models.UUIDDefault(), editable=False, primary_key=True, serialize=False, unique=True, verbose_name='ID')),
+                ('entry_type', camp.apps.entries.fields.EntryTypeField(max_length=50, unique=True)),
+                ('monitors', models.JSONField(default=list, encoder=camp.utils.encoders.JSONEncoder)),
+                ('seen', models.JSONField(default=dict, encoder=camp.utils.encoders.JSONEncoder)),
+                ('built', models.DateTimeField(help_text='When the document was last rebuilt in full.')),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+def set_subtype(apps, schema_editor):
+    Monitor = apps.get_model('monitors', 'Monitor')
+    for model in apps.get_models():
+        if Monitor in model._meta.parents:
+            (Monitor.objects
+                .filter(pk__in=model.objects.values('pk'))
+                .update(subtype=model._meta.model_name)
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitors', '0038_mapsnapshot'),
+        ('airgradient', '0003_rename_location_id_airgradient_sensor_id_and_more'),
+        ('airnow', '0002_alter_airnow_options'),
+        ('aqlite', '0001_initial'),
+        ('aqview', '0002_alter_aqview_options'),
+        ('bam', '0002_auto_20201227_0426'),
+        ('cimis', '0001_initial'),
+        ('purpleair', '0008_rename_purple_id_purpleair_sensor_id_and_more'),
+        ('vozbox', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monitor',
+            name='subtype',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='monitor_type of the concrete subclass, set on save.', max_length=50),
+        ),
+        migrations.RunPython(set_subtype, migrations.RunPython.noop),
+    ]
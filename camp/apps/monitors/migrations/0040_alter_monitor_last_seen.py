@@ -0,0 +1,17 @@
+import camp.apps.monitors.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitors', '0039_monitor_subtype'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='monitor',
+            name='last_seen',
+            field=camp.apps.monitors.fields.LatestDateTimeField(blank=True, db_index=True, editable=False, help_text='Timestamp of the newest entry, kept current by ingest.', null=True),
+        ),
+    ]
@@ -2,6 +2,7 @@ import copy
 import math
 import uuid
 
+from collections import defaultdict
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 
@@ -11,7 +12,6 @@ from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.contrib.gis.db import models
 from django.contrib.postgres.indexes import BrinIndex
-from django.db import IntegrityError
 from django.db.models import Avg, Q
 from django.utils import timezone
 from django.utils.functional import cached_property
@@ -27,11 +27,14 @@ from py_expression_eval import Parser as ExpressionParser
 from camp.apps.calibrations.utils import get_default_calibration
 from camp.apps.entries import stages
 from camp.apps.entries.fields import EntryTypeField
+from camp.apps.monitors import latest as latest_entries
+from camp.apps.monitors.fields import LatestDateTimeField
 from camp.apps.monitors.managers import MonitorManager
 from camp.apps.qaqc.models import HealthCheck
 from camp.utils import classproperty
 from camp.utils.counties import County
 from camp.utils.datetime import make_aware
+from camp.utils.encoders import JSONEncoder
 from camp.utils.fields import MACAddressField
 
 
@@ -103,6 +106,31 @@ class LatestEntry(models.Model):
         self._entry = value
 
 
+class MapSnapshot(models.Model):
+    """
+    The current-data map document for one entry type, ready to serve.
+    `seen` holds the newest LatestEntry timestamp of every monitor as of
+    the last refresh, so a refresh only re-serializes monitors that have
+    moved on since. See camp.apps.monitors.snapshots.
+    """
+    id = SmallUUIDField(
+        default=uuid_default(),
+        primary_key=True,
+        db_index=True,
+        editable=False,
+        verbose_name='ID'
+    )
+
+    entry_type = EntryTypeField(unique=True)
+    monitors = models.JSONField(default=list, encoder=JSONEncoder)
+    seen = models.JSONField(default=dict, encoder=JSONEncoder)
+    built = models.DateTimeField(help_text='When the document was last rebuilt in full.')
+    modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.entry_type} map snapshot'
+
+
 class Monitor(models.Model):
     COUNTIES = Choices(*County.names)
     LOCATION = Choices('inside', 'outside')
@@ -136,6 +164,8 @@ class Monitor(models.Model):
     )
 
     name = models.CharField(max_length=250)
+    subtype = models.CharField(max_length=50, blank=True, db_index=True, editable=False,
+        help_text='monitor_type of the concrete subclass, set on save.')
     created = models.DateTimeField(auto_now_add=True)
     modified = models.DateTimeField(auto_now=True)
     access_key = models.UUIDField(default=uuid.uuid4)
@@ -174,6 +204,8 @@ class Monitor(models.Model):
 
     # Entries - Legacy
     latest = models.ForeignKey('monitors.Entry', blank=True, null=True, related_name='latest_for', on_delete=models.SET_NULL)
+    last_seen = LatestDateTimeField(null=True, blank=True, db_index=True, editable=False,
+        help_text='Timestamp of the newest entry, kept current by ingest.')
     default_sensor = models.CharField(max_length=50, default='', blank=True)
 
     objects = MonitorManager()
@@ -257,13 +289,14 @@ class Monitor(models.Model):
     @property
     def regions(self):
         """
-        Returns a queryset of all regions that contain this monitor's location.
+        Returns a queryset of all regions that contain this monitor's location,
+        read from RegionMembership.
         """
         from camp.apps.regions.models import Region
         if not self.position:
             return Region.objects.none()
 
-        return Region.objects.intersects(self.position)
+        return Region.objects.filter(memberships__monitor_id=self.pk)
 
     @property
     def is_regulatory(self):
@@ -271,18 +304,8 @@ class Monitor(models.Model):
 
     @cached_property
     def is_active(self):
-        now = timezone.now()
-        cutoff = now - timedelta(seconds=self.LAST_ACTIVE_LIMIT)
-
-        # If annotation is missing or None, fall back to query
-        timestamp = getattr(self, 'last_entry_timestamp', None)
-        if timestamp is None:
-            timestamp = (self.latest_entries
-                .order_by('-timestamp')
-                .values_list('timestamp', flat=True)
-                .first()
-            )
-
+        cutoff = timezone.now() - timedelta(seconds=self.LAST_ACTIVE_LIMIT)
+        timestamp = self.last_seen
         return timestamp is not None and timestamp >= cutoff
 
     @cached_property
@@ -383,17 +406,22 @@ class Monitor(models.Model):
         defaults.update(**kwargs)
         return EntryModel(**defaults)
 
-    def create_entry(self, EntryModel, save: bool = True, **data):
+    def create_entry(self, EntryModel, save: bool = True, validate: bool = True, **data):
         entry = self.initialize_entry(EntryModel)
 
         for key, value in data.items():
             setattr(entry, key, value)
 
+        if not save and not validate:
+            # The caller is responsible for deduplicating on write
+            # (e.g. EntryQuerySet.bulk_upsert), so skip the EXISTS query.
+            return entry
+
         if entry.validation_check():
             if save:
                 entry.save()
                 entry.refresh_from_db()
-                self.update_latest_entry(entry)
+                self.update_latest_entries([entry])
             return entry
 
         if save:
@@ -425,10 +453,53 @@ class Monitor(models.Model):
             if changed:
                 existing.save()
                 existing.refresh_from_db()
-                self.update_latest_entry(existing)
+                self.update_latest_entries([existing])
                 return existing
             return None
 
+    def create_entries_bulk(self, EntryModel, rows, batch_size=1000):
+        '''
+        Bulk counterpart to create_entry() for many rows of one entry model.
+
+        Each row is a dict of the same keyword arguments create_entry() takes.
+        Rows are written with EntryQuerySet.bulk_upsert() -- one existence
+        query and one INSERT ... ON CONFLICT DO UPDATE per batch -- and
+        LatestEntry is advanced once per (stage, processor) using the newest
+        entry in the batch.
+
+        Returns:
+            List of entries that were created or changed.
+        '''
+        entries = []
+        for row in rows:
+            entry = self.create_entry(EntryModel, save=False, validate=False, **row)
+            if entry is not None:
+                entries.append(entry)
+
+        created = []
+        for offset in range(0, len(entries), batch_size):
+            created.extend(EntryModel.objects.bulk_upsert(entries[offset:offset + batch_size], batch_size))
+
+        self.update_latest_entries(created)
+        return created
+
+    def create_entries_from_rows(self, rows):
+        '''
+        Write (EntryModel, row) pairs -- typically every row from a whole
+        provider fetch -- with one create_entries_bulk() call per entry model.
+
+        Returns:
+            List of entries that were created or changed, oldest first.
+        '''
+        by_model = defaultdict(list)
+        for EntryModel, row in rows:
+            by_model[EntryModel].append(row)
+
+        created = []
+        for EntryModel, model_rows in by_model.items():
+            created.extend(self.create_entries_bulk(EntryModel, model_rows))
+        return sorted(created, key=lambda entry: entry.timestamp)
+
     def process_entries_ng(self, entries):
         processed_entries = []
         for entry in entries:
@@ -446,7 +517,7 @@ class Monitor(models.Model):
                 continue
 
             if (result := processor(entry).run()):
-                self.update_latest_entry(result)
+                self.update_latest_entries([result])
                 processed_entries.append(result)
 
         return processed_entries
@@ -470,6 +541,69 @@ class Monitor(models.Model):
 
         return processed
 
+    def process_entries_batch(self, entries, cutoff_stage=None):
+        '''
+        Set-based counterpart to process_entry_pipeline() for many entries of
+        this monitor at once, e.g. one ingest cycle or a slice of history.
+
+        Entries are processed stage by stage. Every processor runs against an
+        EntryBatch, which preloads siblings, neighbouring values and context
+        for the whole time window, and each stage's derived entries are
+        written with one bulk upsert per entry model before the next stage
+        runs.
+
+        Args:
+            entries: BaseEntry instances belonging to this monitor.
+            cutoff_stage: Optional. If provided, processing will stop before this stage.
+
+        Returns:
+            List of all new entries created during processing.
+        '''
+        from camp.apps.entries.batch import EntryBatch
+
+        batch = EntryBatch(self, entries)
+        processed = []
+        pending = list(entries)
+
+        while pending:
+            results = defaultdict(list)
+            for entry in pending:
+                config = self.ENTRY_CONFIG.get(entry.__class__, {})
+                for processor in config.get('processors', {}).get(entry.stage, []):
+                    if cutoff_stage and processor.next_stage == cutoff_stage:
+                        continue
+
+                    if (result := processor(entry, batch=batch).run(commit=False, validate=False)):
+                        results[result.__class__].append(result)
+
+            pending = []
+            for EntryModel, model_results in results.items():
+                pending.extend(EntryModel.objects.bulk_upsert(model_results))
+
+            batch.add(pending)
+            self.update_latest_entries(pending)
+            processed.extend(pending)
+
+        return processed
+
+    def update_latest_entries(self, entries):
+        '''
+        Advance LatestEntry for a batch of this monitor's entries, touching
+        each (entry_type, stage, processor) once with its newest entry, and
+        feed them into the rolling alert windows.
+        '''
+        from camp.apps.alerts.windows import record_entries
+        record_entries(self, entries)
+
+        newest = {}
+        for entry in entries:
+            key = (entry.entry_type, entry.stage, entry.processor)
+            if key not in newest or entry.timestamp > newest[key].timestamp:
+                newest[key] = entry
+
+        for entry in newest.values():
+            self.update_latest_entry(entry)
+
     def update_latest_entry(self, entry):
         allowed_stages = (
             self.get_default_stage(entry.__class__),
@@ -483,32 +617,8 @@ class Monitor(models.Model):
             if entry.processor != self.get_default_calibration(entry.__class__):
                 return
 
-        lookup = {
-            'monitor_id': self.pk,
-            'entry_type': entry.entry_type,
-            'processor': entry.processor,
-            'stage': entry.stage,
-        }
-
-        # Atomic conditional update: only overwrite if our entry is newer.
-        # Using filter().update() avoids the TOCTOU race in the update path.
-        updated = LatestEntry.objects.filter(
-            timestamp__lt=entry.timestamp,
-            **lookup
-        ).update(entry_id=entry.pk, timestamp=entry.timestamp)
-
-        if not updated:
-            # Either no record exists yet, or the stored entry is already newer.
-            # get_or_create handles the creation case; IntegrityError catches
-            # the race where two workers both see DoesNotExist and both try to create.
-            try:
-                LatestEntry.objects.get_or_create(
-                    defaults={'entry_id': entry.pk, 'timestamp': entry.timestamp},
-                    **lookup
-                )
-            except IntegrityError:
-                pass
-
+        # Coalesced per ingest task when running inside latest_entries.batch().
+        latest_entries.record(self, entry)
 
     def get_latest_data(self):
         '''
@@ -551,7 +661,7 @@ class Monitor(models.Model):
     @classmethod
     def health_check_queryset_filter(cls):
         """Returns kwargs to filter health-check-eligible monitors of this type."""
-        return {f'{cls.monitor_type}__isnull': False}
+        return {'subtype': cls.monitor_type}
 
     def supports_health_checks(self):
         """Returns True if this monitor instance supports health checks."""
@@ -582,6 +692,8 @@ class Monitor(models.Model):
         # when there's not already an answer, or position actually moved.
         if self.position and (not self.county or self.tracker.has_changed('position')):
             self.county = County.lookup(self.position)
+        if type(self) is not Monitor:
+            self.subtype = self.monitor_type
         super().save(*args, **kwargs)
 
     # Legacy
@@ -709,6 +821,23 @@ class LCSMixin(Monitor):
             queryset = queryset.exclude(pk=self.pk)
         return queryset
 
+    def process_entries_batch(self, entries, cutoff_stage=None):
+        '''
+        Batched counterpart to process_entry_pipeline(). Corrected entries
+        inside the batch are cleaned as part of it; the one just before the
+        earliest new CORRECTED entry was waiting on a "next" value, so it's
+        run through the pipeline once the batch is done.
+        '''
+        results = super().process_entries_batch(entries, cutoff_stage)
+
+        corrected_entries = [e for e in results if e.stage == e.Stage.CORRECTED]
+        if corrected_entries:
+            earliest = min(corrected_entries, key=lambda e: e.timestamp)
+            if previous := earliest.get_previous_entry():
+                results.extend(super().process_entries_batch([previous], cutoff_stage))
+
+        return results
+
 
 class Host(TimeStampedModel):
     name = models.CharField(max_length=200, help_text=_('Contact or organization name.'))
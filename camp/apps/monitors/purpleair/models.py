@@ -175,7 +175,7 @@ class PurpleAir(LCSMixin, Monitor):
         # If we're here, it's probably outside.
         return self.LOCATION.outside
 
-    def create_entries(self, payload, save=True):
+    def create_entries(self, payload, save=True, validate=True):
         timestamp = parse_timestamp(payload.get('last_seen', payload.get('time_stamp')))
         entries = []
 
@@ -196,17 +196,18 @@ class PurpleAir(LCSMixin, Monitor):
                     EntryModel=EntryModel,
                     timestamp=timestamp,
                     save=save,
+                    validate=validate,
                     **data
                 )
                 if entry is not None:
                     entries.append(entry)
         return entries
 
-    def create_entry(self, EntryModel, save: bool = True, **data):
+    def create_entry(self, EntryModel, save: bool = True, validate: bool = True, **data):
         if not data or any(v is None for v in data.values()):
             return
 
-        return super().create_entry(EntryModel, save=save, **data)
+        return super().create_entry(EntryModel, save=save, validate=validate, **data)
 
     def process_entry_pipeline(self, entry, cutoff_stage=None):
         '''
@@ -1,6 +1,8 @@
 import time
 
+from collections import defaultdict
 from datetime import datetime
+from itertools import batched
 
 from django.conf import settings
 from django.contrib.gis.geos import Point
@@ -11,6 +13,8 @@ from django_huey import db_task, db_periodic_task
 from huey import crontab
 
 from camp.apps.entries import models as entry_models
+from camp.apps.monitors import latest as latest_entries
+from camp.apps.monitors.models import Monitor
 from camp.apps.monitors.purpleair.api import purpleair_api
 from camp.apps.monitors.purpleair.models import PurpleAir
 from camp.apps.regions.models import Region
@@ -22,12 +26,11 @@ def update_realtime():
     start = timezone.now()
     print(f'\n=== PurpleAir Import Start: {start.time()}\n')
 
-    seen_ids = []
     sensors = purpleair_api.list_group_members(settings.PURPLEAIR_GROUP_ID)
-    for sensor in sensors:
-        seen_ids.append(sensor['sensor_index'])
-        # process_data.call_local(sensor)
-        process_data.schedule([sensor], delay=1, priority=40)
+    seen_ids = [sensor['sensor_index'] for sensor in sensors]
+
+    for batch in batched(sensors, settings.PURPLEAIR_INGEST_BATCH_SIZE):
+        process_data_batch.schedule([list(batch)], delay=1, priority=40)
 
     # Any monitors that are active but missing
     # from the group should be manually retried.
@@ -109,6 +112,7 @@ def find_new_monitors():
 
 
 @db_task()
+@latest_entries.batch()
 def process_data(payload, cutoff_stage=None):
     try:
         monitor = PurpleAir.objects.get(sensor_id=payload['sensor_index'])
@@ -136,6 +140,49 @@ def process_data(payload, cutoff_stage=None):
     monitor.save()
 
 
+@db_task()
+@latest_entries.batch()
+def process_data_batch(payloads, cutoff_stage=None):
+    '''
+    Batched counterpart to process_data() for a chunk of group members.
+
+    Resolves every monitor in one query, builds all of their entries in
+    memory, and writes them with one bulk upsert per entry model before
+    running the processing pipeline on whatever was new or changed.
+    Sensors we don't know about yet are handed off to process_data(),
+    which takes care of creating the monitor.
+    '''
+    monitors = PurpleAir.objects.in_bulk(
+        [payload['sensor_index'] for payload in payloads],
+        field_name='sensor_id',
+    )
+
+    entries = defaultdict(list)
+    for payload in payloads:
+        monitor = monitors.get(payload['sensor_index'])
+        if monitor is None:
+            process_data.schedule([payload], delay=1, priority=40)
+            continue
+
+        for entry in monitor.create_entries(payload, save=False, validate=False):
+            entries[type(entry)].append(entry)
+
+    created = defaultdict(list)
+    with transaction.atomic():
+        for EntryModel, model_entries in entries.items():
+            for entry in EntryModel.objects.bulk_upsert(model_entries):
+                created[entry.monitor].append(entry)
+
+    # Every entry model is written before any processor runs, so A/B
+    # siblings and context entries are already in place for the pipeline.
+    for monitor, monitor_entries in created.items():
+        monitor.update_latest_entries(monitor_entries)
+        monitor.process_entries_batch(monitor_entries, cutoff_stage=cutoff_stage)
+
+    if monitors:
+        Monitor.objects.filter(pk__in=[m.pk for m in monitors.values()]).update(modified=timezone.now())
+
+
 @db_task(queue='secondary')
 def import_monitor_history(monitor_id, start_date, end_date, chunk_size=28):
     monitor = PurpleAir.objects.get(pk=monitor_id)
@@ -164,6 +211,7 @@ def import_monitor_history(monitor_id, start_date, end_date, chunk_size=28):
 
 
 @db_task(queue='secondary')
+@latest_entries.batch()
 def process_monitor_history(monitor_id, start_date, end_date):
     monitor = PurpleAir.objects.get(pk=monitor_id)
 
@@ -182,10 +230,8 @@ def process_monitor_history(monitor_id, start_date, end_date):
             .iterator(chunk_size=1000)
         )
 
-        for i, entry in enumerate(queryset):
-            if (i % 5000) == 0:
-                print(i, entry.entry_type, entry.timestamp)
-            monitor.process_entry_pipeline(entry)
+        for batch in batched(queryset, 1000):
+            monitor.process_entries_batch(batch)
 
 
 
@@ -11,6 +11,7 @@ from camp.apps.entries import models as entry_models
 
 from .api import purpleair_api
 from .models import PurpleAir
+from .tasks import process_data_batch
 
 
 def make_sensor_payload():
@@ -52,6 +53,41 @@ class PurpleAirTests(TestCase):
         assert a.position == self.monitor.position
         assert a.fahrenheit == payload['temperature']
 
+    def test_process_data_batch(self):
+        payload = make_sensor_payload()
+        payload['sensor_index'] = self.monitor.sensor_id
+
+        process_data_batch.call_local([payload])
+
+        raw = entry_models.PM25.objects.filter(monitor_id=self.monitor.pk, stage=entry_models.PM25.Stage.RAW)
+        assert sorted(raw.values_list('sensor', flat=True)) == ['a', 'b']
+        assert entry_models.PM25.objects.filter(
+            monitor_id=self.monitor.pk,
+            stage=entry_models.PM25.Stage.CORRECTED,
+        ).count() == 1
+        assert entry_models.Temperature.objects.filter(monitor_id=self.monitor.pk).exists()
+        assert self.monitor.latest_entries.filter(entry_type='pm25').exists()
+
+        # Re-running the same payload is a no-op.
+        total = entry_models.PM25.objects.filter(monitor_id=self.monitor.pk).count()
+        process_data_batch.call_local([payload])
+        assert entry_models.PM25.objects.filter(monitor_id=self.monitor.pk).count() == total
+
+    def test_process_data_batch_updates_changed_values(self):
+        payload = make_sensor_payload()
+        payload['sensor_index'] = self.monitor.sensor_id
+        process_data_batch.call_local([payload])
+
+        payload['pm2.5_atm_a'] = 11.5
+        process_data_batch.call_local([payload])
+
+        entry = entry_models.PM25.objects.get(
+            monitor_id=self.monitor.pk,
+            stage=entry_models.PM25.Stage.RAW,
+            sensor='a',
+        )
+        assert entry.value == Decimal('11.50')
+
     def test_probable_location_marked_inside(self):
         payload = {'name': 'test', 'location_type': 1}
         assert PurpleAir().get_probable_location(payload) == PurpleAir.LOCATION.inside
@@ -106,6 +142,34 @@ class PurpleAirTests(TestCase):
                     assert e.origin is not None
                     assert e.origin.stage == entry_models.PM25.Stage.CLEANED
 
+    def test_batch_pipeline_runs_all_stages(self):
+        now = timezone.now()
+
+        entries = []
+        timestamps = [now - timedelta(minutes=(60 - i)) for i in range(-3, 0)]
+        for i, ts in enumerate(timestamps):
+            entries.append(self.monitor.create_entry(entry_models.Humidity, timestamp=ts, value=Decimal('45.0')))
+            entries.append(self.monitor.create_entry(entry_models.PM25, timestamp=ts, sensor='a', value=Decimal('10') + i))
+
+        self.monitor.process_entries_batch(entries)
+
+        entries = entry_models.PM25.objects.filter(monitor_id=self.monitor.pk)
+        stages = list(entries.values_list('stage', flat=True))
+
+        # Same outcome as running process_entry_pipeline() one entry at a time.
+        assert stages.count(entry_models.PM25.Stage.RAW) == 3
+        assert stages.count(entry_models.PM25.Stage.CORRECTED) == 3
+        assert stages.count(entry_models.PM25.Stage.CLEANED) == 2
+        assert stages.count(entry_models.PM25.Stage.CALIBRATED) == 2
+
+        for e in entries.exclude(stage=entry_models.PM25.Stage.RAW):
+            assert e.origin is not None
+
+        # Reprocessing the same window doesn't create anything new.
+        raw = list(entries.filter(stage=entry_models.PM25.Stage.RAW))
+        assert self.monitor.process_entries_batch(raw) == []
+        assert entries.count() == len(stages)
+
     def test_pipeline_handles_filtered_entries(self):
         now = timezone.now()
 
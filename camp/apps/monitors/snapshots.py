@@ -0,0 +1,156 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+
+def filter_current(queryset):
+    '''Public, positioned monitors that are recently active and healthy.'''
+    queryset = queryset.get_public().filter(position__isnull=False)
+    queryset = queryset.get_active(timedelta(
+        days=settings.MONITOR_ACTIVE_WINDOW_DAYS
+    ).total_seconds())
+    return queryset.filter_healthy(
+        hours=settings.MONITOR_HEALTHY_WINDOW_HOURS,
+        threshold=settings.MONITOR_HEALTHY_THRESHOLD,
+    )
+
+
+def get_monitors(EntryModel, monitor_ids=None):
+    '''The monitors on the map for `EntryModel`, with their latest entry.'''
+    from camp.apps.monitors.models import Monitor
+
+    queryset = filter_current(Monitor.objects
+        .select_related('health')
+        .prefetch_related('latest_entries')
+        .with_last_entry_timestamp()
+    )
+    if monitor_ids is not None:
+        queryset = queryset.filter(pk__in=monitor_ids)
+    return queryset.with_latest_entry(EntryModel)
+
+
+def serialize(monitor):
+    '''One monitor as the current-data endpoint renders it.'''
+    from camp.api.v2.monitors.serializers import EntrySerializer, MonitorSerializer
+
+    data = MonitorSerializer(monitor).serialize()
+    data['latest'] = EntrySerializer(monitor.latest_entry).serialize()
+    return data
+
+
+def get_seen(EntryModel):
+    '''{monitor_id: newest LatestEntry timestamp} for every monitor with data.'''
+    from camp.apps.monitors.models import LatestEntry
+
+    queryset = (LatestEntry.objects
+        .filter(entry_type=EntryModel.entry_type)
+        .values_list('monitor_id')
+        .annotate(timestamp=Max('timestamp'))
+    )
+    return {monitor_id: timestamp for monitor_id, timestamp in queryset}
+
+
+def get_expired(items):
+    '''
+    Ids of the serialized monitors in `items` that say they're active but
+    have gone longer than their `last_active_limit` without an entry.
+    '''
+    from camp.apps.monitors.models import Monitor
+
+    active = {item['id']: item['last_active_limit'] for item in items if item['is_active']}
+    now = timezone.now()
+    return {
+        str(pk) for pk, last_seen in (Monitor.objects
+            .filter(pk__in=list(active))
+            .values_list('pk', 'last_seen')
+        )
+        if last_seen is None or last_seen < now - timedelta(seconds=active[str(pk)])
+    }
+
+
+def get(EntryModel):
+    '''The serialized monitors for `EntryModel`, or None if not built yet.'''
+    from camp.apps.monitors.models import MapSnapshot
+
+    return (MapSnapshot.objects
+        .filter(entry_type=EntryModel.entry_type)
+        .values_list('monitors', flat=True)
+        .first()
+    )
+
+
+def build(EntryModel):
+    '''Rebuild the snapshot for `EntryModel` from scratch.'''
+    from camp.apps.monitors.models import MapSnapshot
+
+    seen = get_seen(EntryModel)
+    snapshot, created = MapSnapshot.objects.update_or_create(
+        entry_type=EntryModel.entry_type,
+        defaults={
+            'monitors': [serialize(monitor) for monitor in get_monitors(EntryModel)],
+            'seen': {str(pk): timestamp.isoformat() for pk, timestamp in seen.items()},
+            'built': timezone.now(),
+        },
+    )
+    return snapshot
+
+
+def refresh(EntryModel):
+    '''
+    Bring the snapshot for `EntryModel` up to date with LatestEntry,
+    re-serializing only the monitors whose latest entry has changed (or
+    that appeared or disappeared) since the last refresh. Builds the
+    snapshot if there isn't one yet.
+
+    Monitors shown as active whose LAST_ACTIVE_LIMIT has since run out are
+    re-serialized too, so they go inactive on time. Other changes that
+    don't move LatestEntry -- health checks, monitors aging out of the map
+    window -- wait for the next build().
+    '''
+    from camp.apps.monitors.models import MapSnapshot
+
+    with transaction.atomic():
+        snapshot = (MapSnapshot.objects
+            .select_for_update()
+            .filter(entry_type=EntryModel.entry_type)
+            .first()
+        )
+        if snapshot is None:
+            return build(EntryModel)
+
+        ids = {}
+        seen = {}
+        for pk, timestamp in get_seen(EntryModel).items():
+            ids[str(pk)] = pk
+            seen[str(pk)] = timestamp.isoformat()
+
+        changed = {
+            pk for pk in seen.keys() | snapshot.seen.keys()
+            if seen.get(pk) != snapshot.seen.get(pk)
+        }
+        changed.update(get_expired(snapshot.monitors))
+        if not changed:
+            return snapshot
+
+        fresh = {
+            str(monitor.pk): serialize(monitor)
+            for monitor in get_monitors(EntryModel, [ids[pk] for pk in changed if pk in ids])
+        }
+
+        # Keep the document's order; changed monitors are replaced in place
+        # (or dropped), and newcomers go on the end.
+        monitors = []
+        for item in snapshot.monitors:
+            if item['id'] not in changed:
+                monitors.append(item)
+            elif item['id'] in fresh:
+                monitors.append(fresh.pop(item['id']))
+        monitors.extend(fresh.values())
+
+        snapshot.monitors = monitors
+        snapshot.seen = seen
+        snapshot.save()
+        return snapshot
@@ -8,7 +8,9 @@ from django.utils import timezone
 from django_huey import db_task, db_periodic_task
 from huey import crontab
 
+from camp.apps.entries.models import BaseEntry
 from camp.utils.text import render_markdown
+from . import snapshots
 from .models import Entry, Monitor
 
 
@@ -55,3 +57,15 @@ def recalibrate_entry(entry_id):
     entry.pm25_avg_15 = entry.get_average('pm25', 15)
     entry.pm25_avg_60 = entry.get_average('pm25', 60)
     entry.save()
+
+
+@db_periodic_task(crontab(minute='*'), priority=100)
+def refresh_map_snapshots():
+    for EntryModel in BaseEntry.get_subclasses():
+        snapshots.refresh(EntryModel)
+
+
+@db_task(priority=50)
+def rebuild_map_snapshots():
+    for EntryModel in BaseEntry.get_subclasses():
+        snapshots.build(EntryModel)
@@ -2,14 +2,15 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 
 from django.contrib.gis.geos import Point
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from decimal import Decimal
 from unittest.mock import patch
 
 from camp.apps.entries import models as entry_models
-from camp.apps.monitors.models import LatestEntry, Monitor
+from camp.apps.monitors import latest as latest_entries, snapshots
+from camp.apps.monitors.models import LatestEntry, MapSnapshot, Monitor
 from camp.apps.monitors.purpleair.models import PurpleAir
 from camp.utils.datetime import make_aware
 
@@ -191,6 +192,33 @@ class MonitorTests(TestCase):
         )
         assert results == []
 
+    def test_with_entry_as_of_uses_one_query_for_all_monitors(self):
+        monitor = self.get_purpleair()
+        other = PurpleAir.objects.create(name='Other Sensor', sensor_id='000000')
+        as_of = make_aware(datetime(2026, 1, 1, 12, 0))
+        stage = monitor.get_default_stage(entry_models.PM25)
+
+        expected = {}
+        for sensor in (monitor, other):
+            entry_models.PM25.objects.create(
+                monitor_id=sensor.pk, timestamp=as_of - timedelta(minutes=20),
+                sensor='a', stage=stage, value=Decimal('9.0'),
+            )
+            expected[sensor.pk] = entry_models.PM25.objects.create(
+                monitor_id=sensor.pk, timestamp=as_of - timedelta(minutes=5),
+                sensor='a', stage=stage, value=Decimal('11.0'),
+            ).pk
+
+        queryset = Monitor.objects.filter(pk__in=expected)
+        # Evaluate the monitors and warm the default calibration cache.
+        list(queryset)
+        monitor.get_default_calibration(entry_models.PM25)
+        with self.assertNumQueries(1):
+            results = queryset.with_entry_as_of(entry_models.PM25, as_of)
+
+        assert [m.pk for m in results] == [m.pk for m in queryset]
+        assert {m.pk: m.latest_pm25.pk for m in results} == expected
+
 
 class CreateEntryUpsertTests(TestCase):
     """
@@ -254,6 +282,75 @@ class CreateEntryUpsertTests(TestCase):
         assert entry_models.PM25.objects.filter(monitor=monitor).count() == 1
 
 
+class CreateEntriesBulkTests(TestCase):
+    fixtures = ['purple-air.yaml']
+
+    def get_purpleair(self):
+        return PurpleAir.objects.get(sensor_id=8892)
+
+    def test_creates_entries_and_advances_latest_entry(self):
+        monitor = self.get_purpleair()
+        start = make_aware(datetime(2025, 4, 27, 0, 0))
+        rows = [
+            {'timestamp': start + timedelta(minutes=i), 'value': Decimal('40') + i}
+            for i in range(5)
+        ]
+
+        created = monitor.create_entries_bulk(entry_models.Humidity, rows)
+
+        assert len(created) == 5
+        assert entry_models.Humidity.objects.filter(monitor=monitor).count() == 5
+
+        latest = LatestEntry.objects.get(monitor=monitor, entry_type='humidity')
+        assert latest.timestamp == start + timedelta(minutes=4)
+        assert latest.entry_id == created[-1].pk
+
+    def test_upserts_changed_rows_and_skips_unchanged(self):
+        monitor = self.get_purpleair()
+        timestamp = make_aware(datetime(2025, 4, 27, 0, 0))
+        existing = monitor.create_entry(entry_models.Humidity, timestamp=timestamp, value=Decimal('40.0'))
+
+        unchanged = monitor.create_entries_bulk(entry_models.Humidity, [
+            {'timestamp': timestamp, 'value': Decimal('40.0')},
+        ])
+        assert unchanged == []
+
+        changed = monitor.create_entries_bulk(entry_models.Humidity, [
+            {'timestamp': timestamp, 'value': 41},
+        ])
+        assert len(changed) == 1
+        assert changed[0].pk == existing.pk
+
+        existing.refresh_from_db()
+        assert existing.value == Decimal('41.0')
+        assert entry_models.Humidity.objects.filter(monitor=monitor).count() == 1
+
+    def test_skips_rows_rejected_by_create_entry(self):
+        monitor = self.get_purpleair()
+        timestamp = make_aware(datetime(2025, 4, 27, 0, 0))
+
+        created = monitor.create_entries_bulk(entry_models.Humidity, [
+            {'timestamp': timestamp, 'value': None},
+        ])
+
+        assert created == []
+
+    def test_create_entries_from_rows_writes_once_per_model(self):
+        monitor = self.get_purpleair()
+        start = make_aware(datetime(2025, 4, 27, 0, 0))
+        rows = []
+        for i in range(3):
+            rows.append((entry_models.Humidity, {'timestamp': start + timedelta(minutes=i), 'value': 40 + i}))
+            rows.append((entry_models.Temperature, {'timestamp': start + timedelta(minutes=i), 'value': 70 + i}))
+
+        with patch.object(PurpleAir, 'create_entries_bulk', wraps=monitor.create_entries_bulk) as mock_bulk:
+            created = monitor.create_entries_from_rows(rows)
+
+        assert mock_bulk.call_count == 2
+        assert len(created) == 6
+        assert [entry.timestamp for entry in created] == sorted(entry.timestamp for entry in created)
+
+
 class MonitorSaveCountyLookupTests(TestCase):
     fixtures = ['purple-air.yaml']
 
@@ -297,3 +394,173 @@ class MonitorSaveCountyLookupTests(TestCase):
 
         lookup.assert_called_once()
         assert monitor.county == 'Kern'
+
+
+class LatestEntryBatchTests(TestCase):
+    fixtures = ['purple-air.yaml']
+
+    def get_purpleair(self):
+        return PurpleAir.objects.get(sensor_id=8892)
+
+    def test_batch_coalesces_to_newest_entry(self):
+        monitor = self.get_purpleair()
+        start = make_aware(datetime(2025, 4, 27, 0, 0))
+
+        with latest_entries.batch():
+            entries = [
+                monitor.create_entry(entry_models.Humidity, timestamp=start + timedelta(minutes=i), value=40 + i)
+                for i in (2, 0, 1)
+            ]
+            assert not LatestEntry.objects.filter(monitor=monitor, entry_type='humidity').exists()
+
+        latest = LatestEntry.objects.get(monitor=monitor, entry_type='humidity')
+        assert latest.timestamp == start + timedelta(minutes=2)
+        assert latest.entry_id == entries[0].pk
+
+    def test_older_entry_does_not_replace_newer(self):
+        monitor = self.get_purpleair()
+        timestamp = make_aware(datetime(2025, 4, 27, 0, 0))
+
+        newer = monitor.create_entry(entry_models.Humidity, timestamp=timestamp, value=40)
+        monitor.create_entry(entry_models.Humidity, timestamp=timestamp - timedelta(hours=1), value=41)
+
+        latest = LatestEntry.objects.get(monitor=monitor, entry_type='humidity')
+        assert latest.timestamp == timestamp
+        assert latest.entry_id == newer.pk
+
+
+class MonitorActivityTests(TestCase):
+    fixtures = ['purple-air.yaml']
+
+    def get_purpleair(self):
+        return PurpleAir.objects.get(sensor_id=8892)
+
+    def test_ingest_advances_last_seen(self):
+        monitor = self.get_purpleair()
+        now = timezone.now()
+
+        monitor.create_entry(entry_models.Humidity, timestamp=now - timedelta(minutes=5), value=40)
+        monitor.create_entry(entry_models.Humidity, timestamp=now - timedelta(hours=2), value=41)
+
+        monitor.refresh_from_db()
+        assert monitor.last_seen == now - timedelta(minutes=5)
+        assert monitor.is_active
+
+    def test_save_does_not_write_back_stale_last_seen(self):
+        monitor = self.get_purpleair()
+        stale = self.get_purpleair()
+
+        monitor.create_entry(entry_models.Humidity, timestamp=timezone.now(), value=40)
+        monitor.refresh_from_db()
+        assert monitor.last_seen is not None
+
+        stale.name = 'Renamed'
+        stale.save()
+
+        stale.refresh_from_db()
+        assert stale.name == 'Renamed'
+        assert stale.last_seen == monitor.last_seen
+
+    def test_active_and_inactive_sets(self):
+        monitor = self.get_purpleair()
+        assert monitor.pk in set(PurpleAir.objects.get_inactive().values_list('pk', flat=True))
+
+        monitor.create_entry(entry_models.Humidity, timestamp=timezone.now(), value=40)
+
+        assert monitor.pk in set(PurpleAir.objects.get_active().values_list('pk', flat=True))
+        assert monitor.pk not in set(PurpleAir.objects.get_inactive().values_list('pk', flat=True))
+
+        active, inactive = Monitor.objects.split_active()
+        assert monitor.pk in {m.pk for m in active}
+        assert monitor.pk not in {m.pk for m in inactive}
+
+
+@override_settings(MONITOR_HEALTHY_THRESHOLD=0)
+class MapSnapshotTests(TestCase):
+    # threshold=0 so the fixture monitor (no HealthCheck rows) is on the map.
+    fixtures = ['purple-air.yaml']
+
+    def get_purpleair(self):
+        return PurpleAir.objects.get(sensor_id=8892)
+
+    def test_build_serializes_current_monitors(self):
+        monitor = self.get_purpleair()
+        assert snapshots.get(entry_models.Temperature) is None
+
+        monitor.create_entry(entry_models.Temperature, timestamp=timezone.now(), value=Decimal('70.0'))
+        snapshots.build(entry_models.Temperature)
+
+        items = snapshots.get(entry_models.Temperature)
+        assert [item['id'] for item in items] == [str(monitor.pk)]
+        assert items[0]['latest']['entry_type'] == 'temperature'
+
+    def test_refresh_only_reserializes_changed_monitors(self):
+        monitor = self.get_purpleair()
+        now = timezone.now()
+        monitor.create_entry(entry_models.Temperature, timestamp=now - timedelta(minutes=10), value=Decimal('70.0'))
+        snapshots.build(entry_models.Temperature)
+
+        with patch.object(snapshots, 'serialize', wraps=snapshots.serialize) as serialize:
+            snapshots.refresh(entry_models.Temperature)
+            assert serialize.call_count == 0
+
+            monitor.create_entry(entry_models.Temperature, timestamp=now, value=Decimal('75.0'))
+            snapshots.refresh(entry_models.Temperature)
+            assert serialize.call_count == 1
+
+        snapshot = MapSnapshot.objects.get(entry_type='temperature')
+        assert len(snapshot.monitors) == 1
+        assert snapshot.seen == {str(monitor.pk): now.isoformat()}
+
+    def test_refresh_marks_monitors_inactive_once_their_limit_passes(self):
+        monitor = self.get_purpleair()
+        monitor.create_entry(entry_models.Temperature, timestamp=timezone.now(), value=Decimal('70.0'))
+        snapshots.build(entry_models.Temperature)
+        assert snapshots.get(entry_models.Temperature)[0]['is_active']
+
+        # No new entry, just time passing.
+        Monitor.objects.filter(pk=monitor.pk).update(
+            last_seen=timezone.now() - timedelta(seconds=monitor.LAST_ACTIVE_LIMIT + 60),
+        )
+        snapshots.refresh(entry_models.Temperature)
+
+        assert not snapshots.get(entry_models.Temperature)[0]['is_active']
+
+    def test_refresh_drops_monitors_that_leave_the_map(self):
+        monitor = self.get_purpleair()
+        monitor.create_entry(entry_models.Temperature, timestamp=timezone.now(), value=Decimal('70.0'))
+        snapshots.build(entry_models.Temperature)
+
+        Monitor.objects.filter(pk=monitor.pk).update(is_hidden=True)
+        LatestEntry.objects.filter(monitor=monitor).delete()
+        snapshots.refresh(entry_models.Temperature)
+
+        assert snapshots.get(entry_models.Temperature) == []
+
+
+class SubtypeLoadingTests(TestCase):
+    fixtures = ['purple-air.yaml', 'bam1022.yaml']
+
+    def test_save_records_subtype(self):
+        monitor = PurpleAir.objects.create(name='Other Sensor', sensor_id='000000')
+        assert Monitor.objects.filter(pk=monitor.pk).values_list('subtype', flat=True).get() == 'purpleair'
+
+    def test_default_queryset_does_not_join_subclass_tables(self):
+        sql = str(Monitor.objects.all().query)
+        for subclass in Monitor.get_subclasses():
+            assert subclass._meta.db_table not in sql
+
+    def test_loads_subclasses_with_one_query_per_subtype(self):
+        with self.assertNumQueries(3):
+            monitors = {monitor.pk: monitor for monitor in Monitor.objects.with_last_entry_timestamp()}
+
+        purpleair = PurpleAir.objects.get(sensor_id=8892)
+        assert type(monitors[purpleair.pk]) is PurpleAir
+        assert monitors[purpleair.pk].sensor_id == purpleair.sensor_id
+        assert monitors[purpleair.pk].name == purpleair.name
+        assert hasattr(monitors[purpleair.pk], 'last_entry_timestamp')
+        assert {type(monitor).__name__ for monitor in monitors.values()} == {'PurpleAir', 'BAM1022'}
+
+    def test_skip_and_select_subclasses(self):
+        assert {type(m) for m in Monitor.objects.skip_subclasses()} == {Monitor}
+        assert {type(m).__name__ for m in Monitor.objects.select_subclasses()} == {'PurpleAir', 'BAM1022'}
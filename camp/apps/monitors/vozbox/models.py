@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from django.contrib.gis.db import models
 from django.contrib.gis.geos import Point
 from django.utils.translation import gettext_lazy as _
@@ -117,22 +119,24 @@ class VOZBox(Monitor):
             entry_models.O3: {'value': row.get('o3')},
         }
 
+        # Both channels of a model are written together; create_entry()
+        # drops any row with missing values.
+        rows = defaultdict(list)
         for sensor, model_map in dual_channel.items():
             for EntryModel, data in model_map.items():
-                entry = self.create_entry(EntryModel, timestamp=timestamp, sensor=sensor, **data)
-                if entry is not None:
-                    entries.append(entry)
+                rows[EntryModel].append(dict(timestamp=timestamp, sensor=sensor, **data))
 
         for EntryModel, data in single_channel.items():
-            entry = self.create_entry(EntryModel, timestamp=timestamp, sensor='1', **data)
-            if entry is not None:
-                entries.append(entry)
+            rows[EntryModel].append(dict(timestamp=timestamp, sensor='1', **data))
+
+        for EntryModel, model_rows in rows.items():
+            entries.extend(self.create_entries_bulk(EntryModel, model_rows))
 
         return entries
 
-    def create_entry(self, EntryModel, **data):
+    def create_entry(self, EntryModel, save: bool = True, validate: bool = True, **data):
         skip_keys = {'timestamp', 'sensor'}
         values = {k: v for k, v in data.items() if k not in skip_keys}
         if any(v is None for v in values.values()):
             return None
-        return super().create_entry(EntryModel, **data)
+        return super().create_entry(EntryModel, save=save, validate=validate, **data)
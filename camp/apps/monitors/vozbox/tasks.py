@@ -8,6 +8,7 @@ from huey import crontab
 
 from camp.apps.calibrations import processors
 from camp.apps.entries import models as entry_models
+from camp.apps.monitors import latest as latest_entries
 from camp.apps.monitors.vozbox.api import VozBoxClient
 from camp.apps.monitors.vozbox.models import VOZBox
 
@@ -104,6 +105,7 @@ def import_realtime():
 
 
 @db_task()
+@latest_entries.batch()
 def process_device(coreid, rows):
     monitor, created = VOZBox.objects.get_or_create(sensor_id=coreid)
     if created and rows:
@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 from camp.datasci import series
@@ -14,6 +15,10 @@ class SanityChecks:
     monitor: Monitor
     results: dict[str, Optional[bool]] = field(init=False)
 
+    MAX_VALUE = 1500
+    MAX_FLATLINE = .75
+    MIN_COMPLETENESS = .8
+
     def __post_init__(self):
         self.results = {
             'max': self.check_max(),
@@ -43,7 +48,7 @@ class SanityChecks:
         """
         if self.summary.max is None or pd.isna(self.summary.max):
             return None
-        return bool(self.summary.max < 1500)
+        return bool(self.summary.max < self.MAX_VALUE)
 
     def check_flatline(self) -> bool:
         """
@@ -54,7 +59,7 @@ class SanityChecks:
         """
         if self.summary.flatline is None or pd.isna(self.summary.flatline):
             return None
-        return bool(self.summary.flatline < .75)
+        return bool(self.summary.flatline < self.MAX_FLATLINE)
 
     def check_completeness(self) -> bool:
         """
@@ -66,7 +71,26 @@ class SanityChecks:
         if self.summary.count is None or pd.isna(self.summary.count):
             return None
         expected = self.monitor.expected_hourly_entries
-        return bool((self.summary.count / expected) >= .8)
+        return bool((self.summary.count / expected) >= self.MIN_COMPLETENESS)
+
+    @classmethod
+    def check_frame(cls, summary: pd.DataFrame, expected: pd.Series) -> pd.DataFrame:
+        """
+        Vectorized sanity checks over a frame of SeriesSummary rows, with
+        `expected` holding each row's expected hourly entry count. Returns a
+        column per check (True, False, or None when indeterminate) and an
+        `ok` column matching SanityChecks.ok.
+        """
+        def check(values, passed):
+            return passed.astype(object).where(values.notna(), None)
+
+        frame = pd.DataFrame({
+            'max': check(summary['max'], summary['max'] < cls.MAX_VALUE),
+            'flatline': check(summary['flatline'], summary['flatline'] < cls.MAX_FLATLINE),
+            'completeness': check(summary['count'], (summary['count'] / expected) >= cls.MIN_COMPLETENESS),
+        })
+        frame['ok'] = ~frame.eq(False).any(axis=1)
+        return frame
 
 
 @dataclass
@@ -151,3 +175,112 @@ class HealthCheckEvaluator:
             sanity_a=self.sanity_a,
             sanity_b=self.sanity_b,
         )
+
+
+class BatchHealthCheckEvaluator:
+    """
+    Set-based equivalent of running HealthCheckEvaluator for every eligible
+    monitor and hour in [start, end). RAW PM2.5 for the whole window is
+    loaded in one query and pivoted into A/B channels, then summarized and
+    scored per (monitor, hour) with grouped pandas operations.
+    """
+    KEYS = ['monitor_id', 'hour']
+    CHANNELS = ('a', 'b')
+
+    def __init__(self, start: datetime, end: Optional[datetime] = None, monitor_ids=None):
+        from camp.apps.entries.models import PM25
+        self.entry_model = PM25
+
+        self.start = start
+        self.end = end or start + timedelta(hours=1)
+        self.monitor_ids = monitor_ids
+
+    def get_monitors(self) -> dict:
+        queryset = Monitor.objects.get_for_health_checks()
+        if self.monitor_ids is not None:
+            queryset = queryset.filter(pk__in=self.monitor_ids)
+        return {monitor.pk: monitor for monitor in queryset}
+
+    def get_values(self, monitors: dict) -> Optional[pd.Series]:
+        """
+        Return every RAW value in the window as a Series indexed by
+        (monitor_id, hour, channel, timestamp), sorted, or None if there
+        are no entries.
+        """
+        channels = pd.DataFrame.from_records(
+            [
+                (monitor_id, sensor, channel)
+                for monitor_id, monitor in monitors.items()
+                for sensor, channel in zip(monitor.ENTRY_CONFIG[self.entry_model]['sensors'], self.CHANNELS)
+            ],
+            columns=['monitor_id', 'sensor', 'channel'],
+        )
+
+        rows = (self.entry_model.objects
+            .filter(
+                monitor_id__in=list(monitors),
+                timestamp__gte=self.start,
+                timestamp__lt=self.end,
+                stage=self.entry_model.Stage.RAW,
+                value__isnull=False,
+            )
+            .values_list('monitor_id', 'sensor', 'timestamp', 'value')
+            .iterator(chunk_size=10000)
+        )
+        df = pd.DataFrame.from_records(rows, columns=['monitor_id', 'sensor', 'timestamp', 'value'])
+        df = df.merge(channels, on=['monitor_id', 'sensor'])
+        if df.empty:
+            return None
+
+        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+        df['hour'] = df['timestamp'].dt.floor('h')
+        df['value'] = df['value'].astype(float)
+        return df.set_index(['monitor_id', 'hour', 'channel', 'timestamp'])['value'].sort_index()
+
+    def evaluate(self) -> pd.DataFrame:
+        """
+        Return one row per (monitor_id, hour) that has entries, with a
+        column for the score and each stat stored on HealthCheck.
+        """
+        monitors = self.get_monitors()
+        values = self.get_values(monitors) if monitors else None
+        if values is None:
+            return pd.DataFrame()
+
+        groups = values.index.droplevel(['channel', 'timestamp']).unique()
+        expected = pd.Series(
+            groups.get_level_values('monitor_id').map(lambda pk: monitors[pk].expected_hourly_entries),
+            index=groups,
+        )
+
+        frame = pd.DataFrame(index=groups)
+        sanity = {}
+        for channel in self.CHANNELS:
+            channel_values = values[values.index.get_level_values('channel') == channel].droplevel('channel')
+            summary = series.summarize_groups(channel_values, level=self.KEYS).reindex(groups)
+            summary['count'] = summary['count'].fillna(0)
+
+            sanity[channel] = SanityChecks.check_frame(summary, expected)
+            frame = frame.join(summary.add_suffix(f'_{channel}'))
+            frame = frame.join(sanity[channel].drop(columns='ok').add_prefix('sanity_').add_suffix(f'_{channel}'))
+
+        paired = values.unstack('channel').reindex(columns=list(self.CHANNELS)).dropna()
+        comparison = series.compare_groups(paired['a'], paired['b'], level=self.KEYS).reindex(groups)
+        frame = frame.join(comparison)
+
+        # Mirrors stats.rpd_means() and the guards in stats.correlation()
+        mean = (frame['mean_a'] + frame['mean_b']) / 2
+        frame['rpd_means'] = ((frame['mean_a'] - frame['mean_b']).abs() / mean).where(mean != 0, 0.0)
+        computable = (
+            (frame['count_a'] >= 2) & (frame['count_b'] >= 2)
+            & (frame['stdev_a'] != 0) & (frame['stdev_b'] != 0)
+        )
+        frame['correlation'] = frame['correlation'].where(computable)
+
+        ok_a, ok_b = sanity['a']['ok'], sanity['b']['ok']
+        frame['score'] = np.select(
+            [ok_a & ok_b & (frame['rpd_pairwise'] <= .2), ok_a & ok_b, ok_a | ok_b],
+            [3, 2, 1],
+            default=0,
+        )
+        return frame
@@ -1,9 +1,10 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from django.core.management.base import BaseCommand, CommandError
 from django.utils.timezone import make_aware, now
 
 from camp.apps.monitors.models import Monitor
+from camp.apps.qaqc.models import HealthCheck
 
 
 class Command(BaseCommand):
@@ -24,6 +25,10 @@ class Command(BaseCommand):
             action='store_true',
             help='Run health checks for all multi-sensor monitors.',
         )
+        parser.add_argument(
+            '--end',
+            help='ISO timestamp; backfill every hour from `date` up to (not including) this one.',
+        )
 
     def handle(self, *args, **options):
         if not options['monitor_id'] and not options['all']:
@@ -32,11 +37,19 @@ class Command(BaseCommand):
             return
 
         hour = self.parse_hour(options['date'])
-        queryset = Monitor.objects.get_for_health_checks()
 
-        if options['monitor_id']:
-            queryset = queryset.filter(pk=options['monitor_id'])
+        if options['all'] or options['end']:
+            end = self.parse_hour(options['end']) if options['end'] else hour + timedelta(hours=1)
+            if end <= hour:
+                raise CommandError('--end must be after the start hour')
+
+            monitor_ids = [options['monitor_id']] if options['monitor_id'] else None
+            self.stdout.write(f'Evaluating {hour:%Y-%m-%d %H:00} – {end:%Y-%m-%d %H:00}')
+            count = HealthCheck.objects.backfill(hour, end, monitor_ids=monitor_ids)
+            self.stdout.write(self.style.SUCCESS('✓') + f' {count} health check{"s" if count != 1 else ""} written')
+            return
 
+        queryset = Monitor.objects.get_for_health_checks().filter(pk=options['monitor_id'])
         count = queryset.count()
         self.stdout.write(f'Evaluating {count} monitor{"s" if count > 1 else ""} @ {hour:%Y-%m-%d %H:00}')
 
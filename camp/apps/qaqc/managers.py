@@ -1,6 +1,20 @@
+from datetime import timedelta
+
 from django.db import models
 
 
+HEALTH_CHECK_UPDATE_FIELDS = [
+    'modified', 'score',
+    'correlation', 'rpd_means', 'rpd_pairwise', 'rmse',
+    *(f'{stat}_{channel}'
+        for channel in ('a', 'b')
+        for stat in ('min', 'max', 'count', 'mean', 'stdev', 'variance', 'mad', 'range', 'flatline')),
+    *(f'sanity_{check}_{channel}'
+        for channel in ('a', 'b')
+        for check in ('completeness', 'max', 'flatline')),
+]
+
+
 class HealthCheckManager(models.Manager):
     def evaluate(self, monitor, hour):
         """
@@ -16,3 +30,65 @@ class HealthCheckManager(models.Manager):
         health_check.evaluate()
         health_check.save()
         return health_check
+
+    def evaluate_hours(self, start, end=None, monitor_ids=None):
+        """
+        Evaluate every eligible monitor for each hour in [start, end) (just
+        `start` when end is omitted) with BatchHealthCheckEvaluator, upsert
+        the HealthCheck rows in bulk, and point each monitor's `health` at
+        its latest check. Only (monitor, hour) pairs with entries get a
+        check. Returns the number of checks written.
+        """
+        from camp.apps.qaqc.evaluator import BatchHealthCheckEvaluator
+
+        frame = BatchHealthCheckEvaluator(start, end, monitor_ids=monitor_ids).evaluate()
+        if frame.empty:
+            return 0
+
+        count_fields = ['count_a', 'count_b', 'score']
+        frame[count_fields] = frame[count_fields].astype(int)
+        frame = frame.astype(object).where(frame.notna(), None)
+
+        health_checks = [
+            self.model(
+                monitor_id=monitor_id,
+                hour=hour.to_pydatetime(),
+                **{name: row[name] for name in HEALTH_CHECK_UPDATE_FIELDS if name != 'modified'},
+            )
+            for (monitor_id, hour), row in frame.iterrows()
+        ]
+        self.bulk_create(
+            health_checks,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['monitor', 'hour'],
+            update_fields=HEALTH_CHECK_UPDATE_FIELDS,
+        )
+
+        self.update_monitor_health(frame.index.unique(level='monitor_id'))
+        return len(health_checks)
+
+    def backfill(self, start, end, monitor_ids=None, chunk=timedelta(days=1)):
+        """
+        Run evaluate_hours() across [start, end) in chunks, so each query
+        only holds one chunk of entries in memory. Returns the number of
+        checks written.
+        """
+        total = 0
+        cursor = start
+        while cursor < end:
+            chunk_end = min(cursor + chunk, end)
+            total += self.evaluate_hours(cursor, chunk_end, monitor_ids=monitor_ids)
+            cursor = chunk_end
+        return total
+
+    def update_monitor_health(self, monitor_ids):
+        """Point each monitor's `health` at its most recent HealthCheck."""
+        from camp.apps.monitors.models import Monitor
+
+        latest = (self
+            .filter(monitor_id=models.OuterRef('pk'))
+            .order_by('-hour')
+            .values('pk')[:1]
+        )
+        Monitor.objects.filter(pk__in=list(monitor_ids)).update(health_id=models.Subquery(latest))
@@ -6,20 +6,30 @@ from django_huey import db_task, db_periodic_task
 from huey import crontab
 
 from camp.apps.monitors.models import Monitor
+from camp.apps.monitors.tasks import rebuild_map_snapshots
+from camp.apps.qaqc.models import HealthCheck
 
 
 @db_periodic_task(crontab(hour='*', minute='1'), priority=50)
 def hourly_health_checks(hour=None):
     """
-    Run QA/QC health checks for all PM2.5 monitors with multiple sensors.
+    Run QA/QC health checks for all PM2.5 monitors with multiple sensors,
+    in one batch (see HealthCheckManager.evaluate_hours).
     """
     if hour is None:
         this_hour = timezone.now().replace(minute=0, second=0, microsecond=0)
         hour = this_hour - timedelta(hours=1)
 
-    queryset = Monitor.objects.get_for_health_checks(hour)
-    for monitor in queryset:
-        monitor_health_check(monitor.pk, hour)
+    HealthCheck.objects.evaluate_hours(hour)
+
+    # Health decides who is on the map, so start the map over.
+    rebuild_map_snapshots()
+
+
+@db_task(priority=50)
+def backfill_health_checks(start, end, monitor_ids=None):
+    """Recompute health checks for every hour in [start, end), a day at a time."""
+    HealthCheck.objects.backfill(start, end, monitor_ids=monitor_ids)
 
 
 @db_task(priority=50)
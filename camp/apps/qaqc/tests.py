@@ -118,6 +118,53 @@ class HealthCheckTests(TestCase):
         assert self.monitor.health_id == hc.pk
 
 
+    def test_evaluate_hours_matches_evaluate(self):
+        values_a = [10 + (i % 3) * 0.1 for i in range(self.samples)]
+        values_b = [v + 0.5 for v in values_a]
+        self.create_entries(values_a=values_a, values_b=values_b)
+
+        expected = self.monitor.run_health_check(self.hour)
+        HealthCheck.objects.all().delete()
+
+        assert HealthCheck.objects.evaluate_hours(self.hour) == 1
+        hc = HealthCheck.objects.get(monitor=self.monitor, hour=self.hour)
+
+        assert hc.score == expected.score
+        assert hc.count_a == expected.count_a
+        assert hc.sanity_completeness_b == expected.sanity_completeness_b
+        for name in ('rpd_means', 'rpd_pairwise', 'rmse', 'correlation', 'mean_a', 'flatline_b'):
+            assert round(getattr(hc, name), 6) == round(getattr(expected, name), 6), name
+
+    def test_evaluate_hours_one_sensor_fails(self):
+        values_a = [10 + (i % 3) * 0.1 for i in range(self.samples)]
+        values_b = [3000 for _ in range(self.samples)]
+        self.create_entries(values_a=values_a, values_b=values_b)
+        HealthCheck.objects.evaluate_hours(self.hour)
+
+        hc = HealthCheck.objects.get(monitor=self.monitor, hour=self.hour)
+        assert hc.score == 1
+        assert hc.sanity_max_b is False
+
+    def test_backfill_covers_each_hour_with_data(self):
+        values_a = [10 + (i % 3) * 0.1 for i in range(self.samples)]
+        values_b = [v + 0.5 for v in values_a]
+        self.create_entries(values_a=values_a, values_b=values_b)
+
+        self.hour += timedelta(hours=2)
+        self.create_entries(values_a=values_a, values_b=values_b)
+
+        count = HealthCheck.objects.backfill(self.hour - timedelta(hours=2), self.hour + timedelta(hours=1))
+        assert count == 2
+        assert HealthCheck.objects.filter(monitor=self.monitor).count() == 2
+
+        # Re-running updates in place, and the monitor points at the latest check
+        HealthCheck.objects.backfill(self.hour - timedelta(hours=2), self.hour + timedelta(hours=1))
+        assert HealthCheck.objects.filter(monitor=self.monitor).count() == 2
+
+        self.monitor.refresh_from_db()
+        assert self.monitor.health.hour == self.hour
+
+
 class SanityChecksOkTests(TestCase):
     def _make_sanity(self, results):
         """Build a SanityChecks with pre-set results, bypassing __post_init__."""
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class RegionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'camp.apps.regions'
+
+    def ready(self):
+        # Keeps RegionMembership in sync with monitor and boundary changes.
+        from django.db.models.signals import post_save
+
+        from camp.apps.monitors.models import Monitor
+        from . import signals
+
+        for subclass in [Monitor] + Monitor.get_subclasses():
+            post_save.connect(signals.update_monitor_memberships, sender=subclass)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from camp.apps.regions.models import Region, RegionMembership
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the monitor -> region membership table from monitor '
+        'positions and current region boundaries. Memberships are kept up '
+        'to date as monitors and boundaries are saved; this is for bulk '
+        'changes made with update() or raw SQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type', dest='region_type', choices=Region.Type.values,
+            help='Only rebuild memberships for regions of this type.',
+        )
+
+    def handle(self, *args, **options):
+        region_ids = None
+        if options['region_type']:
+            region_ids = Region.objects.filter(type=options['region_type']).values_list('pk', flat=True)
+
+        count = RegionMembership.objects.rebuild(region_ids=region_ids)
+        self.stdout.write(self.style.SUCCESS(f'{count:,} memberships'))
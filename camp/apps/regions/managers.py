@@ -3,6 +3,7 @@ from typing import Optional
 from django.contrib.gis.db import models
 from django.contrib.gis.geos.geometry import GEOSGeometry
 from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection, transaction
 from django.db.models import F, Func, Value
 from django.db.models.expressions import ExpressionWrapper
 from django.db.models.fields import FloatField
@@ -157,3 +158,53 @@ class RegionManager(models.Manager.from_queryset(RegionQuerySet)):
             region.boundary = boundary
             region.save(update_fields=['boundary'])
         return region, created
+
+
+class RegionMembershipManager(models.Manager):
+    def rebuild(self, region_ids=None, monitor_ids=None):
+        """
+        Recomputes membership rows with a single spatial join between
+        monitor positions and current region boundaries, replacing what's
+        stored. Pass region_ids and/or monitor_ids to limit the rebuild to
+        those rows. Returns the number of memberships written.
+        """
+        from camp.apps.monitors.models import Monitor
+        from camp.apps.regions.models import Boundary, Region
+
+        stale = self.all()
+        conditions = ['m.position IS NOT NULL']
+        params = []
+
+        if region_ids is not None:
+            region_ids = list(region_ids)
+            stale = stale.filter(region_id__in=region_ids)
+            conditions.append('r.id = ANY(%s)')
+            params.append(region_ids)
+
+        if monitor_ids is not None:
+            # Compiled through the ORM so SmallUUID primary keys are
+            # prepared the same way any other monitor lookup would be.
+            monitor_ids = list(monitor_ids)
+            stale = stale.filter(monitor_id__in=monitor_ids)
+            subquery, subparams = (Monitor._base_manager
+                .filter(pk__in=monitor_ids)
+                .values('pk')
+                .query.sql_with_params()
+            )
+            conditions.append(f'm.id IN ({subquery})')
+            params.extend(subparams)
+
+        sql = f'''
+            INSERT INTO {self.model._meta.db_table} (region_id, boundary_id, monitor_id)
+            SELECT r.id, b.id, m.id
+            FROM {Region._meta.db_table} r
+            JOIN {Boundary._meta.db_table} b ON b.id = r.boundary_id
+            JOIN {Monitor._meta.db_table} m ON ST_Intersects(m.position, b.geometry)
+            WHERE {' AND '.join(conditions)}
+        '''
+
+        with transaction.atomic():
+            stale.delete()
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                return cursor.rowcount
@@ -0,0 +1,36 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitors', '0036_host_monitor_host'),
+        ('regions', '0005_region_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegionMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('boundary', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='regions.boundary')),
+                ('monitor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='region_memberships', to='monitors.monitor')),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='regions.region')),
+            ],
+            options={
+                'unique_together': {('region', 'monitor')},
+            },
+        ),
+        migrations.RunSQL(
+            sql='''
+                INSERT INTO regions_regionmembership (region_id, boundary_id, monitor_id)
+                SELECT r.id, b.id, m.id
+                FROM regions_region r
+                JOIN regions_boundary b ON b.id = r.boundary_id
+                JOIN monitors_monitor m ON ST_Intersects(m.position, b.geometry)
+                WHERE m.position IS NOT NULL
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
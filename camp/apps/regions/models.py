@@ -5,9 +5,10 @@ from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from django_sqids import SqidsField, shuffle_alphabet
+from model_utils import FieldTracker
 from model_utils.models import TimeStampedModel
 
-from camp.apps.regions.managers import RegionManager
+from camp.apps.regions.managers import RegionManager, RegionMembershipManager
 from camp.apps.regions.querysets import BoundaryQuerySet
 from camp.utils import gis
 from camp.utils.encoders import JSONEncoder
@@ -55,6 +56,7 @@ class Region(TimeStampedModel):
     boundary = models.OneToOneField('Boundary', null=True, blank=True, on_delete=models.SET_NULL, related_name='current_for',)
 
     objects = RegionManager()
+    tracker = FieldTracker(fields=['boundary'])
 
     class Meta:
         indexes = [
@@ -69,21 +71,14 @@ class Region(TimeStampedModel):
     @property
     def monitors(self):
         """
-        Returns a queryset of all monitors located within this region.
-
-        Filters against the boundary geometry via a correlated subquery rather
-        than `self.boundary.geometry`, so the geometry is never deserialized
-        into a Python-side GEOS object here — avoids a per-call native memory
-        cost that adds up fast when this is called once per region across a
-        large batch (e.g. summary backfill, which processes ~1800 regions).
+        Returns a queryset of all monitors located within this region's
+        current boundary, read from RegionMembership -- an indexed join
+        rather than a spatial predicate against the (possibly very large)
+        boundary geometry.
         """
         from camp.apps.monitors.models import Monitor
         if self.boundary_id:
-            return Monitor.objects.filter(
-                position__intersects=models.Subquery(
-                    Boundary.objects.filter(pk=self.boundary_id).values('geometry')[:1]
-                ),
-            )
+            return Monitor.objects.filter(region_memberships__region_id=self.pk)
         return Monitor.objects.none()
 
 
@@ -96,6 +91,7 @@ class Boundary(TimeStampedModel):
     metadata = models.JSONField(blank=True, default=dict, encoder=JSONEncoder)
 
     objects = BoundaryQuerySet.as_manager()
+    tracker = FieldTracker(fields=['geometry'])
 
     class Meta:
         unique_together = ('region', 'version')
@@ -152,8 +148,10 @@ class Boundary(TimeStampedModel):
         """
         Returns a queryset of all monitors located within this boundary.
 
-        Filters via a correlated subquery instead of self.geometry - see
-        Region.monitors above for the same fix and its rationale.
+        Filters via a correlated subquery instead of self.geometry, so the
+        geometry is never deserialized into a Python-side GEOS object here.
+        Unlike Region.monitors this works for any boundary version, not just
+        the current one, so it can't use RegionMembership.
         """
         from camp.apps.monitors.models import Monitor
         return Monitor.objects.filter(
@@ -161,3 +159,28 @@ class Boundary(TimeStampedModel):
                 Boundary.objects.filter(pk=self.pk).values('geometry')[:1]
             ),
         )
+
+
+class RegionMembership(models.Model):
+    """
+    A monitor located inside a region's current boundary, and the boundary
+    version that placed it there. Backs Region.monitors, Monitor.regions and
+    the bulk jobs (e.g. region summaries) that would otherwise run a spatial
+    predicate per region.
+
+    Kept current by the receivers in signals.py, which rebuild only the
+    affected rows when a monitor's position changes or a region gets a new
+    or updated boundary. RegionMembership.objects.rebuild() with no
+    arguments recomputes the whole table.
+    """
+    region = models.ForeignKey('Region', related_name='memberships', on_delete=models.CASCADE)
+    boundary = models.ForeignKey('Boundary', related_name='memberships', on_delete=models.CASCADE)
+    monitor = models.ForeignKey('monitors.Monitor', related_name='region_memberships', on_delete=models.CASCADE)
+
+    objects = RegionMembershipManager()
+
+    class Meta:
+        unique_together = ('region', 'monitor')
+
+    def __str__(self):
+        return f'{self.monitor_id} in {self.region_id}'
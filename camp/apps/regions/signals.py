@@ -0,0 +1,30 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from camp.apps.regions.models import Boundary, Region, RegionMembership
+
+
+# These run on every save, including loaddata's raw saves, so fixtures get
+# their memberships too. Each only touches the rows for the object that
+# changed, so keeping the table current never needs a full rebuild.
+
+def update_monitor_memberships(sender, instance, created, **kwargs):
+    # Connected per monitor class in RegionsConfig.ready(): subclasses
+    # (PurpleAir, BAM1022, ...) send post_save as themselves, not as Monitor.
+    if created or instance.tracker.has_changed('position'):
+        RegionMembership.objects.rebuild(monitor_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Region)
+def update_region_memberships(sender, instance, created, **kwargs):
+    if created or instance.tracker.has_changed('boundary'):
+        RegionMembership.objects.rebuild(region_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Boundary)
+def update_boundary_memberships(sender, instance, **kwargs):
+    # Only matters if this is some region's current boundary (e.g. a
+    # re-import of the same version with corrected geometry).
+    region_ids = list(Region.objects.filter(boundary_id=instance.pk).values_list('pk', flat=True))
+    if region_ids:
+        RegionMembership.objects.rebuild(region_ids=region_ids)
@@ -7,7 +7,7 @@ from django.test import TestCase
 from shapely.geometry import Polygon as ShapelyPolygon
 
 from camp.apps.monitors.purpleair.models import PurpleAir
-from camp.apps.regions.models import Region, Boundary
+from camp.apps.regions.models import Region, RegionMembership, Boundary
 from camp.apps.regions.management.commands.import_mtrs import build_mtrs
 from camp.apps.regions.forecast_zones import (
     MIN_ACCEPTABLE_IOU,
@@ -55,6 +55,58 @@ class RegionTests(TestCase):
         assert kern.pk not in monitor.regions.values_list('pk', flat=True)
         assert monitor.pk not in kern.monitors.values_list('pk', flat=True)
 
+    def test_membership_rebuild(self):
+        monitor = PurpleAir.objects.get(sensor_id=8892)
+        fresno = Region.objects.get(name='Fresno County')
+        kern = Region.objects.get(name='Kern County')
+
+        RegionMembership.objects.rebuild()
+        stored = set(monitor.region_memberships.values_list('region_id', flat=True))
+        assert stored == set(monitor.regions.values_list('pk', flat=True))
+        assert fresno.pk in stored
+        assert kern.pk not in stored
+
+        monitor.position = kern.boundary.geometry.point_on_surface
+        monitor.save()
+        RegionMembership.objects.rebuild(monitor_ids=[monitor.pk])
+        stored = set(monitor.region_memberships.values_list('region_id', flat=True))
+        assert kern.pk in stored
+        assert fresno.pk not in stored
+
+    def test_membership_follows_monitor_position(self):
+        monitor = PurpleAir.objects.get(sensor_id=8892)
+        fresno = Region.objects.get(name='Fresno County')
+        kern = Region.objects.get(name='Kern County')
+
+        # Fixture loads are raw saves, which still populate memberships.
+        assert RegionMembership.objects.filter(monitor=monitor, region=fresno).exists()
+
+        monitor.position = kern.boundary.geometry.point_on_surface
+        monitor.save()
+
+        assert RegionMembership.objects.filter(monitor=monitor, region=kern).exists()
+        assert not RegionMembership.objects.filter(monitor=monitor, region=fresno).exists()
+
+    def test_membership_follows_boundary_import(self):
+        monitor = PurpleAir.objects.get(sensor_id=8892)
+        lon, lat = monitor.position.x, monitor.position.y
+
+        region, _ = Region.objects.import_or_update(
+            name='Around Monitor', slug='around-monitor', type=Region.Type.CUSTOM,
+            external_id='around-monitor', version='1',
+            geometry=Polygon.from_bbox((lon + 1, lat + 1, lon + 2, lat + 2)),
+        )
+        assert not region.memberships.exists()
+
+        region, _ = Region.objects.import_or_update(
+            name='Around Monitor', slug='around-monitor', type=Region.Type.CUSTOM,
+            external_id='around-monitor', version='2',
+            geometry=Polygon.from_bbox((lon - 0.01, lat - 0.01, lon + 0.01, lat + 0.01)),
+        )
+        membership = region.memberships.get()
+        assert membership.monitor_id == monitor.pk
+        assert membership.boundary == region.boundary
+
     def test_intersects_point(self):
         monitor = PurpleAir.objects.get(sensor_id=8892)
         result = Region.objects.intersects(monitor.position)
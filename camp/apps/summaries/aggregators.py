@@ -3,6 +3,8 @@ from datetime import timedelta
 import numpy as np
 from tdigest import TDigest
 
+from camp.apps.summaries import digests
+
 
 # Weight constants for region summary weighting
 FEM_WEIGHT = 3.0
@@ -10,7 +12,10 @@ LCS_WEIGHT = 1.0
 MAX_HEALTH_SCORE = 3
 
 def tdigest_to_dict(digest: TDigest) -> dict:
-    """Serialize a TDigest to a JSON-safe dict."""
+    """
+    Serialize a TDigest to the legacy JSON-safe dict. Summaries now store
+    packed centroids (see digests.py), but TDigestField still accepts this.
+    """
     return {
         'C': [[c.mean, c.count] for c in digest.C.values()],
         'n': digest.n,
@@ -25,15 +30,6 @@ def tdigest_from_dict(data: dict) -> TDigest:
     return d
 
 
-def merge_tdigests(dicts: list) -> TDigest:
-    """Merge a list of serialized TDigest dicts into one TDigest."""
-    merged = TDigest()
-    for d in dicts:
-        for mean, count in d.get('C', []):
-            merged.update(mean, count)
-    return merged
-
-
 def _stage_for_processor(processor):
     """Derive entry stage from processor: blank → RAW, non-blank → CALIBRATED."""
     from camp.apps.entries.stages import Stage
@@ -52,8 +48,7 @@ def compute_stats(values, expected_count):
     mean = float(arr.mean())
     stddev = float(arr.std())
 
-    digest = TDigest()
-    digest.batch_update(arr.tolist())
+    digest = digests.from_values(arr)
 
     return {
         'count': count,
@@ -66,11 +61,149 @@ def compute_stats(values, expected_count):
         'stddev': stddev,
         'p25': float(np.percentile(arr, 25)),
         'p75': float(np.percentile(arr, 75)),
-        'tdigest': tdigest_to_dict(digest),
+        'tdigest': digests.pack(digest),
         'is_complete': count >= 0.8 * expected_count,
     }
 
 
+def compute_grouped_stats(groups, values, expected_counts):
+    """
+    Vectorized compute_stats over many groups at once.
+
+    `groups` is an array of integer group codes (0..n-1) parallel to `values`;
+    `expected_counts` gives the expected count for each group code. Returns a
+    list of stats dicts indexed by group code, with None for empty groups.
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    results = [None] * len(expected_counts)
+
+    if not len(values):
+        return results
+
+    # Sort by group, then by value within each group, so every group is a
+    # contiguous, ordered run that reduceat and the percentiles can work on.
+    order = np.lexsort((values, groups))
+    sorted_groups = groups[order]
+    sorted_values = values[order]
+
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    counts = np.diff(np.r_[starts, len(sorted_values)])
+    codes = sorted_groups[starts]
+
+    sums = np.add.reduceat(sorted_values, starts)
+    sums_of_squares = np.add.reduceat(sorted_values ** 2, starts)
+    means = sums / counts
+    minimums = sorted_values[starts]
+    maximums = sorted_values[starts + counts - 1]
+
+    # Two-pass population stddev, same as ndarray.std()
+    deviations = sorted_values - np.repeat(means, counts)
+    stddevs = np.sqrt(np.add.reduceat(deviations ** 2, starts) / counts)
+
+    def percentile(q):
+        # Linear interpolation between closest ranks, same as np.percentile()
+        position = (counts - 1) * (q / 100)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, counts - 1)
+        fraction = position - lower
+        low = sorted_values[starts + lower]
+        high = sorted_values[starts + upper]
+        return low + (high - low) * fraction
+
+    p25s = percentile(25)
+    p75s = percentile(75)
+
+    for i, code in enumerate(codes):
+        start, count = starts[i], counts[i]
+        expected_count = expected_counts[code]
+
+        digest = digests.from_values(sorted_values[start:start + count])
+
+        results[code] = {
+            'count': int(count),
+            'expected_count': expected_count,
+            'sum_value': float(sums[i]),
+            'sum_of_squares': float(sums_of_squares[i]),
+            'minimum': float(minimums[i]),
+            'maximum': float(maximums[i]),
+            'mean': float(means[i]),
+            'stddev': float(stddevs[i]),
+            'p25': float(p25s[i]),
+            'p75': float(p75s[i]),
+            'tdigest': digests.pack(digest),
+            'is_complete': bool(count >= 0.8 * expected_count),
+        }
+
+    return results
+
+
+def compute_weighted_group_stats(groups, weights, means, second_moments, minimums, maximums, tdigests, group_count):
+    """
+    Vectorized region-summary math over many groups at once.
+
+    Each position across the parallel arrays is one monitor's hourly summary
+    contributing to group `groups[i]` (an integer code in 0..group_count-1)
+    with weight `weights[i]`, so a monitor inside several regions appears
+    once per region. Matches compute_region_summary(): every monitor gets one
+    weighted vote regardless of how many observations it made.
+
+    Returns a list of stats dicts indexed by group code, with None for
+    groups that have no contributions.
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    results = [None] * group_count
+
+    if not len(groups):
+        return results
+
+    order = np.argsort(groups, kind='stable')
+    sorted_groups = groups[order]
+    weights = np.asarray(weights, dtype=np.float64)[order]
+    means = np.asarray(means, dtype=np.float64)[order]
+    second_moments = np.asarray(second_moments, dtype=np.float64)[order]
+    minimums = np.asarray(minimums, dtype=np.float64)[order]
+    maximums = np.asarray(maximums, dtype=np.float64)[order]
+
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    station_counts = np.diff(np.r_[starts, len(sorted_groups)])
+    codes = sorted_groups[starts]
+
+    total_weights = np.add.reduceat(weights, starts)
+    weighted_sums = np.add.reduceat(weights * means, starts)
+    weighted_sums_sq = np.add.reduceat(weights * second_moments, starts)
+    group_minimums = np.minimum.reduceat(minimums, starts)
+    group_maximums = np.maximum.reduceat(maximums, starts)
+
+    for i, code in enumerate(codes):
+        total_weight = float(total_weights[i])
+        if total_weight == 0:
+            continue
+
+        mean = float(weighted_sums[i]) / total_weight
+        variance = max(float(weighted_sums_sq[i]) / total_weight - mean ** 2, 0)
+        start, count = starts[i], station_counts[i]
+        merged = digests.merge(tdigests[j] for j in order[start:start + count])
+
+        results[code] = {
+            'count': int(round(total_weight)),
+            'expected_count': int(round(total_weight)),
+            'weight': total_weight,
+            'sum_value': float(weighted_sums[i]),
+            'sum_of_squares': float(weighted_sums_sq[i]),
+            'minimum': float(group_minimums[i]),
+            'maximum': float(group_maximums[i]),
+            'mean': mean,
+            'stddev': variance ** 0.5,
+            'p25': digests.percentile(merged, 25),
+            'p75': digests.percentile(merged, 75),
+            'tdigest': digests.pack(merged),
+            'station_count': int(count),
+        }
+
+    return results
+
+
 def compute_monitor_summary(monitor, timestamp, EntryModel, processor):
     """
     Compute summary stats for one monitor over one hour from raw entries.
@@ -125,7 +258,7 @@ def rollup_summaries(records):
     variance = max((sum_of_squares / count) - (mean ** 2), 0)
     stddev = variance ** 0.5
 
-    merged = merge_tdigests([r['tdigest'] for r in records])
+    merged = digests.merge(r['tdigest'] for r in records)
 
     return {
         'count': count,
@@ -136,9 +269,9 @@ def rollup_summaries(records):
         'maximum': maximum,
         'mean': mean,
         'stddev': stddev,
-        'p25': merged.percentile(25),
-        'p75': merged.percentile(75),
-        'tdigest': tdigest_to_dict(merged),
+        'p25': digests.percentile(merged, 25),
+        'p75': digests.percentile(merged, 75),
+        'tdigest': digests.pack(merged),
         'is_complete': count >= 0.8 * expected_count,
     }
 
@@ -175,7 +308,7 @@ def rollup_region_stats(records):
     variance = max((sum_of_squares / weight) - (mean ** 2), 0)
     stddev = variance ** 0.5
 
-    merged = merge_tdigests([r['tdigest'] for r in records])
+    merged = digests.merge(r['tdigest'] for r in records)
 
     return {
         'count': count,
@@ -187,9 +320,9 @@ def rollup_region_stats(records):
         'maximum': maximum,
         'mean': mean,
         'stddev': stddev,
-        'p25': merged.percentile(25),
-        'p75': merged.percentile(75),
-        'tdigest': tdigest_to_dict(merged),
+        'p25': digests.percentile(merged, 25),
+        'p75': digests.percentile(merged, 75),
+        'tdigest': digests.pack(merged),
     }
 
 
@@ -309,7 +442,7 @@ def compute_region_summary(region, timestamp, entry_type, monitor_grades=None):
     mean = weighted_sum / total_weight
     variance = max(weighted_sum_sq / total_weight - mean ** 2, 0)
     stddev = variance ** 0.5
-    merged = merge_tdigests(tdigests)
+    merged = digests.merge(tdigests)
 
     return {
         'count': int(round(total_weight)),
@@ -321,8 +454,8 @@ def compute_region_summary(region, timestamp, entry_type, monitor_grades=None):
         'maximum': maximum,
         'mean': mean,
         'stddev': stddev,
-        'p25': merged.percentile(25),
-        'p75': merged.percentile(75),
-        'tdigest': tdigest_to_dict(merged),
+        'p25': digests.percentile(merged, 25),
+        'p75': digests.percentile(merged, 75),
+        'tdigest': digests.pack(merged),
         'station_count': station_count,
     }
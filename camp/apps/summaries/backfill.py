@@ -10,8 +10,13 @@ from camp.utils.datetime import make_aware
 from camp.apps.summaries.models import BaseSummary
 from camp.apps.entries.stages import Stage
 from camp.apps.monitors.models import Monitor
-from camp.apps.regions.models import Region
-from camp.apps.summaries.aggregators import compute_stats, compute_region_summary
+from camp.apps.qaqc.models import HealthCheck
+from camp.apps.regions.models import Region, RegionMembership
+from camp.apps.summaries.aggregators import (
+    compute_grouped_stats,
+    compute_weighted_group_stats,
+    get_monitor_weight,
+)
 from camp.apps.summaries.models import MonitorSummary, RegionSummary
 
 
@@ -109,103 +114,227 @@ def regions_with_monitors():
     return list(
         Region.objects
         .filter(
-            Exists(Monitor.objects.filter(
-                position__isnull=False,
-                position__intersects=OuterRef('boundary__geometry'),
-            )),
+            Exists(RegionMembership.objects.filter(region_id=OuterRef('pk'))),
             boundary__isnull=False,
         )
         .values_list('pk', flat=True)
     )
 
 
-def backfill_monitor_hours(monitor, chunk_start, chunk_end, entry_models):
+MONITOR_SUMMARY_UNIQUE_FIELDS = ['monitor', 'entry_type', 'processor', 'resolution', 'timestamp']
+MONITOR_SUMMARY_UPDATE_FIELDS = [
+    'count', 'expected_count', 'sum_value', 'sum_of_squares',
+    'minimum', 'maximum', 'mean', 'stddev', 'p25', 'p75',
+    'tdigest', 'is_complete',
+]
+
+
+def summarize_monitor_hours(EntryModel, start, end, monitor_ids=None):
     """
-    Compute and upsert hourly MonitorSummary rows for one monitor across
-    [chunk_start, chunk_end). One query per entry model, regardless of how
-    many hours the chunk spans. Returns the number of summaries written.
+    Compute and upsert hourly MonitorSummary rows for every (monitor,
+    processor, hour) with entries of EntryModel in [start, end). Values are
+    streamed in a single query, reduced per group with NumPy, and written
+    with one bulk upsert. Only RAW (processor='') and CALIBRATED entries are
+    summarized. Returns the number of summaries written.
     """
-    to_upsert = []
-    for EntryModel in entry_models:
-        rows = (
-            EntryModel.objects
-            .filter(
-                monitor_id=monitor.pk,
-                timestamp__gte=chunk_start,
-                timestamp__lt=chunk_end,
-            )
-            .filter(Q(stage=Stage.RAW, processor='') | Q(stage=Stage.CALIBRATED))
-            .values_list('timestamp', 'processor', 'value')
+    queryset = (
+        EntryModel.objects
+        .filter(
+            timestamp__gte=start,
+            timestamp__lt=end,
+            value__isnull=False,
         )
+        .filter(Q(stage=Stage.RAW, processor='') | Q(stage=Stage.CALIBRATED))
+    )
+    if monitor_ids is not None:
+        queryset = queryset.filter(monitor_id__in=monitor_ids)
 
-        groups = defaultdict(list)
-        for ts, processor, value in rows:
-            if value is not None:
-                hour = ts.replace(minute=0, second=0, microsecond=0)
-                groups[(hour, processor)].append(float(value))
-
-        for (hour, processor), values in groups.items():
-            stats = compute_stats(values, monitor.expected_hourly_entries or 1)
-            if stats is None:
-                continue
-            to_upsert.append(MonitorSummary(
-                monitor_id=monitor.pk,
+    rows = (queryset
+        .order_by('monitor_id', 'processor', 'timestamp')
+        .values_list('monitor_id', 'processor', 'timestamp', 'value')
+        .iterator(chunk_size=10000)
+    )
+
+    keys = {}
+    groups = []
+    values = []
+    for monitor_id, processor, ts, value in rows:
+        key = (monitor_id, processor, ts.replace(minute=0, second=0, microsecond=0))
+        groups.append(keys.setdefault(key, len(keys)))
+        values.append(float(value))
+
+    if not keys:
+        return 0
+
+    # expected_hourly_entries is a class property, so this needs the subclass instances.
+    monitors = Monitor.objects.in_bulk([monitor_id for monitor_id, _, _ in keys])
+    stats = compute_grouped_stats(groups, values, [
+        monitors[monitor_id].expected_hourly_entries or 1
+        for monitor_id, _, _ in keys
+    ])
+
+    MonitorSummary.objects.bulk_create(
+        [
+            MonitorSummary(
+                monitor_id=monitor_id,
                 timestamp=hour,
                 resolution=BaseSummary.Resolution.HOURLY,
                 entry_type=EntryModel.entry_type,
                 processor=processor,
-                **stats,
-            ))
-
-    if to_upsert:
-        MonitorSummary.objects.bulk_create(
-            to_upsert,
-            update_conflicts=True,
-            unique_fields=['monitor', 'entry_type', 'processor', 'resolution', 'timestamp'],
-            update_fields=[
-                'count', 'expected_count', 'sum_value', 'sum_of_squares',
-                'minimum', 'maximum', 'mean', 'stddev', 'p25', 'p75',
-                'tdigest', 'is_complete',
-            ],
-        )
-    return len(to_upsert)
+                **stats[code],
+            )
+            for (monitor_id, processor, hour), code in keys.items()
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=MONITOR_SUMMARY_UNIQUE_FIELDS,
+        update_fields=MONITOR_SUMMARY_UPDATE_FIELDS,
+    )
+    return len(keys)
 
 
-def backfill_region_hours(region, hours, monitor_grades):
+def backfill_monitor_hours(monitor, chunk_start, chunk_end, entry_models):
     """
-    Compute and upsert hourly RegionSummary rows for one region across the
-    given hours, using precomputed monitor_grades ({monitor_id: grade}) to
-    avoid a geospatial query per hour. Returns the number of summaries written.
+    Compute and upsert hourly MonitorSummary rows for one monitor across
+    [chunk_start, chunk_end). One query per entry model, regardless of how
+    many hours the chunk spans. Returns the number of summaries written.
     """
-    to_upsert = []
-    for hour in hours:
-        entry_types = list(
-            MonitorSummary.objects
-            .filter(timestamp=hour, resolution=BaseSummary.Resolution.HOURLY)
-            .values_list('entry_type', flat=True)
-            .distinct()
+    return sum(
+        summarize_monitor_hours(EntryModel, chunk_start, chunk_end, monitor_ids=[monitor.pk])
+        for EntryModel in entry_models
+    )
+
+
+REGION_SUMMARY_UNIQUE_FIELDS = ['region', 'entry_type', 'resolution', 'timestamp']
+REGION_SUMMARY_UPDATE_FIELDS = [
+    'count', 'weight', 'expected_count', 'sum_value', 'sum_of_squares',
+    'minimum', 'maximum', 'mean', 'stddev', 'p25', 'p75',
+    'tdigest', 'station_count',
+]
+
+
+def summarize_region_hours(start, end, region_ids=None, memberships=None, monitor_grades=None):
+    """
+    Compute and upsert hourly RegionSummary rows for every (region,
+    entry_type, hour) in [start, end), the set-based equivalent of calling
+    compute_region_summary() for each of them.
+
+    Region membership comes from RegionMembership (optionally limited to
+    region_ids), or from `memberships`, a list of (region_id, monitor_id)
+    pairs. MonitorSummary and HealthCheck rows for the whole window are each
+    fetched once, then weighted per region with grouped NumPy reductions.
+    monitor_grades ({monitor_id: grade}) is looked up when not supplied.
+    Returns the number of summaries written.
+    """
+    if memberships is None:
+        queryset = RegionMembership.objects.all()
+        if region_ids is not None:
+            queryset = queryset.filter(region_id__in=region_ids)
+        memberships = list(queryset.values_list('region_id', 'monitor_id'))
+
+    regions_by_monitor = defaultdict(list)
+    for region_id, monitor_id in memberships:
+        regions_by_monitor[monitor_id].append(region_id)
+
+    if not regions_by_monitor:
+        return 0
+
+    monitor_ids = list(regions_by_monitor)
+    if monitor_grades is None:
+        monitor_grades = dict(
+            Monitor.objects.filter(pk__in=monitor_ids).with_grade().values_list('pk', 'grade')
         )
-        for entry_type in entry_types:
-            stats = compute_region_summary(region, hour, entry_type, monitor_grades=monitor_grades)
-            if stats is None:
-                continue
-            to_upsert.append(RegionSummary(
-                region=region,
-                timestamp=hour,
-                resolution=BaseSummary.Resolution.HOURLY,
-                entry_type=entry_type,
-                **stats,
-            ))
-
-    if to_upsert:
-        RegionSummary.objects.bulk_create(
-            to_upsert,
-            update_conflicts=True,
-            unique_fields=['region', 'entry_type', 'resolution', 'timestamp'],
-            update_fields=[
-                'count', 'weight', 'expected_count', 'sum_value', 'sum_of_squares',
-                'minimum', 'maximum', 'mean', 'stddev', 'p25', 'p75',
-                'tdigest', 'station_count',
-            ],
+
+    # For each (monitor, hour, entry_type), prefer CALIBRATED (processor≠'')
+    # over RAW (processor=''), taking the first calibrated processor by name.
+    summaries = (MonitorSummary.objects
+        .filter(
+            monitor_id__in=monitor_ids,
+            resolution=BaseSummary.Resolution.HOURLY,
+            timestamp__gte=start,
+            timestamp__lt=end,
+            count__gt=0,
+        )
+        .order_by('monitor_id', 'timestamp', 'entry_type', 'processor')
+        .values_list(
+            'monitor_id', 'timestamp', 'entry_type', 'processor',
+            'count', 'mean', 'sum_of_squares', 'minimum', 'maximum', 'tdigest',
+        )
+    )
+    best = {}
+    for row in summaries.iterator(chunk_size=10000):
+        key = row[:3]
+        existing = best.get(key)
+        if existing is None or (existing[3] == '' and row[3] != ''):
+            best[key] = row
+
+    if not best:
+        return 0
+
+    health_scores = {
+        (monitor_id, hour): score
+        for monitor_id, hour, score in (HealthCheck.objects
+            .filter(monitor_id__in=monitor_ids, hour__gte=start, hour__lt=end)
+            .values_list('monitor_id', 'hour', 'score')
         )
+    }
+
+    # One contribution per (summary, region containing its monitor)
+    codes = {}
+    groups, weights, means, second_moments, minimums, maximums, tdigests = [], [], [], [], [], [], []
+    for (monitor_id, timestamp, entry_type), row in best.items():
+        count, mean, sum_of_squares, minimum, maximum, tdigest = row[4:]
+        weight = get_monitor_weight(monitor_grades.get(monitor_id), health_scores.get((monitor_id, timestamp)))
+        if weight == 0:
+            continue
+
+        for region_id in regions_by_monitor[monitor_id]:
+            groups.append(codes.setdefault((region_id, entry_type, timestamp), len(codes)))
+            weights.append(weight)
+            means.append(mean)
+            second_moments.append(sum_of_squares / count)
+            minimums.append(minimum)
+            maximums.append(maximum)
+            tdigests.append(tdigest)
+
+    results = compute_weighted_group_stats(
+        groups, weights, means, second_moments, minimums, maximums, tdigests, len(codes),
+    )
+
+    to_upsert = [
+        RegionSummary(
+            region_id=region_id,
+            timestamp=timestamp,
+            resolution=BaseSummary.Resolution.HOURLY,
+            entry_type=entry_type,
+            **stats,
+        )
+        for (region_id, entry_type, timestamp), stats in zip(codes, results)
+        if stats is not None
+    ]
+
+    RegionSummary.objects.bulk_create(
+        to_upsert,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=REGION_SUMMARY_UNIQUE_FIELDS,
+        update_fields=REGION_SUMMARY_UPDATE_FIELDS,
+    )
     return len(to_upsert)
+
+
+def backfill_region_hours(region, start, end, monitor_grades):
+    """
+    Compute and upsert hourly RegionSummary rows for one region across
+    [start, end), using precomputed monitor_grades ({monitor_id: grade}) to
+    avoid a geospatial query. Returns the number of summaries written.
+    """
+    if not monitor_grades:
+        return 0
+
+    return summarize_region_hours(
+        start,
+        end,
+        memberships=[(region.pk, monitor_id) for monitor_id in monitor_grades],
+        monitor_grades=monitor_grades,
+    )
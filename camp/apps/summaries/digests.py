@@ -0,0 +1,100 @@
+"""
+Compact t-digests for summary rollups.
+
+A digest is an (n, 2) float64 array of (mean, count) centroids sorted by
+mean. It is stored as the raw little-endian bytes of that array — 16 bytes
+per centroid — and merged with NumPy rather than by replaying every centroid
+through TDigest.update() in Python.
+
+Compression follows the merging t-digest: centroids are sorted and then
+bucketed on the k1 scale function, so each bucket spans at most one unit of
+k and the tails keep small, accurate centroids while the middle is coarse.
+"""
+
+import numpy as np
+
+
+# Roughly the number of centroids a digest is compressed down to (× 1/2).
+# Matches the tdigest package default of delta=0.01.
+COMPRESSION = 100
+
+DTYPE = np.dtype('<f8')
+
+
+def empty():
+    return np.empty((0, 2), dtype=DTYPE)
+
+
+def as_centroids(value):
+    """
+    Coerce a stored digest into a centroid array. Accepts packed bytes, an
+    existing array or [[mean, count], ...] list, or the legacy JSON dict
+    ({'C': [[mean, count], ...], 'n': n}) that summaries used to store.
+    """
+    if value is None:
+        return empty()
+
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return np.frombuffer(value, dtype=DTYPE).reshape(-1, 2)
+
+    if isinstance(value, dict):
+        value = value.get('C', [])
+
+    centroids = np.asarray(value, dtype=DTYPE)
+    return centroids.reshape(-1, 2) if centroids.size else empty()
+
+
+def pack(value):
+    """Serialize a digest (anything as_centroids accepts) to bytes."""
+    return np.ascontiguousarray(as_centroids(value), dtype=DTYPE).tobytes()
+
+
+def compress(centroids, compression=COMPRESSION):
+    """Sort centroids by mean and merge neighbours that share a k1 bucket."""
+    centroids = as_centroids(centroids)
+    if len(centroids) <= 1:
+        return centroids
+
+    centroids = centroids[np.argsort(centroids[:, 0], kind='stable')]
+    means, counts = centroids[:, 0], centroids[:, 1]
+
+    total = counts.sum()
+    if total <= 0:
+        return empty()
+
+    q = (np.cumsum(counts) - counts / 2) / total
+    k = np.floor(compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1))).astype(np.int64)
+
+    starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+    merged_counts = np.add.reduceat(counts, starts)
+    merged_means = np.add.reduceat(means * counts, starts) / merged_counts
+    return np.column_stack([merged_means, merged_counts])
+
+
+def from_values(values, compression=COMPRESSION):
+    """Build a compressed digest from raw observations."""
+    values = np.asarray(values, dtype=DTYPE).ravel()
+    return compress(np.column_stack([values, np.ones_like(values)]), compression)
+
+
+def merge(digests, compression=COMPRESSION):
+    """Merge any number of stored digests into one compressed digest."""
+    arrays = [as_centroids(d) for d in digests]
+    arrays = [a for a in arrays if len(a)]
+    if not arrays:
+        return empty()
+    return compress(np.concatenate(arrays), compression)
+
+
+def percentile(digest, p):
+    """
+    Estimate the p-th percentile (0–100) by interpolating between centroid
+    means at their cumulative midpoints. Returns None for an empty digest.
+    """
+    centroids = as_centroids(digest)
+    if not len(centroids):
+        return None
+
+    means, counts = centroids[:, 0], centroids[:, 1]
+    midpoints = np.cumsum(counts) - counts / 2
+    return float(np.interp(p / 100 * counts.sum(), midpoints, means))
@@ -0,0 +1,22 @@
+from django.db import models
+
+from camp.apps.summaries import digests
+
+
+class TDigestField(models.BinaryField):
+    description = 'Stores a t-digest as packed float64 (mean, count) centroids.'
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return bytes(value)
+
+    def to_python(self, value):
+        if isinstance(value, (dict, list)):
+            return digests.pack(value)
+        return super().to_python(value)
+
+    def get_prep_value(self, value):
+        if value is not None and not isinstance(value, (bytes, bytearray, memoryview)):
+            value = digests.pack(value)
+        return super().get_prep_value(value)
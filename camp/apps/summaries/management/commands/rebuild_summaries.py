@@ -12,7 +12,8 @@ from django.db.models import Q
 
 from camp.utils.datetime import make_aware
 from camp.apps.entries.stages import Stage
-from camp.apps.summaries.backfill import backfill_monitor_hours, backfill_region_hours
+from camp.apps.regions.models import RegionMembership
+from camp.apps.summaries.backfill import backfill_monitor_hours, summarize_region_hours
 from camp.apps.summaries.models import BaseSummary, MonitorSummary, RegionSummary
 from camp.apps.summaries.tasks import (
     get_summarizable_entry_models,
@@ -124,21 +125,19 @@ class Command(BaseCommand):
             backfill_monitor_hours(monitor, start, end, entry_models)
 
     def _backfill_region_summaries(self, regions, hours):
-        region_monitor_grades = {}
-        for region in regions:
-            if region.boundary:
-                region_monitor_grades[region.pk] = dict(
-                    region.monitors.with_grade().values_list('pk', 'grade')
-                )
+        region_ids = [region.pk for region in regions if region.boundary_id]
+        if not region_ids or not hours:
+            return
+
+        RegionMembership.objects.rebuild(region_ids=region_ids)
 
         self.stdout.write(f'\nComputing hourly region summaries...')
         self.stdout.flush()
 
-        for region in tqdm.tqdm(regions, file=self.stdout, dynamic_ncols=True):
-            monitor_grades = region_monitor_grades.get(region.pk)
-            if not monitor_grades:
-                continue
-            backfill_region_hours(region, hours, monitor_grades)
+        # Every region at once, one day of hours per pass
+        days = [hours[i:i + 24] for i in range(0, len(hours), 24)]
+        for day in tqdm.tqdm(days, file=self.stdout, dynamic_ncols=True):
+            summarize_region_hours(day[0], day[-1] + timedelta(hours=1), region_ids=region_ids)
 
     def _rollup(self, rollup_fn, label, ids, start, end):
         R = BaseSummary.Resolution
@@ -0,0 +1,100 @@
+from django.db import migrations, models
+
+import camp.apps.summaries.fields
+from camp.apps.summaries import digests
+
+
+BATCH_SIZE = 5000
+
+
+def pack_tdigests(apps, schema_editor):
+    for model_name in ['MonitorSummary', 'RegionSummary']:
+        Model = apps.get_model('summaries', model_name)
+        batch = []
+        for pk, tdigest in Model.objects.values_list('pk', 'tdigest').iterator(chunk_size=BATCH_SIZE):
+            batch.append(Model(pk=pk, tdigest_packed=digests.pack(tdigest)))
+            if len(batch) >= BATCH_SIZE:
+                Model.objects.bulk_update(batch, ['tdigest_packed'])
+                batch = []
+        if batch:
+            Model.objects.bulk_update(batch, ['tdigest_packed'])
+
+
+def unpack_tdigests(apps, schema_editor):
+    # Back to the {'C': [[mean, count], ...], 'n': n} JSON that
+    # tdigest_to_dict() produces.
+    for model_name in ['MonitorSummary', 'RegionSummary']:
+        Model = apps.get_model('summaries', model_name)
+        batch = []
+        for pk, packed in Model.objects.values_list('pk', 'tdigest_packed').iterator(chunk_size=BATCH_SIZE):
+            centroids = digests.as_centroids(packed)
+            batch.append(Model(pk=pk, tdigest={
+                'C': centroids.tolist(),
+                'n': float(centroids[:, 1].sum()),
+            }))
+            if len(batch) >= BATCH_SIZE:
+                Model.objects.bulk_update(batch, ['tdigest'])
+                batch = []
+        if batch:
+            Model.objects.bulk_update(batch, ['tdigest'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summaries', '0006_summarybackfilljob_chunk_days'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monitorsummary',
+            name='tdigest_packed',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name='regionsummary',
+            name='tdigest_packed',
+            field=models.BinaryField(null=True),
+        ),
+        # Let the JSON column be re-added empty when migrating backwards,
+        # before unpack_tdigests() fills it in again.
+        migrations.AlterField(
+            model_name='monitorsummary',
+            name='tdigest',
+            field=models.JSONField(null=True, verbose_name='t-digest'),
+        ),
+        migrations.AlterField(
+            model_name='regionsummary',
+            name='tdigest',
+            field=models.JSONField(null=True, verbose_name='t-digest'),
+        ),
+        migrations.RunPython(pack_tdigests, unpack_tdigests),
+        migrations.RemoveField(
+            model_name='monitorsummary',
+            name='tdigest',
+        ),
+        migrations.RemoveField(
+            model_name='regionsummary',
+            name='tdigest',
+        ),
+        migrations.RenameField(
+            model_name='monitorsummary',
+            old_name='tdigest_packed',
+            new_name='tdigest',
+        ),
+        migrations.RenameField(
+            model_name='regionsummary',
+            old_name='tdigest_packed',
+            new_name='tdigest',
+        ),
+        migrations.AlterField(
+            model_name='monitorsummary',
+            name='tdigest',
+            field=camp.apps.summaries.fields.TDigestField(verbose_name='t-digest'),
+        ),
+        migrations.AlterField(
+            model_name='regionsummary',
+            name='tdigest',
+            field=camp.apps.summaries.fields.TDigestField(verbose_name='t-digest'),
+        ),
+    ]
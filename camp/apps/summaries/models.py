@@ -8,6 +8,7 @@ from model_utils.models import TimeStampedModel
 from camp.apps.entries.fields import EntryTypeField
 from camp.apps.monitors.models import Monitor
 from camp.apps.regions.models import Region
+from camp.apps.summaries.fields import TDigestField
 
 
 class BaseSummary(models.Model):
@@ -34,7 +35,7 @@ class BaseSummary(models.Model):
     expected_count = models.PositiveIntegerField(_('expected count'))
     sum_value = models.FloatField(_('sum'))
     sum_of_squares = models.FloatField(_('sum of squares'))
-    tdigest = models.JSONField(_('t-digest'))
+    tdigest = TDigestField(_('t-digest'))
 
     # Readable stats
     minimum = models.FloatField(_('minimum'))
@@ -4,7 +4,7 @@ from itertools import groupby
 
 from django.conf import settings
 from django.db import transaction
-from django.db.models import Exists, F, OuterRef, Q
+from django.db.models import F, Q
 from django.utils import timezone
 
 from camp.utils.datetime import localtime, make_aware
@@ -13,21 +13,19 @@ from django_huey import db_task, db_periodic_task
 from huey import crontab
 
 from camp.apps.entries.fields import EntryTypeField
-from camp.apps.entries.stages import Stage
 from camp.apps.entries.utils import get_all_entry_models
 from camp.apps.monitors.models import Monitor
 from camp.apps.regions.models import Region
 from camp.apps.summaries.aggregators import compute_monitor_summary, compute_region_summary, rollup_summaries, rollup_region_stats
 from camp.apps.summaries.backfill import (
     backfill_monitor_hours,
-    backfill_region_hours,
     chunk_start_for,
     daily_rollup_window,
     higher_rollup_windows,
-    hour_range,
     iter_chunk_days,
     monitors_with_data_in,
-    regions_with_monitors,
+    summarize_monitor_hours,
+    summarize_region_hours,
 )
 from camp.apps.summaries.models import BaseSummary, MonitorSummary, RegionSummary, SummaryBackfillJob
 
@@ -51,27 +49,16 @@ def hourly_monitor_summaries(hour=None):
     Compute hourly MonitorSummary for every (monitor, entry_type, processor) combo
     that has entries in the previous hour. Only RAW (processor='') and CALIBRATED
     (processor≠'') entries are summarized — CORRECTED and CLEANED are skipped.
+
+    Each entry model is summarized in a single grouped query and written with
+    one bulk upsert (see summarize_monitor_hours).
     """
     if hour is None:
         now = timezone.now().replace(minute=0, second=0, microsecond=0)
         hour = now - timedelta(hours=1)
 
     for EntryModel in get_summarizable_entry_models():
-        combos = (
-            EntryModel.objects
-            .filter(
-                timestamp__gte=hour,
-                timestamp__lt=hour + timedelta(hours=1),
-            )
-            .filter(
-                Q(stage=Stage.RAW, processor='') |
-                Q(stage=Stage.CALIBRATED)
-            )
-            .values_list('monitor_id', 'processor')
-            .distinct()
-        )
-        for monitor_id, processor in combos:
-            summarize_monitor_hour(str(monitor_id), hour, EntryModel.entry_type, processor)
+        summarize_monitor_hours(EntryModel, hour, hour + timedelta(hours=1))
 
 
 @db_task(priority=100, queue='summaries')
@@ -99,30 +86,14 @@ def hourly_region_summaries(hour=None):
     """
     Compute one hourly RegionSummary per region per entry_type found in
     MonitorSummary records for that hour. Uses each monitor's best available
-    calibration — no processor fan-out needed at the region level.
+    calibration — no processor fan-out needed at the region level. Every
+    region is summarized at once from the RegionMembership table.
     """
     if hour is None:
         now = timezone.now().replace(minute=0, second=0, microsecond=0)
         hour = now - timedelta(hours=1)
 
-    entry_models = get_summarizable_entry_models()
-
-    region_ids = (Region.objects
-        .filter(
-            Exists(
-                Monitor.objects.filter(
-                    position__isnull=False,
-                    position__intersects=OuterRef('boundary__geometry'),
-                )
-            ),
-            boundary__isnull=False
-        )
-        .values_list('pk', flat=True)
-    )
-
-    for region_id in region_ids:
-        for EntryModel in entry_models:
-            summarize_region_hour(str(region_id), hour, EntryModel.entry_type)
+    summarize_region_hours(hour, hour + timedelta(hours=1))
 
 
 @db_task(priority=90, queue='summaries')
@@ -386,12 +357,9 @@ def backfill_monitor_chunk(job_id, monitor_id, chunk_start, chunk_end, batch_id)
 
 
 @db_task(priority=1, queue='summaries')
-def backfill_region_chunk(job_id, region_id, chunk_start, chunk_end, batch_id):
-    """Compute one region's hourly summaries for a backfill chunk, then report completion."""
-    region = Region.objects.select_related('boundary').get(pk=region_id)
-    monitor_grades = dict(region.monitors.with_grade().values_list('pk', 'grade'))
-    hours = list(hour_range(chunk_start, chunk_end))
-    backfill_region_hours(region, hours, monitor_grades)
+def backfill_region_chunk(job_id, chunk_start, chunk_end, batch_id):
+    """Compute every region's hourly summaries for a backfill chunk, then report completion."""
+    summarize_region_hours(chunk_start, chunk_end)
 
     SummaryBackfillJob.objects.filter(
         pk=job_id, batch_id=batch_id, phase=SummaryBackfillJob.Phase.REGIONS,
@@ -469,10 +437,10 @@ def _backfill_dispatch_monitors(job):
 
 
 def _backfill_dispatch_regions(job):
-    region_ids = regions_with_monitors()
-
+    # One task covers every region: summarize_region_hours() reads the
+    # chunk's MonitorSummary and HealthCheck rows once for all of them.
     job.batch_id += 1
-    job.pending_tasks = len(region_ids)
+    job.pending_tasks = 1
     job.phase = SummaryBackfillJob.Phase.REGIONS
     job.phase_started_at = timezone.now()
     job.save()
@@ -481,10 +449,9 @@ def _backfill_dispatch_regions(job):
     batch_id = job.batch_id
     chunk_start = job.chunk_start
     chunk_end = job.cursor
-    for region_id in region_ids:
-        transaction.on_commit(
-            lambda r=region_id: backfill_region_chunk(job_id, str(r), chunk_start, chunk_end, batch_id)
-        )
+    transaction.on_commit(
+        lambda: backfill_region_chunk(job_id, chunk_start, chunk_end, batch_id)
+    )
 
 
 def _backfill_complete_chunk(job):
@@ -237,14 +237,14 @@ class BackfillRegionHoursTests(TestCase):
 
     def test_creates_region_summary_from_monitor_summary(self):
         monitor_grades = {self.monitor.pk: Monitor.Grade.LCS}
-        count = backfill_region_hours(self.region, [self.hour], monitor_grades)
+        count = backfill_region_hours(self.region, self.hour, self.hour + timedelta(hours=1), monitor_grades)
         assert count == 1
         assert RegionSummary.objects.filter(region=self.region, timestamp=self.hour).exists()
 
     def test_skips_hours_with_no_monitor_summaries(self):
         monitor_grades = {self.monitor.pk: Monitor.Grade.LCS}
         other_hour = self.hour - timedelta(hours=5)
-        count = backfill_region_hours(self.region, [other_hour], monitor_grades)
+        count = backfill_region_hours(self.region, other_hour, other_hour + timedelta(hours=1), monitor_grades)
         assert count == 0
 
 
@@ -393,7 +393,7 @@ class BackfillRegionChunkTaskTests(TestCase):
         )
 
     def test_creates_region_summary_and_decrements_pending_tasks(self):
-        backfill_region_chunk(self.job.pk, str(self.region.pk), self.hour, self.hour + timedelta(hours=1), 1)
+        backfill_region_chunk(self.job.pk, self.hour, self.hour + timedelta(hours=1), 1)
         assert RegionSummary.objects.filter(region=self.region).exists()
         self.job.refresh_from_db()
         assert self.job.pending_tasks == 0
@@ -24,13 +24,16 @@ from camp.apps.monitors.bam.models import BAM1022
 from camp.apps.monitors.models import Monitor
 from camp.apps.monitors.purpleair.models import PurpleAir
 from camp.apps.qaqc.models import HealthCheck
-from camp.apps.regions.models import Region
+from camp.apps.regions.models import Region, RegionMembership
+from camp.apps.summaries import digests
 from camp.apps.summaries.aggregators import (
     FEM_WEIGHT,
     LCS_WEIGHT,
+    compute_grouped_stats,
     compute_monitor_summary,
     compute_region_summary,
     compute_stats,
+    compute_weighted_group_stats,
     get_monitor_weight,
     rollup_region_stats,
     rollup_summaries,
@@ -86,7 +89,7 @@ class ComputeMonitorSummaryTests(TestCase):
         assert result['maximum'] == pytest.approx(50.0)
         assert result['sum_value'] == pytest.approx(150.0)
         assert 'tdigest' in result
-        assert isinstance(result['tdigest'], dict)
+        assert isinstance(result['tdigest'], bytes)
 
     def test_is_complete_true_when_sufficient_coverage(self):
         # PurpleAir expects 30 readings/hour (2-min interval).
@@ -130,7 +133,7 @@ class ComputeStatsTests(TestCase):
         assert result['sum_value'] == pytest.approx(150.0)
         assert result['expected_count'] == 10
         assert 'tdigest' in result
-        assert isinstance(result['tdigest'], dict)
+        assert isinstance(result['tdigest'], bytes)
 
     def test_is_complete_at_threshold(self):
         # 8 out of 10 = 80%, exactly at threshold
@@ -143,6 +146,63 @@ class ComputeStatsTests(TestCase):
         assert not result['is_complete']
 
 
+class ComputeGroupedStatsTests(TestCase):
+    def test_matches_compute_stats_per_group(self):
+        rng = np.random.default_rng(42)
+        groups = rng.integers(0, 4, 200)
+        values = rng.normal(20, 5, 200).round(2)
+
+        results = compute_grouped_stats(groups, values, [30, 30, 60, 60])
+        for code in range(4):
+            expected = compute_stats(values[groups == code].tolist(), [30, 30, 60, 60][code])
+            for key, value in expected.items():
+                if isinstance(value, float):
+                    assert results[code][key] == pytest.approx(value), key
+                else:
+                    assert results[code][key] == value, key
+
+    def test_empty_groups_are_none(self):
+        results = compute_grouped_stats([0, 0, 2], [1.0, 2.0, 3.0], [10, 10, 10])
+        assert results[0]['count'] == 2
+        assert results[1] is None
+        assert results[2]['count'] == 1
+
+    def test_no_values(self):
+        assert compute_grouped_stats([], [], [10]) == [None]
+
+
+class DigestTests(TestCase):
+    def test_pack_round_trip(self):
+        centroids = digests.from_values([1.0, 2.0, 2.0, 5.0])
+        unpacked = digests.as_centroids(digests.pack(centroids))
+        assert unpacked.tolist() == [[1.0, 1.0], [2.0, 2.0], [5.0, 1.0]]
+
+    def test_reads_legacy_json_digest(self):
+        centroids = digests.as_centroids({'C': [[20.0, 10], [30.0, 5]], 'n': 15})
+        assert centroids.tolist() == [[20.0, 10.0], [30.0, 5.0]]
+
+    def test_merge_compresses_and_preserves_count(self):
+        rng = np.random.default_rng(7)
+        parts = [digests.pack(digests.from_values(rng.normal(20, 5, 500))) for _ in range(20)]
+        merged = digests.merge(parts)
+        assert merged[:, 1].sum() == 10000
+        assert len(merged) <= digests.COMPRESSION
+
+    def test_percentile_matches_numpy(self):
+        rng = np.random.default_rng(7)
+        values = rng.normal(20, 5, 5000)
+        merged = digests.merge(digests.from_values(chunk) for chunk in np.split(values, 50))
+        assert digests.percentile(merged, 25) == pytest.approx(np.percentile(values, 25), abs=0.1)
+        assert digests.percentile(merged, 75) == pytest.approx(np.percentile(values, 75), abs=0.1)
+
+    def test_percentile_of_empty_digest(self):
+        assert digests.percentile(b'', 50) is None
+
+    def test_field_packs_legacy_dicts(self):
+        field = MonitorSummary._meta.get_field('tdigest')
+        assert field.get_prep_value({'C': [[20.0, 10]], 'n': 10}) == digests.pack([[20.0, 10.0]])
+
+
 class RollupSummariesTests(TestCase):
     fixtures = ['purple-air.yaml']
 
@@ -316,6 +376,39 @@ class GetMonitorWeightTests(TestCase):
         assert get_monitor_weight(Monitor.Grade.FRM) == FEM_WEIGHT
 
 
+class ComputeWeightedGroupStatsTests(TestCase):
+    def test_weights_each_contribution(self):
+        a = digests.pack(digests.from_values([10.0] * 5))
+        b = digests.pack(digests.from_values([30.0] * 5))
+
+        results = compute_weighted_group_stats(
+            groups=[1, 0, 1],
+            weights=[LCS_WEIGHT, LCS_WEIGHT, FEM_WEIGHT],
+            means=[10.0, 10.0, 30.0],
+            second_moments=[100.0, 100.0, 900.0],
+            minimums=[10.0, 10.0, 30.0],
+            maximums=[10.0, 10.0, 30.0],
+            tdigests=[a, a, b],
+            group_count=3,
+        )
+
+        assert results[2] is None
+        assert results[0]['station_count'] == 1
+        assert results[0]['mean'] == pytest.approx(10.0)
+        assert results[0]['stddev'] == pytest.approx(0.0)
+
+        expected = (LCS_WEIGHT * 10.0 + FEM_WEIGHT * 30.0) / (LCS_WEIGHT + FEM_WEIGHT)
+        assert results[1]['station_count'] == 2
+        assert results[1]['weight'] == pytest.approx(LCS_WEIGHT + FEM_WEIGHT)
+        assert results[1]['mean'] == pytest.approx(expected)
+        assert results[1]['minimum'] == 10.0
+        assert results[1]['maximum'] == 30.0
+        assert isinstance(results[1]['tdigest'], bytes)
+
+    def test_empty_input(self):
+        assert compute_weighted_group_stats([], [], [], [], [], [], [], 2) == [None, None]
+
+
 class WithGradeTests(TestCase):
     fixtures = ['purple-air.yaml', 'bam1022.yaml']
 
@@ -859,7 +952,7 @@ class RebuildSummariesCommandTests(TestCase):
 # ---- Periodic task tests ----
 
 class HourlyMonitorSummariesTaskTests(TestCase):
-    fixtures = ['purple-air.yaml']
+    fixtures = ['purple-air.yaml', 'bam1022.yaml']
 
     def setUp(self):
         self.monitor = PurpleAir.objects.first()
@@ -899,6 +992,47 @@ class HourlyMonitorSummariesTaskTests(TestCase):
         hourly_monitor_summaries(hour=self.expected_hour)
         assert MonitorSummary.objects.count() == 0
 
+    def test_summarizes_each_monitor_and_processor(self):
+        other = BAM1022.objects.first()
+        for value in (10.0, 20.0):
+            self._make_entry(value=value, offset_minutes=int(value))
+        PM25.objects.create(
+            monitor=self.monitor,
+            timestamp=self.expected_hour + timedelta(minutes=5),
+            stage=PM25.Stage.CALIBRATED,
+            processor='custom_calibration',
+            value=12.0,
+            location=self.monitor.location,
+        )
+        PM25.objects.create(
+            monitor=other,
+            timestamp=self.expected_hour + timedelta(minutes=5),
+            stage=PM25.Stage.RAW,
+            processor='',
+            value=30.0,
+            location=other.location,
+        )
+
+        hourly_monitor_summaries(hour=self.expected_hour)
+
+        summaries = MonitorSummary.objects.filter(timestamp=self.expected_hour)
+        assert summaries.count() == 3
+        raw = summaries.get(monitor=self.monitor, processor='')
+        assert raw.count == 2
+        assert raw.mean == pytest.approx(15.0)
+        assert summaries.get(monitor=self.monitor, processor='custom_calibration').mean == pytest.approx(12.0)
+        assert summaries.get(monitor=other, processor='').expected_count == (other.expected_hourly_entries or 1)
+
+    def test_rerun_updates_existing_summaries(self):
+        self._make_entry(value=10.0)
+        hourly_monitor_summaries(hour=self.expected_hour)
+        self._make_entry(value=30.0, offset_minutes=10)
+        hourly_monitor_summaries(hour=self.expected_hour)
+
+        summary = MonitorSummary.objects.get(monitor=self.monitor, timestamp=self.expected_hour)
+        assert summary.count == 2
+        assert summary.mean == pytest.approx(20.0)
+
 
 class HourlyRegionSummariesTaskTests(TestCase):
     fixtures = ['purple-air.yaml', 'regions.yaml']
@@ -959,6 +1093,23 @@ class HourlyRegionSummariesTaskTests(TestCase):
         hourly_region_summaries(hour=self.hour)
         assert RegionSummary.objects.count() == 0
 
+    def test_matches_compute_region_summary_for_every_region(self):
+        self._make_monitor_summary()
+        HealthCheck.objects.create(monitor=self.monitor, hour=self.hour, score=2)
+        hourly_region_summaries(hour=self.hour)
+
+        region_ids = set(RegionMembership.objects.filter(monitor=self.monitor).values_list('region_id', flat=True))
+        assert self.region.pk in region_ids
+
+        summaries = RegionSummary.objects.filter(timestamp=self.hour, entry_type='pm25')
+        assert set(summaries.values_list('region_id', flat=True)) == region_ids
+        for summary in summaries.select_related('region__boundary'):
+            expected = compute_region_summary(summary.region, self.hour, 'pm25')
+            assert summary.station_count == expected['station_count']
+            assert summary.weight == pytest.approx(expected['weight'])
+            assert summary.mean == pytest.approx(expected['mean'])
+            assert summary.stddev == pytest.approx(expected['stddev'], abs=1e-9)
+
 
 class DailyMonitorSummariesTaskTests(TestCase):
     fixtures = ['purple-air.yaml']
@@ -5,3 +5,7 @@ class TempoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'camp.apps.tempo'
     verbose_name = 'TEMPO'
+
+    def ready(self):
+        # Recomputes ZonalStats when a region's boundary changes.
+        from . import signals  # noqa: F401
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import make_aware
+
+from camp.apps.regions.models import Region
+from camp.apps.tempo.models import Granule
+from camp.apps.tempo.queries import compute_zonal_stats
+from camp.apps.tempo.tasks import ZONAL_STATS_REGION_TYPES
+
+
+class Command(BaseCommand):
+    help = (
+        'Computes stored TEMPO zonal stats for every region of the given '
+        'type(s) over a date range, one day of granules per statement. '
+        'Safe to re-run: existing rows are overwritten.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, type=lambda s: datetime.strptime(s, '%Y-%m-%d').date())
+        parser.add_argument('--end', required=True, type=lambda s: datetime.strptime(s, '%Y-%m-%d').date())
+        parser.add_argument(
+            '--type', dest='region_types', action='append', choices=Region.Type.values,
+            help='Region type to summarize; may be repeated. Defaults to ZONAL_STATS_REGION_TYPES.',
+        )
+        parser.add_argument(
+            '--product', choices=[choice[0] for choice in Granule.Product.choices],
+            help='Limit to a single product. Defaults to all products.',
+        )
+
+    def handle(self, *args, **options):
+        regions = Region.objects.filter(type__in=options['region_types'] or ZONAL_STATS_REGION_TYPES)
+        granules = Granule.objects.all()
+        if options['product']:
+            granules = granules.filter(product=options['product'])
+
+        day = options['start']
+        while day <= options['end']:
+            day_start = make_aware(datetime.combine(day, datetime.min.time()))
+            count = compute_zonal_stats(
+                granules.filter(timestamp__gte=day_start, timestamp__lt=day_start + timedelta(days=1)),
+                regions,
+            )
+            self.stdout.write(f'{day}: {count} zonal stat(s)')
+            day += timedelta(days=1)
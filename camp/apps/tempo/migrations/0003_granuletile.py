@@ -0,0 +1,35 @@
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tempo', '0002_alter_granule_preview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GranuleTile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('raster', django.contrib.gis.db.models.fields.RasterField(srid=4326, verbose_name='raster')),
+                ('granule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tiles', to='tempo.granule')),
+            ],
+        ),
+        # Tile every granule that's already stored; new ones are tiled in
+        # Granule.save(). 64 matches raster.TILE_SIZE at the time of writing.
+        migrations.RunSQL(
+            sql='''
+                INSERT INTO tempo_granuletile (granule_id, raster)
+                SELECT id, tile
+                FROM (
+                    SELECT id, ST_Tile(raster, 64, 64) AS tile
+                    FROM tempo_granule
+                ) sub
+                WHERE NOT ST_BandIsNoData(tile, 1, TRUE)
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,31 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('regions', '0005_region_metadata'),
+        ('tempo', '0003_granuletile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ZonalStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(null=True, verbose_name='count')),
+                ('sum', models.FloatField(null=True, verbose_name='sum')),
+                ('mean', models.FloatField(null=True, verbose_name='mean')),
+                ('stddev', models.FloatField(null=True, verbose_name='stddev')),
+                ('min', models.FloatField(null=True, verbose_name='min')),
+                ('max', models.FloatField(null=True, verbose_name='max')),
+                ('granule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='zonal_stats', to='tempo.granule')),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tempo_stats', to='regions.region')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['region', 'granule'], name='tempo_zonal_region__0ab15c_idx')],
+                'unique_together': {('granule', 'region')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('regions', '0005_region_metadata'),
+        ('tempo', '0004_zonalstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='zonalstats',
+            name='boundary',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='regions.boundary'),
+        ),
+        # Existing rows were computed against each region's current boundary.
+        migrations.RunSQL(
+            sql='''
+                UPDATE tempo_zonalstats z
+                SET boundary_id = r.boundary_id
+                FROM regions_region r
+                WHERE r.id = z.region_id
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -1,9 +1,11 @@
 from django.contrib.gis.db import models as gis_models
-from django.db import models
+from django.db import connection, models
 from django.utils.translation import gettext_lazy as _
 
 from django_sqids import SqidsField, shuffle_alphabet
 
+from .raster import TILE_SIZE
+
 
 def granule_preview_upload_to(instance, filename):
     # Partitioned by year/month, matching archive_data_path's precedent --
@@ -50,3 +52,70 @@ class Granule(models.Model):
 
     def __str__(self):
         return f'{self.get_product_display()} @ {self.timestamp:%Y-%m-%d %H:%M}'
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'raster' in update_fields:
+            self.update_tiles()
+
+    def update_tiles(self):
+        """
+        Re-splits this granule's stored raster into GranuleTile rows. The
+        tiling runs in PostGIS (ST_Tile), so the full grid never has to be
+        read back into Python, and tiles that are entirely nodata are
+        skipped -- they can't contribute to a point value or zonal stat.
+        """
+        self.tiles.all().delete()
+        with connection.cursor() as cursor:
+            cursor.execute(f'''
+                INSERT INTO {GranuleTile._meta.db_table} (granule_id, raster)
+                SELECT id, tile
+                FROM (
+                    SELECT id, ST_Tile(raster, %(size)s, %(size)s) AS tile
+                    FROM {Granule._meta.db_table}
+                    WHERE id = %(id)s
+                ) sub
+                WHERE NOT ST_BandIsNoData(tile, 1, TRUE)
+            ''', {'id': self.pk, 'size': TILE_SIZE})
+
+
+class GranuleTile(models.Model):
+    """
+    A TILE_SIZE x TILE_SIZE piece of a Granule's raster. The raster column
+    carries a spatial index, so point and region queries (see queries.py)
+    only read the tiles that actually intersect the geometry instead of
+    detoasting the whole grid for every hour.
+    """
+
+    granule = models.ForeignKey(Granule, on_delete=models.CASCADE, related_name='tiles')
+    raster = gis_models.RasterField(_('raster'), srid=4326)
+
+
+class ZonalStats(models.Model):
+    """
+    Precomputed summary stats for one Granule clipped to one Region's
+    boundary -- the stored form of queries.region_series(), filled in bulk
+    by queries.compute_zonal_stats(). `boundary` records which boundary the
+    stats were clipped to, so rows left over from a previous boundary are
+    never served. All-None stat fields mean the boundary covered no valid
+    pixels that hour.
+    """
+
+    granule = models.ForeignKey(Granule, on_delete=models.CASCADE, related_name='zonal_stats')
+    region = models.ForeignKey('regions.Region', on_delete=models.CASCADE, related_name='tempo_stats')
+    boundary = models.ForeignKey('regions.Boundary', null=True, on_delete=models.CASCADE, related_name='+')
+
+    count = models.IntegerField(_('count'), null=True)
+    sum = models.FloatField(_('sum'), null=True)
+    mean = models.FloatField(_('mean'), null=True)
+    stddev = models.FloatField(_('stddev'), null=True)
+    min = models.FloatField(_('min'), null=True)
+    max = models.FloatField(_('max'), null=True)
+
+    class Meta:
+        unique_together = ('granule', 'region')
+        indexes = [
+            models.Index(fields=['region', 'granule']),
+        ]
@@ -3,9 +3,21 @@ from datetime import datetime
 from django.contrib.gis.db.models.functions import GeoFunc
 from django.contrib.gis.geos import MultiPolygon, Point, Polygon
 from django.db import connection
-from django.db.models import F, FloatField
+from django.db.models import F, FloatField, OuterRef, Subquery
 
-from .models import Granule
+from camp.apps.regions.models import Boundary, Region
+
+from .models import Granule, GranuleTile, ZonalStats
+
+STAT_FIELDS = ['count', 'sum', 'mean', 'stddev', 'min', 'max']
+
+# Region types whose ZonalStats are kept up to date as granules arrive.
+# Forecast zones are imported as CUSTOM regions (see import_forecast_zones).
+ZONAL_STATS_REGION_TYPES = [
+    Region.Type.COUNTY,
+    Region.Type.TRACT,
+    Region.Type.CUSTOM,
+]
 
 
 class STValue(GeoFunc):
@@ -32,11 +44,20 @@ def point_series(product: str, point: Point, start: datetime, end: datetime) ->
     (inclusive), ordered by timestamp. `value` is the raster pixel value
     at `point` -- None means that pixel is masked/nodata, not that the
     hour is missing (a missing hour has no entry in the list at all).
+
+    The value is read from the one GranuleTile covering `point`, found via
+    the tiles' spatial index, rather than from the granule's full raster.
     """
+    tile_value = (GranuleTile.objects
+        .filter(granule=OuterRef('pk'), raster__intersects=point)
+        .annotate(value=STValue(F('raster'), 1, point))
+        .order_by('pk')
+        .values('value')[:1]
+    )
     return list(
         Granule.objects
         .filter(product=product, timestamp__gte=start, timestamp__lte=end)
-        .annotate(value=STValue(F('raster'), 1, point))
+        .annotate(value=Subquery(tile_value, output_field=FloatField()))
         .order_by('timestamp')
         .values('timestamp', 'is_final', 'version', 'value')
     )
@@ -57,6 +78,9 @@ def region_series(product: str, polygon: Polygon | MultiPolygon, start: datetime
     inside the boundary. All-None stat fields (not a missing row) mean the
     polygon produced zero valid pixels for that hour -- distinct from the
     hour being absent from the list entirely.
+
+    Only the GranuleTiles intersecting `polygon` are clipped; their stats
+    are combined with ST_SummaryStatsAgg.
     """
     sql = f'''
         SELECT
@@ -71,14 +95,21 @@ def region_series(product: str, polygon: Polygon | MultiPolygon, start: datetime
             (stats).max
         FROM (
             SELECT
-                timestamp,
-                is_final,
-                version,
-                ST_SummaryStats(ST_Clip(raster, ST_GeomFromText(%(polygon_wkt)s, 4326))) AS stats
-            FROM {Granule._meta.db_table}
-            WHERE product = %(product)s
-              AND timestamp >= %(start)s
-              AND timestamp <= %(end)s
+                g.timestamp,
+                g.is_final,
+                g.version,
+                tiles.stats
+            FROM {Granule._meta.db_table} g
+            LEFT JOIN LATERAL (
+                SELECT ST_SummaryStatsAgg(ST_Clip(t.raster, area.geom), 1, TRUE) AS stats
+                FROM {GranuleTile._meta.db_table} t
+                CROSS JOIN (SELECT ST_GeomFromText(%(polygon_wkt)s, 4326) AS geom) area
+                WHERE t.granule_id = g.id
+                  AND ST_Intersects(t.raster, area.geom)
+            ) tiles ON TRUE
+            WHERE g.product = %(product)s
+              AND g.timestamp >= %(start)s
+              AND g.timestamp <= %(end)s
         ) sub
         ORDER BY timestamp
     '''
@@ -105,3 +136,87 @@ def zonal_stats(product: str, timestamp: datetime, polygon: Polygon | MultiPolyg
     row.pop('is_final', None)
     row.pop('version', None)
     return row
+
+
+def compute_zonal_stats(granules, regions) -> int:
+    """
+    Computes and stores ZonalStats for every (granule, region) pair in the
+    two querysets in a single statement, replacing any existing rows.
+
+    Tiles and boundaries are matched with one spatial join and aggregated
+    per pair, so each tile is read once no matter how many regions it
+    touches, and no geometry round-trips through Python. Pairs with no
+    intersecting tiles still get a row, with all-None stats. Returns the
+    number of rows written.
+    """
+    granule_ids = list(granules.values_list('pk', flat=True))
+    region_ids = list(regions.filter(boundary__isnull=False).values_list('pk', flat=True))
+    if not granule_ids or not region_ids:
+        return 0
+
+    columns = ', '.join(STAT_FIELDS)
+    stats = ', '.join(f'(s.stats).{field}' for field in STAT_FIELDS)
+    updates = ', '.join(f'{field} = EXCLUDED.{field}' for field in STAT_FIELDS)
+
+    sql = f'''
+        WITH areas AS (
+            SELECT r.id AS region_id, r.boundary_id, b.geometry
+            FROM {Region._meta.db_table} r
+            JOIN {Boundary._meta.db_table} b ON b.id = r.boundary_id
+            WHERE r.id = ANY(%(region_ids)s)
+        ),
+        tile_stats AS (
+            SELECT
+                t.granule_id,
+                a.region_id,
+                ST_SummaryStatsAgg(ST_Clip(t.raster, a.geometry), 1, TRUE) AS stats
+            FROM {GranuleTile._meta.db_table} t
+            JOIN areas a ON ST_Intersects(t.raster, a.geometry)
+            WHERE t.granule_id = ANY(%(granule_ids)s)
+            GROUP BY t.granule_id, a.region_id
+        )
+        INSERT INTO {ZonalStats._meta.db_table} (granule_id, region_id, boundary_id, {columns})
+        SELECT g.id, a.region_id, a.boundary_id, {stats}
+        FROM {Granule._meta.db_table} g
+        CROSS JOIN areas a
+        LEFT JOIN tile_stats s ON s.granule_id = g.id AND s.region_id = a.region_id
+        WHERE g.id = ANY(%(granule_ids)s)
+        ON CONFLICT (granule_id, region_id) DO UPDATE SET boundary_id = EXCLUDED.boundary_id, {updates}
+    '''
+    params = {
+        'granule_ids': granule_ids,
+        'region_ids': region_ids,
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def stored_region_series(product: str, region: Region, start: datetime, end: datetime) -> list[dict]:
+    """
+    Same rows as region_series() for `region`'s current boundary, read
+    from ZonalStats when every granule in the range has been summarized
+    against that boundary. Region types that aren't precomputed, and
+    ranges with gaps (e.g. just after a boundary change, before the
+    recompute lands), fall back to region_series(). Nothing is written.
+    """
+    if region.boundary_id is None:
+        return []
+
+    if region.type in ZONAL_STATS_REGION_TYPES:
+        granules = Granule.objects.filter(product=product, timestamp__gte=start, timestamp__lte=end)
+        stored = (ZonalStats.objects
+            .filter(region=region, boundary_id=region.boundary_id, granule__in=granules)
+            .order_by('granule__timestamp')
+            .values(
+                *STAT_FIELDS,
+                timestamp=F('granule__timestamp'),
+                is_final=F('granule__is_final'),
+                version=F('granule__version'),
+            )
+        )
+        stored = list(stored)
+        if len(stored) == granules.count():
+            return stored
+
+    return region_series(product, region.boundary.geometry, start, end)
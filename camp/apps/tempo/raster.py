@@ -5,6 +5,10 @@ from django.contrib.gis.gdal import GDALRaster
 NODATA_VALUE = -9999.0
 GDT_FLOAT64 = 7  # GDAL pixel type constant; Django's dict-based GDALRaster has no named export
 
+# Edge length, in pixels, of the tiles each granule's raster is split into
+# for storage in GranuleTile (see Granule.update_tiles()).
+TILE_SIZE = 64
+
 
 def build_raster(
     array: np.ndarray,
@@ -19,12 +23,17 @@ def build_raster(
     values, oriented north-up (row 0 = northernmost). NaN cells are stored
     using a sentinel nodata value, since raster bands don't support NaN
     directly for most pixel types.
+
+    The band data is handed to GDAL as the NumPy array itself: GDALBand
+    copies the buffer once at the C level, rather than materializing a
+    Python float object per pixel the way a list would.
     """
     height, width = array.shape
     scale_x = (lon_max - lon_min) / width
     scale_y = -(lat_max - lat_min) / height  # negative: rows run north-to-south
 
-    data = np.where(np.isnan(array), NODATA_VALUE, array).astype(np.float64)
+    array = np.asarray(array, dtype=np.float64)
+    data = np.ascontiguousarray(np.where(np.isnan(array), NODATA_VALUE, array))
 
     return GDALRaster({
         'width': width,
@@ -37,7 +46,7 @@ def build_raster(
         # magnitude column-density values.
         'datatype': GDT_FLOAT64,
         'bands': [{
-            'data': data.flatten().tolist(),
+            'data': data,
             'nodata_value': NODATA_VALUE,
         }],
     })
@@ -49,25 +49,59 @@ def _hex_to_rgb(hex_color: str) -> tuple:
     return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
 
 
+def _palette_for(levels: LevelSet) -> tuple:
+    """
+    Returns (breakpoints, colors) for `levels`, sorted by breakpoint: a
+    float array of each level's starting value and an (n, 3) float array of
+    its RGB color, ready for np.digitize().
+    """
+    ordered = sorted(levels, key=lambda level: level.value)
+    breakpoints = np.array([float(level.value) for level in ordered])
+    colors = np.array([_hex_to_rgb(level.color) for level in ordered], dtype=np.float64)
+    return breakpoints, colors
+
+
+def colorize(array: np.ndarray, levels: LevelSet) -> np.ndarray:
+    """
+    Vectorized LevelSet.get_color() over a whole 2D array, returning an
+    (height, width, 4) RGBA uint8 array. Each value is blended between its
+    band's color and the next band's, exactly as get_color() does; values
+    below the first breakpoint take the first color and values in the last
+    band take the last color. NaN cells are fully transparent.
+    """
+    breakpoints, colors = _palette_for(levels)
+    last = len(breakpoints) - 1
+
+    valid = ~np.isnan(array)
+    values = np.where(valid, array, breakpoints[0])
+
+    lower = np.clip(np.digitize(values, breakpoints) - 1, 0, last)
+    upper = np.minimum(lower + 1, last)
+    span = breakpoints[upper] - breakpoints[lower]
+
+    ratio = np.zeros_like(values, dtype=np.float64)
+    np.divide(values - breakpoints[lower], span, out=ratio, where=span > 0)
+    ratio = np.clip(ratio, 0.0, 1.0)
+
+    rgb = colors[lower] + (colors[upper] - colors[lower]) * ratio[..., np.newaxis]
+
+    rgba = np.zeros(array.shape + (4,), dtype=np.uint8)
+    rgba[..., :3] = np.rint(rgb)
+    rgba[..., 3] = np.where(valid, 255, 0)
+    rgba[~valid, :3] = 0
+    return rgba
+
+
 def render_preview(array: np.ndarray, product: str) -> bytes:
     """
     Colorizes a 2D array of column-density values into an RGBA PNG using
     SJVAir's AQI palette, scaled to `product`'s working range. NaN cells
     (masked/QA-flagged pixels) render fully transparent.
     """
-    levels = _level_set_for(product)
-    height, width = array.shape
-    rgba = np.zeros((height, width, 4), dtype=np.uint8)
-
-    valid = ~np.isnan(array)
-    for y in range(height):
-        for x in range(width):
-            if not valid[y, x]:
-                continue
-            r, g, b = _hex_to_rgb(levels.get_color(float(array[y, x])))
-            rgba[y, x] = (r, g, b, 255)
+    rgba = colorize(array, _level_set_for(product))
 
     image = Image.fromarray(rgba, mode='RGBA')
     buffer = BytesIO()
     image.save(buffer, format='PNG')
     return buffer.getvalue()
+
@@ -0,0 +1,39 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from camp.apps.regions.models import Boundary, Region
+
+from .models import ZonalStats
+from .queries import ZONAL_STATS_REGION_TYPES
+from .tasks import queue_zonal_stats_refresh
+
+
+# Stored stats are keyed on the boundary they were clipped to, so a region
+# switching boundaries never serves stale rows; these just get the new
+# boundary's stats computed without waiting on the next granule.
+
+@receiver(post_save, sender=Region)
+def refresh_region_zonal_stats(sender, instance, created, **kwargs):
+    if kwargs.get('raw') or instance.type not in ZONAL_STATS_REGION_TYPES:
+        return
+
+    if instance.boundary_id and (created or instance.tracker.has_changed('boundary')):
+        transaction.on_commit(partial(queue_zonal_stats_refresh, instance.type))
+
+
+@receiver(post_save, sender=Boundary)
+def refresh_boundary_zonal_stats(sender, instance, created, **kwargs):
+    # Same boundary, corrected geometry: its rows no longer hold.
+    if kwargs.get('raw') or created or not instance.tracker.has_changed('geometry'):
+        return
+
+    ZonalStats.objects.filter(boundary=instance).delete()
+    region_types = set(Region.objects
+        .filter(boundary_id=instance.pk, type__in=ZONAL_STATS_REGION_TYPES)
+        .values_list('type', flat=True)
+    )
+    for region_type in region_types:
+        transaction.on_commit(partial(queue_zonal_stats_refresh, region_type))
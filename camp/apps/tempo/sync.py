@@ -88,4 +88,10 @@ def sync_granule(product: str, timestamp: datetime, client: Optional[TempoClient
             'preview': preview_name,
         },
     )
+
+    # Stored zonal stats were computed from the tiles that save() just
+    # replaced. Imported here because tasks.py imports this module.
+    from .tasks import update_zonal_stats
+    update_zonal_stats(granule.pk)
+
     return granule
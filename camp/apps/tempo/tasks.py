@@ -3,19 +3,27 @@ from datetime import datetime, timedelta
 import sentry_sdk
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.mail import send_mail
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
-from django_huey import db_periodic_task
+from django_huey import db_periodic_task, db_task
 from huey import crontab
 from constance import config as constance_config
 
+from camp.apps.regions.models import Region
 from camp.utils.datetime import localtime
 
-from .models import Granule
+from .models import Granule, ZonalStats
+from .queries import ZONAL_STATS_REGION_TYPES, compute_zonal_stats
 from .sync import sync_granule
 
 PRODUCTS = [choice[0] for choice in Granule.Product.choices]
 
+# Region imports save thousands of regions in a row, so boundary changes
+# are picked up by one delayed refresh per region type rather than a task
+# per region.
+REFRESH_DELAY = 60 * 5
 
 # TEMPO only observes during PT daylight hours; run hourly, 15 min past the
 # hour to give NASA's NRT pipeline (~180 min claimed latency, but the top of
@@ -71,6 +79,46 @@ def sync_tempo_reprocessing():
         timestamp += timedelta(hours=1)
 
 
+@db_task(priority=40)
+def update_zonal_stats(granule_id):
+    compute_zonal_stats(
+        Granule.objects.filter(pk=granule_id),
+        Region.objects.filter(type__in=ZONAL_STATS_REGION_TYPES),
+    )
+
+
+def refresh_key(region_type):
+    return f'tempo:zonal-stats-refresh:{region_type}'
+
+
+def queue_zonal_stats_refresh(region_type):
+    """Schedule refresh_zonal_stats() for `region_type` unless one is already waiting."""
+    if cache.add(refresh_key(region_type), True, timeout=REFRESH_DELAY * 2):
+        refresh_zonal_stats.schedule((region_type,), delay=REFRESH_DELAY)
+
+
+@db_task(priority=30)
+def refresh_zonal_stats(region_type):
+    """
+    Compute stats for regions of `region_type` that have none stored
+    against their current boundary (new regions, boundary changes,
+    corrected geometry), one day of granules per statement. Days that are
+    already up to date only cost the lookup.
+    """
+    # Changes from here on queue another run.
+    cache.delete(refresh_key(region_type))
+
+    regions = Region.objects.filter(type=region_type, boundary__isnull=False)
+    for day_start in Granule.objects.datetimes('timestamp', 'day'):
+        granules = Granule.objects.filter(timestamp__gte=day_start, timestamp__lt=day_start + timedelta(days=1))
+        stored = ZonalStats.objects.filter(
+            region=OuterRef('pk'),
+            boundary=OuterRef('boundary'),
+            granule__in=granules,
+        )
+        compute_zonal_stats(granules, regions.filter(~Exists(stored)))
+
+
 @db_periodic_task(crontab(day_of_week='1', hour='9', minute='0'), priority=30)
 def check_earthdata_token_expiry():
     expires_at = constance_config.EARTHDATA_TOKEN_EXPIRES_AT
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from django.contrib.gis.gdal import GDALRaster
@@ -8,6 +9,7 @@ from django.test import TestCase
 from django.utils import timezone
 
 from camp.apps.tempo.models import Granule
+from camp.apps.tempo.raster import TILE_SIZE, build_raster
 
 
 def make_raster():
@@ -47,3 +49,27 @@ class GranuleTests(TestCase):
                 product=Granule.Product.NO2, timestamp=timestamp, version='V03',
                 raster=make_raster(), bounds=Polygon.from_bbox((-120.0, 36.96, -119.96, 37.0)),
             )
+
+    def test_save_splits_raster_into_tiles(self):
+        array = np.ones((TILE_SIZE + 1, TILE_SIZE * 2))
+        granule = Granule.objects.create(
+            product=Granule.Product.NO2, timestamp=timezone.now(), version='V03',
+            raster=build_raster(array, lon_min=-120.0, lat_min=36.0, lon_max=-119.0, lat_max=37.0),
+            bounds=Polygon.from_bbox((-120.0, 36.0, -119.0, 37.0)),
+        )
+
+        assert granule.tiles.count() == 4
+
+        granule.save()
+        assert granule.tiles.count() == 4
+
+    def test_fully_masked_tiles_are_skipped(self):
+        array = np.ones((TILE_SIZE, TILE_SIZE * 2))
+        array[:, TILE_SIZE:] = np.nan
+        granule = Granule.objects.create(
+            product=Granule.Product.NO2, timestamp=timezone.now(), version='V03',
+            raster=build_raster(array, lon_min=-120.0, lat_min=36.0, lon_max=-119.0, lat_max=37.0),
+            bounds=Polygon.from_bbox((-120.0, 36.0, -119.0, 37.0)),
+        )
+
+        assert granule.tiles.count() == 1
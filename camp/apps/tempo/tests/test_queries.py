@@ -1,12 +1,20 @@
 from datetime import datetime, timedelta, timezone as dt_timezone
 
 import numpy as np
-from django.contrib.gis.geos import Point, Polygon
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
 from django.test import TestCase
 
-from camp.apps.tempo.models import Granule
-from camp.apps.tempo.queries import point_series, region_series, value_at_point, zonal_stats
-from camp.apps.tempo.raster import build_raster
+from camp.apps.regions.models import Boundary, Region
+from camp.apps.tempo.models import Granule, ZonalStats
+from camp.apps.tempo.queries import (
+    compute_zonal_stats,
+    point_series,
+    region_series,
+    stored_region_series,
+    value_at_point,
+    zonal_stats,
+)
+from camp.apps.tempo.raster import TILE_SIZE, build_raster
 
 # A 3x3 grid covering lon -120..-119, lat 36..37, north-up (row 0 = northernmost, per
 # build_raster's documented orientation). Center of each cell is where test points land.
@@ -45,6 +53,13 @@ def create_granule(product='no2', timestamp=None, array=GRID, is_final=False, ve
     )
 
 
+def create_region(polygon, name='Test Region', type=Region.Type.TRACT):
+    region = Region.objects.create(name=name, slug=name.lower().replace(' ', '-'), type=type)
+    region.boundary = Boundary.objects.create(region=region, geometry=MultiPolygon(polygon), version='2026')
+    region.save(update_fields=['boundary'])
+    return region
+
+
 class PointSeriesTests(TestCase):
     def test_returns_value_at_exact_hour(self):
         ts = datetime(2026, 7, 1, 13, tzinfo=dt_timezone.utc)
@@ -102,6 +117,19 @@ class PointSeriesTests(TestCase):
 
         assert results == []
 
+    def test_reads_value_from_the_tile_covering_the_point(self):
+        # Two tiles side by side: the western one all 1s, the eastern all 2s.
+        ts = datetime(2026, 7, 1, 13, tzinfo=dt_timezone.utc)
+        array = np.ones((TILE_SIZE, TILE_SIZE * 2))
+        array[:, TILE_SIZE:] = 2.0
+        create_granule(timestamp=ts, array=array)
+
+        west = point_series('no2', Point(-119.75, 36.5, srid=4326), ts, ts)
+        east = point_series('no2', Point(-119.25, 36.5, srid=4326), ts, ts)
+
+        assert west[0]['value'] == 1.0
+        assert east[0]['value'] == 2.0
+
 
 class ValueAtPointTests(TestCase):
     def test_snaps_off_hour_timestamp_down(self):
@@ -164,6 +192,19 @@ class RegionSeriesTests(TestCase):
 
         assert [r['timestamp'] for r in results] == [ts0, ts1]
 
+    def test_aggregates_across_tiles(self):
+        ts = datetime(2026, 7, 1, 13, tzinfo=dt_timezone.utc)
+        array = np.ones((TILE_SIZE, TILE_SIZE * 2))
+        array[:, TILE_SIZE:] = 3.0
+        create_granule(timestamp=ts, array=array)
+
+        row = region_series('no2', FULL_GRID_POLYGON, ts, ts)[0]
+
+        assert row['count'] == TILE_SIZE * TILE_SIZE * 2
+        assert row['mean'] == 2.0
+        assert row['min'] == 1.0
+        assert row['max'] == 3.0
+
 
 class ZonalStatsTests(TestCase):
     def test_snaps_off_hour_timestamp_down(self):
@@ -179,3 +220,104 @@ class ZonalStatsTests(TestCase):
         stats = zonal_stats('no2', datetime(2026, 7, 1, 13, tzinfo=dt_timezone.utc), FULL_GRID_POLYGON)
 
         assert stats is None
+
+
+class ComputeZonalStatsTests(TestCase):
+    def test_matches_region_series_for_every_region_and_granule(self):
+        ts0 = datetime(2026, 7, 1, 13, tzinfo=dt_timezone.utc)
+        ts1 = ts0 + timedelta(hours=1)
+        create_granule(timestamp=ts0)
+        create_granule(timestamp=ts1)
+        west = Polygon.from_bbox((-120, 36, -119.5, 37))
+        west.srid = 4326
+        create_region(FULL_GRID_POLYGON, name='Full')
+        create_region(west, name='West')
+        create_region(OUTSIDE_GRID_POLYGON, name='Outside')
+
+        count = compute_zonal_stats(Granule.objects.all(), Region.objects.all())
+
+        assert count == 6
+        for region in Region.objects.all():
+            stored = stored_region_series('no2', region, ts0, ts1)
+            expected = region_series('no2', region.boundary.geometry, ts0, ts1)
+            assert [r['timestamp'] for r in stored] == [ts0, ts1]
+            for stored_row, expected_row in zip(stored, expected):
+                assert stored_row == expected_row
+
+    def test_rerun_replaces_existing_rows(self):
+        granule = create_granule()
+        region = create_region(FULL_GRID_POLYGON)
+        compute_zonal_stats(Granule.objects.all(), Region.objects.all())
+
+        granule.raster = build_raster(GRID * 2, lon_min=-120, lat_min=36, lon_max=-119, lat_max=37)
+        granule.save()
+        compute_zonal_stats(Granule.objects.all(), Region.objects.all())
+
+        stats = ZonalStats.objects.get(granule=granule, region=region)
+        assert stats.mean == 100.0
+
+    def test_regions_without_boundaries_are_skipped(self):
+        create_granule()
+        Region.objects.create(name='No Boundary', slug='no-boundary', type=Region.Type.TRACT)
+
+        assert compute_zonal_stats(Granule.objects.all(), Region.objects.all()) == 0
+
+
+class StoredRegionSeriesTests(TestCase):
+    def test_reads_precomputed_rows(self):
+        ts = datetime(2026, 7, 1, 13, tzinfo=dt_timezone.utc)
+        create_granule(timestamp=ts)
+        region = create_region(FULL_GRID_POLYGON)
+        compute_zonal_stats(Granule.objects.all(), Region.objects.filter(pk=region.pk))
+        ZonalStats.objects.filter(region=region).update(mean=-1)
+
+        results = stored_region_series('no2', region, ts, ts)
+
+        assert len(results) == 1
+        assert results[0]['mean'] == -1
+
+    def test_missing_rows_are_computed_without_storing(self):
+        ts = datetime(2026, 7, 1, 13, tzinfo=dt_timezone.utc)
+        create_granule(timestamp=ts)
+        region = create_region(FULL_GRID_POLYGON)
+
+        results = stored_region_series('no2', region, ts, ts)
+
+        assert len(results) == 1
+        assert results[0]['count'] == 8
+        assert results[0]['mean'] == 50.0
+        assert not ZonalStats.objects.filter(region=region).exists()
+
+    def test_other_region_types_are_computed_without_storing(self):
+        ts = datetime(2026, 7, 1, 13, tzinfo=dt_timezone.utc)
+        create_granule(timestamp=ts)
+        region = create_region(FULL_GRID_POLYGON, type=Region.Type.CITY)
+
+        results = stored_region_series('no2', region, ts, ts)
+
+        assert len(results) == 1
+        assert results[0]['count'] == 8
+        assert results[0]['mean'] == 50.0
+        assert not ZonalStats.objects.filter(region=region).exists()
+
+    def test_new_boundary_ignores_rows_for_the_old_one(self):
+        ts = datetime(2026, 7, 1, 13, tzinfo=dt_timezone.utc)
+        create_granule(timestamp=ts)
+        region = create_region(FULL_GRID_POLYGON)
+        compute_zonal_stats(Granule.objects.all(), Region.objects.filter(pk=region.pk))
+        assert ZonalStats.objects.get(region=region).count == 8
+
+        west = Polygon.from_bbox((-120, 36, -119.5, 37))
+        west.srid = 4326
+        region.boundary = Boundary.objects.create(region=region, geometry=MultiPolygon(west), version='2027')
+        region.save()
+
+        expected = region_series('no2', region.boundary.geometry, ts, ts)
+        assert stored_region_series('no2', region, ts, ts) == expected
+
+    def test_hour_with_no_granule_is_simply_absent(self):
+        ts = datetime(2026, 7, 1, 13, tzinfo=dt_timezone.utc)
+        create_granule(timestamp=ts)
+        region = create_region(FULL_GRID_POLYGON)
+
+        assert stored_region_series('no2', region, ts + timedelta(hours=5), ts + timedelta(hours=5)) == []
@@ -43,3 +43,12 @@ def test_build_raster_stores_full_float64_precision():
     assert raster.bands[0].datatype() == 7  # GDT_Float64
     band_data = raster.bands[0].data()
     assert band_data.flatten()[0] == value
+
+
+def test_build_raster_accepts_non_contiguous_input_without_mutating_it():
+    source = np.array([[1.0, 9.0, 2.0], [np.nan, 9.0, 4.0]], dtype=np.float32)
+    array = source[:, ::2]
+    raster = build_raster(array, lon_min=-120.0, lat_min=36.96, lon_max=-119.96, lat_max=37.0)
+
+    assert list(raster.bands[0].data().flatten()) == [1.0, 2.0, -9999.0, 4.0]
+    assert np.isnan(source[1, 0])
@@ -2,7 +2,12 @@ import numpy as np
 from PIL import Image
 from io import BytesIO
 
-from camp.apps.tempo.rendering import render_preview
+from camp.apps.tempo.rendering import (
+    _hex_to_rgb,
+    _level_set_for,
+    colorize,
+    render_preview,
+)
 
 
 def test_render_preview_returns_valid_png():
@@ -32,3 +37,21 @@ def test_render_preview_low_and_high_values_use_different_colors():
     image = Image.open(BytesIO(png_bytes))
     pixels = np.array(image)
     assert tuple(pixels[0, 0][:3]) != tuple(pixels[0, 1][:3])
+
+
+def test_colorize_matches_level_set_get_color():
+    levels = _level_set_for('no2')
+    array = np.array([
+        [-1.0e15, 0.0, 1.0e15, 1.5e15],
+        [4.5e15, 7.2e15, 1.65e16, 2.4e16],
+        [2.9e16, 3.0e16, 5.0e16, np.nan],
+    ])
+
+    rgba = colorize(array, levels)
+
+    for (y, x), value in np.ndenumerate(array):
+        if np.isnan(value):
+            assert tuple(rgba[y, x]) == (0, 0, 0, 0)
+        else:
+            assert tuple(rgba[y, x]) == (*_hex_to_rgb(levels.get_color(value)), 255)
+
@@ -1,13 +1,22 @@
 from datetime import timedelta
 from unittest.mock import patch
 
+from django.contrib.gis.geos import MultiPolygon, Polygon
 from django.core import mail
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 from django.utils import timezone
 from constance.test import override_config
 
-from camp.apps.tempo.models import Granule
-from camp.apps.tempo.tasks import fetch_tempo, fetch_tempo_final, check_earthdata_token_expiry
+from camp.apps.regions.models import Boundary, Region
+from camp.apps.tempo.models import Granule, ZonalStats
+from camp.apps.tempo.tasks import (
+    check_earthdata_token_expiry,
+    fetch_tempo,
+    fetch_tempo_final,
+    refresh_zonal_stats,
+)
+from camp.apps.tempo.tests.test_queries import FULL_GRID_POLYGON, create_granule, create_region
 from camp.utils.datetime import localtime
 from camp.settings.base import EARTHDATA_TOKEN_NOT_SET
 
@@ -82,6 +91,52 @@ class SyncTempoReprocessingTests(TestCase):
         assert mock_sync.call_count == 90 * 24 * len(Granule.Product.choices)
 
 
+class RefreshZonalStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @patch('camp.apps.tempo.tasks.refresh_zonal_stats.schedule')
+    def test_region_saves_queue_one_refresh_per_type(self, mock_schedule):
+        with self.captureOnCommitCallbacks(execute=True):
+            for name in ('One', 'Two', 'Three'):
+                create_region(FULL_GRID_POLYGON, name=name)
+
+        mock_schedule.assert_called_once()
+        assert mock_schedule.call_args.args[0] == (Region.Type.TRACT,)
+
+    @patch('camp.apps.tempo.tasks.refresh_zonal_stats.schedule')
+    def test_boundary_resave_without_geometry_change_keeps_rows(self, mock_schedule):
+        create_granule()
+        region = create_region(FULL_GRID_POLYGON)
+        refresh_zonal_stats.call_local(Region.Type.TRACT)
+
+        boundary = Boundary.objects.get(pk=region.boundary_id)
+        boundary.metadata = {'note': 'touched'}
+        with self.captureOnCommitCallbacks(execute=True):
+            boundary.save()
+
+        assert ZonalStats.objects.filter(region=region).exists()
+        mock_schedule.assert_not_called()
+
+    def test_refresh_computes_only_missing_regions(self):
+        create_granule()
+        create_granule(timestamp=timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=3))
+        stored = create_region(FULL_GRID_POLYGON, name='Stored')
+        refresh_zonal_stats.call_local(Region.Type.TRACT)
+        ZonalStats.objects.filter(region=stored).update(mean=-1)
+
+        west = Polygon.from_bbox((-120, 36, -119.5, 37))
+        west.srid = 4326
+        moved = create_region(FULL_GRID_POLYGON, name='Moved')
+        moved.boundary = Boundary.objects.create(region=moved, geometry=MultiPolygon(west), version='2027')
+        moved.save()
+
+        refresh_zonal_stats.call_local(Region.Type.TRACT)
+
+        assert set(ZonalStats.objects.filter(region=stored).values_list('mean', flat=True)) == {-1}
+        assert ZonalStats.objects.filter(region=moved, boundary=moved.boundary).count() == 2
+
+
 class CheckEarthdataTokenExpiryTests(TestCase):
     @override_config(EARTHDATA_TOKEN_EXPIRES_AT=EARTHDATA_TOKEN_NOT_SET)
     def test_sends_no_email_when_renewal_has_never_run(self):
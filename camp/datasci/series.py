@@ -1,5 +1,6 @@
 from typing import NamedTuple, Optional
 
+import numpy as np
 import pandas as pd
 
 from . import stats
@@ -79,3 +80,51 @@ def compare(a: pd.Series, b: pd.Series) -> SeriesComparison:
     Returns a dict with summary statistics for QA/QC.
     """
     return SeriesComparison.from_series(a, b)
+
+
+def summarize_groups(values: pd.Series, level) -> pd.DataFrame:
+    """
+    Vectorized summarize() over many series at once. `values` is indexed by
+    the group levels followed by time, and sorted; returns one row per group
+    with a column per SeriesSummary field.
+    """
+    grouped = values.groupby(level=level)
+    deviations = (values - grouped.transform('median')).abs()
+    # diff() runs across group boundaries, so blank out each group's first row
+    repeats = values.diff().eq(0).astype(float).where(grouped.cumcount() > 0)
+
+    frame = pd.DataFrame({
+        'count': grouped.count(),
+        'min': grouped.min(),
+        'max': grouped.max(),
+        'mean': grouped.mean(),
+        'stdev': grouped.std(),
+        'variance': grouped.var(ddof=1),
+        'mad': deviations.groupby(level=level).median(),
+        'flatline': repeats.groupby(level=level).mean(),
+    })
+    frame['range'] = frame['max'] - frame['min']
+    return frame[list(SeriesSummary._fields)]
+
+
+def compare_groups(a: pd.Series, b: pd.Series, level) -> pd.DataFrame:
+    """
+    Vectorized pairwise stats (rpd_pairwise, rmse, spearman correlation) over
+    many pairs of series at once. `a` and `b` share an index and only hold
+    the timestamps both series reported.
+    """
+    diff = a - b
+
+    # Spearman is Pearson over the ranks within each group
+    rank_a = a.groupby(level=level).rank()
+    rank_b = b.groupby(level=level).rank()
+    dev_a = rank_a - rank_a.groupby(level=level).transform('mean')
+    dev_b = rank_b - rank_b.groupby(level=level).transform('mean')
+    covariance = (dev_a * dev_b).groupby(level=level).sum()
+    scale = np.sqrt((dev_a ** 2).groupby(level=level).sum() * (dev_b ** 2).groupby(level=level).sum())
+
+    return pd.DataFrame({
+        'rpd_pairwise': (diff.abs() / ((a + b) / 2)).groupby(level=level).mean(),
+        'rmse': np.sqrt((diff ** 2).groupby(level=level).mean()),
+        'correlation': covariance / scale.where(scale > 0),
+    })
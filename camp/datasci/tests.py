@@ -37,6 +37,36 @@ class DataSciTests(TestCase):
         assert stats.rpd_pairwise(empty, empty) is None
         assert stats.signal_range(empty) is None
 
+    def test_summarize_groups_matches_summarize(self):
+        values = pd.Series(
+            [1.0, 2.0, 2.0, 5.0, 3.0, 3.0, 3.0],
+            index=pd.MultiIndex.from_tuples(
+                [('x', i) for i in range(4)] + [('y', i) for i in range(3)],
+                names=['group', 'timestamp'],
+            ),
+        )
+        frame = series.summarize_groups(values, level='group')
+
+        for group in ('x', 'y'):
+            expected = series.summarize(values.xs(group, level='group'))
+            for name, value in expected.as_dict().items():
+                assert is_close(frame.loc[group, name], value), name
+
+    def test_compare_groups_matches_compare(self):
+        index = pd.MultiIndex.from_tuples(
+            [('x', i) for i in range(4)] + [('y', i) for i in range(3)],
+            names=['group', 'timestamp'],
+        )
+        a = pd.Series([1.0, 2.0, 3.0, 4.0, 5.0, 1.0, 3.0], index=index)
+        b = pd.Series([1.5, 2.0, 2.5, 6.0, 4.0, 2.0, 6.0], index=index)
+        frame = series.compare_groups(a, b, level='group')
+
+        for group in ('x', 'y'):
+            expected = series.compare(a.xs(group, level='group'), b.xs(group, level='group'))
+            assert is_close(frame.loc[group, 'rpd_pairwise'], expected.rpd_pairwise)
+            assert is_close(frame.loc[group, 'rmse'], expected.rmse)
+            assert is_close(frame.loc[group, 'correlation'], expected.correlation)
+
     def test_univariate_regression(self):
         # Simple linear data: y = 2x + 1
         df = pd.DataFrame({
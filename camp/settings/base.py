@@ -374,6 +374,16 @@ DJANGO_HUEY = {
             'huey_class': 'huey.PriorityRedisHuey',
             'immediate': bool(int(env('HUEY_IMMEDIATE', DEBUG)))
         },
+        'notifications': {
+            'name': 'notifications_tasks',
+            'connection': {'url': f'{REDIS_URL}/3'},
+            'consumer': {
+                'periodic': False,
+                'workers': int(env('HUEY_NOTIFICATIONS_WORKERS', env('HUEY_WORKERS', 2)))
+            },
+            'huey_class': 'huey.PriorityRedisHuey',
+            'immediate': bool(int(env('HUEY_IMMEDIATE', DEBUG)))
+        },
     }
 }
 
@@ -386,6 +396,23 @@ HUEY_STATS = {
 MAX_QUEUE_SIZE = int(env('MAX_QUEUE_SIZE', 500))
 
 
+# Archives
+
+# Also write a Parquet copy of each monthly archive (requires pyarrow).
+ARCHIVE_PARQUET = bool(int(env('ARCHIVE_PARQUET', 0)))
+
+
+# Entry partitions
+
+# Monthly partitions to keep created ahead of the current month.
+ENTRY_PARTITION_MONTHS_AHEAD = int(env('ENTRY_PARTITION_MONTHS_AHEAD', 3))
+
+# Drop (or, with ENTRY_RETENTION_DETACH, detach) entry partitions older than
+# this many months. 0 keeps everything.
+ENTRY_RETENTION_MONTHS = int(env('ENTRY_RETENTION_MONTHS', 0))
+ENTRY_RETENTION_DETACH = bool(int(env('ENTRY_RETENTION_DETACH', 0)))
+
+
 # Twilio
 
 TWILIO_ACCOUNT_SID = env("TWILIO_ACCOUNT_SID")
@@ -399,6 +426,14 @@ TWILIO_PHONE_NUMBERS = env("TWILIO_PHONE_NUMBERS", "").split(',')
 
 SEND_SMS_ALERTS = bool(int(env('SEND_SMS_ALERTS', 1)))
 
+# Messages per notifications task, and concurrent Twilio requests per task.
+SMS_BATCH_SIZE = int(env('SMS_BATCH_SIZE', 100))
+SMS_CONCURRENCY = int(env('SMS_CONCURRENCY', 8))
+
+# Retries for rate-limited/transient Twilio errors, with exponential backoff (seconds).
+SMS_RETRIES = int(env('SMS_RETRIES', 3))
+SMS_RETRY_BACKOFF = float(env('SMS_RETRY_BACKOFF', 1))
+
 # Number of minutes between sending
 PHONE_VERIFICATION_RATE_LIMIT = int(env('PHONE_VERIFICATION_RATE_LIMIT', 2))
 
@@ -442,6 +477,9 @@ PURPLEAIR_WRITE_KEY = env('PURPLEAIR_WRITE_KEY')
 
 PURPLEAIR_GROUP_ID = env('PURPLEAIR_GROUP_ID')
 
+# How many group members each realtime ingest task handles.
+PURPLEAIR_INGEST_BATCH_SIZE = int(env('PURPLEAIR_INGEST_BATCH_SIZE', 100))
+
 
 # reCAPTCHA
 
@@ -52,6 +52,15 @@ DJANGO_HUEY = {
             'huey_class': 'huey.MemoryHuey',
             'immediate': True
         },
+        'notifications': {
+            'name': 'notifications_tasks',
+            'consumer': {
+                'periodic': False,
+                'workers': 1
+            },
+            'huey_class': 'huey.MemoryHuey',
+            'immediate': True
+        },
     }
 }
 
@@ -0,0 +1,38 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class Collector:
+    """
+    Holds a dict of pending work per context, so a task can buffer writes
+    made deep inside it and hand them to `flush` once, when its outermost
+    batch() block exits cleanly; if the block raises, the pending work is
+    discarded. Outside a block, get() returns None and callers are expected
+    to flush straight away.
+    """
+
+    def __init__(self, name, flush):
+        self.pending = ContextVar(name, default=None)
+        self.flush = flush
+
+    def get(self):
+        return self.pending.get()
+
+    @contextmanager
+    def batch(self):
+        if self.pending.get() is not None:
+            # Already collecting; the outermost block flushes.
+            yield
+            return
+
+        token = self.pending.set({})
+        try:
+            yield
+        except BaseException:
+            # The task failed part way; drop what it collected.
+            self.pending.reset(token)
+            raise
+
+        pending = self.pending.get()
+        self.pending.reset(token)
+        self.flush(pending)
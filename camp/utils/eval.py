@@ -1,4 +1,5 @@
 from decimal import Decimal
+from functools import lru_cache
 
 from simpleeval import SimpleEval
 
@@ -21,7 +22,21 @@ class DecimalSimpleEval(SimpleEval):
         return op(left, right)
 
 
+@lru_cache(maxsize=1024)
+def compile_formula(formula: str):
+    '''
+    Parse `formula` once and return a callable that evaluates it against a
+    context dict. Compiled formulas are cached by their text.
+    '''
+    parsed = DecimalSimpleEval.parse(formula)
+
+    def evaluate(context: dict):
+        evaluator = DecimalSimpleEval()
+        evaluator.names = context
+        return evaluator.eval(formula, previously_parsed=parsed)
+
+    return evaluate
+
+
 def evaluate_formula(formula: str, context: dict):
-    evaluator = DecimalSimpleEval()
-    evaluator.names = context
-    return evaluator.eval(formula)
+    return compile_formula(formula)(context)
@@ -1,4 +1,7 @@
 # tests/test_monitor_list_cache.py
+import gzip
+import time
+
 from urllib.parse import urlencode
 
 from django.core.cache import cache
@@ -22,15 +25,27 @@ class CachedEndpointTests(TestCase):
     def tearDown(self):
         cache.clear()
 
-    def _call(self, params=None):
+    def _call(self, params=None, **headers):
         url = reverse('api:v2:monitors:monitor-list')
         if params:
             url = f'{url}?{urlencode(params, doseq=True)}'
-        request = self.factory.get(url)
+        request = self.factory.get(url, **headers)
         with CaptureQueriesContext(connection) as ctx:
             response = monitor_list(request)
         return response, len(ctx)
 
+    def _cache_key(self):
+        view = MonitorList()
+        view.request = self.factory.get(reverse('api:v2:monitors:monitor-list'))
+        view.kwargs = {}
+        return view.get_view_cache_key()
+
+    def _expire(self):
+        key = self._cache_key()
+        cached = cache.get(key)
+        cached.stale_at = time.time() - 1
+        cache.set(key, cached)
+
     def test_cache_hit_vs_miss(self):
         # First call = miss (does real DB work)
         resp1, q1 = self._call()
@@ -105,3 +120,46 @@ class CachedEndpointTests(TestCase):
 
         for view_cls, status in results:
             assert status == 200
+
+    def test_stale_response_is_refreshed_by_lock_holder(self):
+        self._call()
+        self._expire()
+
+        resp, queries = self._call()
+        assert resp['X-Cache-Status'] == 'MISS'
+        assert queries > 0
+
+        resp, _ = self._call()
+        assert resp['X-Cache-Status'] == 'HIT'
+
+    def test_stale_response_served_while_another_worker_refreshes(self):
+        self._call()
+        self._expire()
+
+        view = MonitorList()
+        assert view.acquire_cache_lock(self._cache_key())
+
+        resp, queries = self._call()
+        assert resp.status_code == 200
+        assert resp['X-Cache-Status'] == 'STALE'
+        assert queries == 0
+
+    def test_etag_and_conditional_get(self):
+        resp1, _ = self._call()
+        etag = resp1['ETag']
+        assert etag
+
+        resp2, queries = self._call(HTTP_IF_NONE_MATCH=etag)
+        assert resp2.status_code == 304
+        assert resp2['ETag'] == etag
+        assert queries == 0
+
+        resp3, _ = self._call(HTTP_IF_NONE_MATCH='"nope"')
+        assert resp3.status_code == 200
+
+    def test_gzipped_body_served_when_accepted(self):
+        plain, _ = self._call()
+        zipped, _ = self._call(HTTP_ACCEPT_ENCODING='gzip, deflate')
+        assert zipped['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(zipped.content) == plain.content
+        assert 'Accept-Encoding' in zipped['Vary']
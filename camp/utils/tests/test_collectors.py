@@ -0,0 +1,47 @@
+from django.test import SimpleTestCase
+
+from camp.utils.collectors import Collector
+
+
+class CollectorTests(SimpleTestCase):
+    def setUp(self):
+        self.flushed = []
+        self.collector = Collector('test_collector', flush=self.flushed.append)
+
+    def test_get_outside_batch_is_none(self):
+        assert self.collector.get() is None
+
+    def test_flushes_once_on_exit(self):
+        with self.collector.batch():
+            self.collector.get()['a'] = 1
+            self.collector.get()['b'] = 2
+            assert self.flushed == []
+
+        assert self.flushed == [{'a': 1, 'b': 2}]
+        assert self.collector.get() is None
+
+    def test_nested_batches_flush_from_the_outermost(self):
+        with self.collector.batch():
+            with self.collector.batch():
+                self.collector.get()['a'] = 1
+            assert self.flushed == []
+
+        assert self.flushed == [{'a': 1}]
+
+    def test_discards_when_block_raises(self):
+        with self.assertRaises(ValueError):
+            with self.collector.batch():
+                self.collector.get()['a'] = 1
+                raise ValueError
+
+        assert self.flushed == []
+        assert self.collector.get() is None
+
+    def test_works_as_decorator(self):
+        @self.collector.batch()
+        def task():
+            self.collector.get()['a'] = 1
+
+        task()
+        task()
+        assert self.flushed == [{'a': 1}, {'a': 1}]
@@ -1,5 +1,8 @@
+import gzip
 import hashlib
 import mimetypes
+import re
+import time
 import urllib
 
 from typing import ClassVar, Dict, Iterable, List, Optional, Tuple, Union
@@ -11,14 +14,16 @@ from django.contrib.auth.views import RedirectURLMixin
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.core.cache import cache
 from django.db import connection
-from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.http import Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.shortcuts import redirect, resolve_url
 from django.template import loader, TemplateDoesNotExist
 from django.test import RequestFactory
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from django.utils.decorators import method_decorator
-from django.utils.http import url_has_allowed_host_and_scheme
+from django.utils.http import parse_etags, url_has_allowed_host_and_scheme
+from django.utils.text import compress_string
 from django.views import generic
 from django.views.decorators.clickjacking import xframe_options_exempt
 
@@ -32,12 +37,38 @@ from ua_parser import parse as ua_parse
 from camp.apps.entries.models import PM25
 
 
+class CachedResponse:
+    """
+    What CachedEndpointMixin stores under a view's cache key: either the
+    endpoint's response as-is, or (with cache_serialized) its gzipped body,
+    content type and ETag. `stale_at` is the soft TTL; the cache entry itself
+    lives until the hard TTL.
+    """
+
+    def __init__(self, value, stale_at, status=200, content_type=None, etag=None):
+        self.value = value
+        self.stale_at = stale_at
+        self.status = status
+        self.content_type = content_type
+        self.etag = etag
+
+    @property
+    def is_stale(self):
+        return time.time() >= self.stale_at
+
+
 class CachedEndpointMixin:
     """
     Drop-in mixin for class-based endpoints.
 
     Features:
     - Response caching keyed by view class + kwargs + querystring (minus control keys).
+    - Soft/hard TTLs: after `cache_timeout` the cached response is stale, and is
+      served for up to `cache_stale_timeout` more while one worker refreshes it.
+    - Single-flight recomputes: a per-key lock means only one worker rebuilds a
+      missing or stale response; the rest serve stale or wait for it.
+    - Optional storage of the serialized, gzipped body with an ETag, served
+      as-is to clients that accept gzip and answered with a 304 on If-None-Match.
     - ?_cc=1 -> clear cache key for this specific param set.
     - ?_warm=1 -> recompute and write to cache (prewarm) bypassing cache read.
     - Optional auto-registration for scheduled prewarming.
@@ -45,6 +76,17 @@ class CachedEndpointMixin:
 
     # --- Caching knobs ---
     cache_timeout: int = 60
+    # How long past cache_timeout a stale response may still be served
+    cache_stale_timeout: int = 300
+    # Store the rendered body gzipped with an ETag instead of the response object
+    cache_serialized: bool = False
+
+    # --- Single-flight knobs ---
+    # Upper bound on how long one worker may hold the recompute lock
+    cache_lock_timeout: int = 30
+    # How long a worker waits on a cold key for the lock holder to fill it
+    cache_lock_wait: float = 5.0
+    cache_lock_poll: float = 0.1
 
     # --- Prewarm knobs (opt-in) ---
     cache_refresh: bool = False
@@ -71,24 +113,88 @@ class CachedEndpointMixin:
         Handles:
           - ?_cc=1: delete cache for this key, then fall through and recompute.
           - ?_warm=1: bypass cache read, recompute, and write to cache.
-          - default: read cache -> return if hit -> compute + write if miss.
+          - default: read cache -> return if fresh -> if stale, serve it unless
+            we win the refresh lock -> if missing, wait for the lock holder or
+            compute + write.
         """
         cache_key = self.get_view_cache_key()
         clear = '_cc' in request.GET
         warm = '_warm' in request.GET  # bypass read, write fresh
+        locked = False
 
         if clear:
             cache.delete(cache_key)
 
-        if not warm:
-            cached = cache.get(cache_key)
-            if cached is not None:
-                return self._finalize_response(cached, 'HIT')
+        if not (clear or warm):
+            cached = self.get_cached_response(cache_key)
+            if cached is not None and not cached.is_stale:
+                return self._finalize_cached(cached, 'HIT')
+
+            locked = self.acquire_cache_lock(cache_key)
+            if not locked:
+                if cached is not None:
+                    return self._finalize_cached(cached, 'STALE')
+
+                cached = self.wait_for_cached_response(cache_key)
+                if cached is not None:
+                    return self._finalize_cached(cached, 'HIT')
 
         status = 'REFRESH' if warm else 'BYPASS' if clear else 'MISS'
-        response = super().get(request, *args, **kwargs)
-        cache.set(cache_key, response, self.cache_timeout)
-        return self._finalize_response(response, status)
+        try:
+            response = super().get(request, *args, **kwargs)
+            cached = self.set_cached_response(cache_key, response)
+        finally:
+            if locked:
+                self.release_cache_lock(cache_key)
+        return self._finalize_cached(cached, status)
+
+    def get_cached_response(self, cache_key: str) -> Optional[CachedResponse]:
+        cached = cache.get(cache_key)
+        # Anything else was written by an older version of this mixin.
+        return cached if isinstance(cached, CachedResponse) else None
+
+    def set_cached_response(self, cache_key: str, response) -> CachedResponse:
+        stale_at = time.time() + self.cache_timeout
+
+        if self.cache_serialized:
+            response = self._finalize_response(response, 'MISS')
+            body = (b''.join(response.streaming_content)
+                if response.streaming else response.content)
+            cached = CachedResponse(
+                value=compress_string(body),
+                stale_at=stale_at,
+                status=response.status_code,
+                content_type=response['Content-Type'],
+                etag=f'"{hashlib.sha1(body).hexdigest()}"',
+            )
+        else:
+            cached = CachedResponse(value=response, stale_at=stale_at)
+
+        cache.set(cache_key, cached, self.cache_timeout + self.cache_stale_timeout)
+        return cached
+
+    def get_cache_lock_key(self, cache_key: str) -> str:
+        return f'{cache_key}|lock'
+
+    def acquire_cache_lock(self, cache_key: str) -> bool:
+        # cache.add() is atomic: only one worker can create the key.
+        return cache.add(self.get_cache_lock_key(cache_key), 1, self.cache_lock_timeout)
+
+    def release_cache_lock(self, cache_key: str):
+        cache.delete(self.get_cache_lock_key(cache_key))
+
+    def wait_for_cached_response(self, cache_key: str) -> Optional[CachedResponse]:
+        """
+        Poll for another worker's recompute to land. Returns None if it doesn't
+        within cache_lock_wait, in which case the caller computes it itself.
+        """
+        deadline = time.monotonic() + self.cache_lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(self.cache_lock_poll)
+            cached = self.get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+        return None
 
     def get_view_cache_key(self) -> str:
         """
@@ -123,6 +229,25 @@ class CachedEndpointMixin:
         response['X-Cache-Status'] = cache_status
         return response
 
+    def _finalize_cached(self, cached: CachedResponse, cache_status: str):
+        if cached.etag is None:
+            return self._finalize_response(cached.value, cache_status)
+
+        if_none_match = parse_etags(self.request.META.get('HTTP_IF_NONE_MATCH', ''))
+        if cached.status == 200 and (cached.etag in if_none_match or '*' in if_none_match):
+            response = HttpResponseNotModified()
+        elif re.search(r'\bgzip\b', self.request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            response = HttpResponse(cached.value, status=cached.status, content_type=cached.content_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(cached.value),
+                status=cached.status, content_type=cached.content_type)
+
+        response['ETag'] = cached.etag
+        patch_vary_headers(response, ['Accept-Encoding'])
+        response['X-Cache-Status'] = cache_status
+        return response
+
     # ---------- Prewarm helpers ----------
 
     @classmethod